@@ -0,0 +1,72 @@
+"""
+Time loading the price snapshot into NumPy arrays from the row-oriented
+nepse_data.json vs. the columnar nepse_data.columns.json, and check both
+give the same values.
+
+    python benchmarks/columnar_bench.py [--repeat 500]
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from columnar import read_columnar, write_columnar  # noqa: E402
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+NUMERIC_FIELDS = ('ltp', 'previous_close', 'change', 'percent_change', 'volume', 'turnover', 'market_cap')
+
+
+def load_rows(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        rows = json.load(f)
+    columns = {'symbol': np.array([row.get('symbol') for row in rows], dtype=object)}
+    for field in NUMERIC_FIELDS:
+        columns[field] = np.array([row.get(field) for row in rows], dtype='float64')
+    return columns
+
+
+def best_of(fn, path, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn(path)
+        best = min(best, time.perf_counter() - started)
+    return best * 1e3
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=500)
+    args = parser.parse_args()
+
+    rows_path = os.path.join(REPO_ROOT, 'data', 'nepse_data.json')
+    with open(rows_path, 'r', encoding='utf-8') as f:
+        rows = json.load(f)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        columns_path = os.path.join(tmp, 'nepse_data.columns.json')
+        write_columnar(columns_path, rows, parquet=False)
+
+        from_rows = load_rows(rows_path)
+        from_columns = read_columnar(columns_path)
+        same = all(
+            np.array_equal(from_rows[field], from_columns[field], equal_nan=field != 'symbol')
+            for field in from_rows
+        )
+
+        print(f"{len(rows)} rows")
+        print(f"  rows    -> numpy   {best_of(load_rows, rows_path, args.repeat):7.3f} ms "
+              f"({os.path.getsize(rows_path)} bytes)")
+        print(f"  columns -> numpy   {best_of(read_columnar, columns_path, args.repeat):7.3f} ms "
+              f"({os.path.getsize(columns_path)} bytes)")
+        print(f"  same values: {same}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+"""
+Time the proposed-dividend all-years fetch against a simulated Sharesansar
+(fixed latency per request): the old one-page-at-a-time walk vs. the
+concurrent fetch_all_years, and check both return the same rows.
+
+    python benchmarks/dividend_backfill_bench.py [--years 10] [--rows 300] [--latency 0.05]
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import proposed_dividend_scraper as pds  # noqa: E402
+
+
+class FakeResponse:
+    def __init__(self, payload=None, text=''):
+        self._payload = payload
+        self.text = text
+        self.status_code = 200
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self._payload
+
+
+class FakeSharesansar:
+    """Stands in for requests.Session: `years` fiscal years of `rows` rows each."""
+
+    def __init__(self, years, rows, latency):
+        self.years = years
+        self.rows = rows
+        self.latency = latency
+        self.requests = 0
+        self._lock = threading.Lock()
+
+    def get(self, url, params=None, headers=None, timeout=None):
+        with self._lock:
+            self.requests += 1
+        time.sleep(self.latency)
+        if not params:
+            options = ''.join(f'<option value="{y}">FY {y}</option>' for y in range(1, self.years + 1))
+            return FakeResponse(text=f'<select id="year"><option value="">All</option>{options}</select>')
+        year, start, length = int(params['year']), params['start'], params['length']
+        data = [{
+            'id': year * 100000 + i,
+            'symbol': f'<a href="/company/s{i}">S{i}</a>',
+            'companyname': f'<a href="/company/s{i}">Company {i}</a>',
+            'total_dividend': str(i % 30),
+            'announcement_date': f'20{10 + year % 15:02d}-{1 + i % 12:02d}-{1 + i % 28:02d}',
+            'year': str(year),
+        } for i in range(start, min(start + length, self.rows))]
+        return FakeResponse({'recordsFiltered': self.rows, 'data': data})
+
+
+def legacy_fetch_all_years(session):
+    merged = []
+    for y in pds.get_year_options(session):
+        rows = pds.fetch_paged(session, params={"type": "YEARWISE", "year": y["id"], "sector": "0"})
+        merged.extend(pds.normalize_record(r) for r in rows)
+    return pds.sort_newest_first(pds.dedupe_records(merged))
+
+
+def strip_timestamps(records):
+    return [{k: v for k, v in record.items() if k != 'scraped_at'} for record in records]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--years', type=int, default=10)
+    parser.add_argument('--rows', type=int, default=300, help='Rows per fiscal year')
+    parser.add_argument('--latency', type=float, default=0.05, help='Seconds per simulated request')
+    parser.add_argument('--workers', type=int, default=pds.DEFAULT_WORKERS)
+    parser.add_argument('--rate', type=float, default=pds.DEFAULT_RATE * 5)
+    args = parser.parse_args()
+    pds.print = lambda *a, **k: None  # silence per-year progress
+
+    serial = FakeSharesansar(args.years, args.rows, args.latency)
+    started = time.perf_counter()
+    expected = legacy_fetch_all_years(serial)
+    serial_time = time.perf_counter() - started
+
+    concurrent = FakeSharesansar(args.years, args.rows, args.latency)
+    limiter = pds.create_rate_limiter(args.rate)
+    started = time.perf_counter()
+    rows = pds.fetch_all_years(concurrent, max_workers=args.workers, limiter=limiter)
+    concurrent_time = time.perf_counter() - started
+
+    print(f"{args.years} years x {args.rows} rows, {args.latency * 1000:.0f} ms per request")
+    print(f"  serial       {serial_time:6.2f} s  ({serial.requests} requests)")
+    print(f"  concurrent   {concurrent_time:6.2f} s  ({concurrent.requests} requests, "
+          f"{args.workers} workers, {args.rate:g} req/s cap)")
+    print(f"  same rows in same order: {strip_timestamps(rows) == strip_timestamps(expected)}")
+
+
+if __name__ == '__main__':
+    main()
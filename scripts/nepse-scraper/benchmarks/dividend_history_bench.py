@@ -0,0 +1,100 @@
+"""
+Time one `--mode latest` history merge on a synthetic proposed-dividend
+history: the old full-file merge (parse, key set, re-sort + re-dedupe,
+rewrite, manifest record hashes) vs. the segmented store, and check both
+produce the same history_all_years.json.
+
+    python benchmarks/dividend_history_bench.py [--history 50000] [--new 20]
+"""
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import proposed_dividend_scraper as pds  # noqa: E402
+from output_manifest import OutputManifest  # noqa: E402
+
+
+def legacy_merge_into_history(out_dir, incoming):
+    history_path = os.path.join(out_dir, pds.HISTORY_FILE)
+    history = pds.load_json_list(history_path)
+    seen = {pds.record_key(item) for item in history}
+    to_add = [item for item in incoming if pds.record_key(item) not in seen]
+    if to_add:
+        updated_history = pds.sort_newest_first(pds.dedupe_records(history + to_add))
+        pds.save_json_list(history_path, updated_history)
+        OutputManifest(out_dir).record(history_path, updated_history, pds.record_key)
+    return len(to_add)
+
+
+def synthetic_row(rng, row_id, year, dated=None):
+    # Like the real history, older fiscal years often lack an announcement date.
+    dated = rng.random() < 0.6 if dated is None else dated
+    return {
+        'id': row_id,
+        'symbol': f'S{rng.randint(1, 400)}',
+        'company_name': f'Company {row_id % 400}',
+        'company_url': f'https://www.sharesansar.com/company/s{row_id % 400}',
+        'bonus_share': str(rng.randint(0, 20)),
+        'cash_dividend': f'{rng.uniform(0, 20):.4f}',
+        'total_dividend': f'{rng.uniform(0, 40):.4f}',
+        'announcement_date': f'{year}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}' if dated else None,
+        'bookclose_date': None,
+        'distribution_date': None,
+        'bonus_listing_date': None,
+        'fiscal_year': f'{year + 56}/{year + 57}',
+        'ltp': f'{rng.uniform(100, 2000):.2f}',
+        'price_as_of': None,
+        'status': 0,
+        'scraped_at': '2026-01-01T00:00:00',
+    }
+
+
+def timed(fn, *args):
+    started = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - started, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--history', type=int, default=50000, help='Rows already in the history')
+    parser.add_argument('--new', type=int, default=20, help='New rows in the latest run')
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    history = pds.sort_newest_first([synthetic_row(rng, i, rng.randint(2010, 2025)) for i in range(args.history)])
+    latest = [synthetic_row(rng, args.history + i, 2026, dated=True) for i in range(args.new)] + history[:200]
+
+    root = tempfile.mkdtemp()
+    try:
+        legacy_dir, store_dir = os.path.join(root, 'legacy'), os.path.join(root, 'store')
+        for out_dir in (legacy_dir, store_dir):
+            os.makedirs(out_dir)
+            pds.save_json_list(os.path.join(out_dir, pds.HISTORY_FILE), history)
+        seed_time, _ = timed(pds.open_history_store, store_dir)
+
+        legacy_time, legacy_added = timed(legacy_merge_into_history, legacy_dir, latest)
+        store_time, store_added = timed(pds.merge_into_history, store_dir, latest)
+        noop_time, _ = timed(pds.merge_into_history, store_dir, latest)
+
+        with open(os.path.join(legacy_dir, pds.HISTORY_FILE), 'rb') as f:
+            expected = f.read()
+        with open(os.path.join(store_dir, pds.HISTORY_FILE), 'rb') as f:
+            actual = f.read()
+        print(f"history {args.history} rows, latest run with {args.new} new rows")
+        print(f"  full-file merge  {legacy_time * 1000:8.1f} ms  (added {legacy_added})")
+        print(f"  segment store    {store_time * 1000:8.1f} ms  (added {store_added}, one-time seed {seed_time:.2f} s)")
+        print(f"  nothing new      {noop_time * 1000:8.1f} ms")
+        print(f"  identical history_all_years.json: {actual == expected}")
+    finally:
+        shutil.rmtree(root)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+"""
+Check that the regex fast path of clean_html_anchor agrees with
+BeautifulSoup, then time normalizing a synthetic proposed-dividend backfill:
+the old soup-per-cell normalize_record vs. normalize_records (regex fast
+path for the anchor cells).
+
+    python benchmarks/dividend_normalize_bench.py [--rows 20000] [--repeat 0.1]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+from bs4 import BeautifulSoup
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import proposed_dividend_scraper as pds  # noqa: E402
+
+
+# clean_html_anchor as it was before the fast path.
+def legacy_clean_html_anchor(value):
+    if value is None:
+        return "", ""
+    soup = BeautifulSoup(value, "html.parser")
+    anchor = soup.find("a")
+    if anchor:
+        return anchor.get_text(strip=True), anchor.get("href", "")
+    return soup.get_text(strip=True), ""
+
+
+def legacy_normalize_record(row):
+    symbol_text, _ = legacy_clean_html_anchor(row.get("symbol"))
+    company_text, company_url = legacy_clean_html_anchor(row.get("companyname"))
+    record = pds.normalize_record(row)
+    record.update(symbol=symbol_text, company_name=company_text, company_url=company_url)
+    return record
+
+
+def synthetic_rows(count, repeat, seed=3):
+    rng = random.Random(seed)
+    rows = []
+    for i in range(count):
+        if rows and rng.random() < repeat:
+            rows.append(dict(rng.choice(rows)))
+            continue
+        symbol = f'S{i % 700}'
+        # A few irregular cells (entities, nested markup) take the BeautifulSoup path.
+        company = rng.choices(
+            [f'Company {i % 700} Limited', f'Bank &amp; Finance {i % 700}', f'<b>Odd</b> {i}'], weights=[94, 3, 3]
+        )[0]
+        rows.append({
+            'id': i,
+            'symbol': f'<a href="https://www.sharesansar.com/company/{symbol.lower()}" target="_blank">{symbol}</a>',
+            'companyname': f'<a href="https://www.sharesansar.com/company/{symbol.lower()}">{company}</a>',
+            'bonus_share': str(rng.randint(0, 20)),
+            'cash_dividend': f'{rng.uniform(0, 20):.4f}',
+            'total_dividend': f'{rng.uniform(0, 40):.4f}',
+            'announcement_date': f'20{rng.randint(10, 26)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}',
+            'year': str(rng.randint(1, 15)),
+            'close': f'{rng.uniform(100, 2000):.2f}',
+        })
+    return rows
+
+
+def without_timestamps(records):
+    return [{k: v for k, v in record.items() if k != 'scraped_at'} for record in records]
+
+
+def timed(fn, *args):
+    started = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - started, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=20000)
+    parser.add_argument('--repeat', type=float, default=0.1, help='Share of rows that repeat an earlier raw row')
+    args = parser.parse_args()
+
+    rows = synthetic_rows(args.rows, args.repeat)
+    legacy_time, expected = timed(lambda: [legacy_normalize_record(row) for row in rows])
+    fast_time, actual = timed(pds.normalize_records, rows)
+    cells = [row[field] for row in rows for field in ('symbol', 'companyname')]
+    same_cells = all(pds.clean_html_anchor(cell) == legacy_clean_html_anchor(cell) for cell in cells)
+
+    print(f"{len(rows)} rows ({args.repeat:.0%} repeated raw payloads)")
+    print(f"  soup per cell      {legacy_time * 1000:8.1f} ms")
+    print(f"  normalize_records  {fast_time * 1000:8.1f} ms")
+    print(f"  anchors identical: {same_cells}, records identical: {without_timestamps(actual) == without_timestamps(expected)}")
+
+
+if __name__ == '__main__':
+    main()
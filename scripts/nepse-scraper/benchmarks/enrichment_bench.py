@@ -0,0 +1,133 @@
+"""
+Time disclosure enrichment on a synthetic history, old full-history
+rewrite vs. the delta-only segment store path, and check both give the
+same records.
+
+    python benchmarks/enrichment_bench.py [--records 100000] [--delta 50]
+"""
+import argparse
+import copy
+import os
+import random
+import re
+import sys
+import tempfile
+import time
+import urllib.parse
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from enrichment import COMPANY_DISCLOSURE_PIPELINE  # noqa: E402
+from segment_store import SegmentStore  # noqa: E402
+from text_utils import NON_SYMBOL_TOKENS  # noqa: E402
+
+START = datetime(2015, 1, 1)
+
+
+def synthetic_disclosures(count, seed=1, first_id=1):
+    rng = random.Random(seed)
+    records = []
+    for offset in range(count):
+        record_id = first_id + offset
+        symbol = ''.join(rng.choice('ABCDEFGHIJKLMNOPQRSTUVWXYZ') for _ in range(rng.randint(3, 6)))
+        if symbol in NON_SYMBOL_TOKENS:
+            symbol += 'X'
+        added = START + timedelta(minutes=record_id * 45)
+        headline = rng.choice([
+            f'Regarding AGM of the company [{symbol}]',
+            f'Board meeting notice ({symbol})',
+            'Notice regarding trading hours',
+        ])
+        records.append({
+            'id': record_id,
+            'newsHeadline': headline,
+            'newsBody': '',
+            'addedDate': added.isoformat(timespec='milliseconds'),
+            'applicationDocumentDetailsList': [{
+                'id': record_id * 10,
+                'filePath': f'{symbol}_user/{added:%Y-%m-%d}/Company News/NEPSE_{record_id:06d}.pdf',
+            }],
+        })
+    return records
+
+
+# The enrichment as it was before EnrichmentPipeline: two passes, regexes
+# compiled on every call.
+def legacy_build_file_url(file_path):
+    if not file_path:
+        return None
+    file_path = str(file_path)
+    if file_path.startswith('http://') or file_path.startswith('https://'):
+        return file_path
+    base_url = "https://www.nepalstock.com.np/api/nots/security/fetchFiles?fileLocation="
+    return base_url + urllib.parse.quote(file_path, safe="/%")
+
+
+def legacy_extract_symbol(title):
+    if not title:
+        return ""
+    match = re.search(r'\[([A-Za-z0-9]+)\]', str(title))
+    if match:
+        return match.group(1).upper()
+    match = re.search(r'\(([A-Za-z0-9]+)\)', str(title))
+    if match:
+        return match.group(1).upper()
+    return ""
+
+
+def legacy_enrich(records):
+    for record in records:
+        for doc in record.get('applicationDocumentDetailsList') or []:
+            file_url = legacy_build_file_url(doc.get('filePath'))
+            if file_url:
+                doc['fileUrl'] = file_url
+    for record in records:
+        symbol = legacy_extract_symbol(record.get('newsHeadline') or record.get('messageTitle') or "")
+        if symbol:
+            record['symbol'] = symbol
+    return records
+
+
+def record_date(record):
+    return datetime.fromisoformat(record['addedDate'])
+
+
+def timed(fn, *args):
+    started = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - started, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--records', type=int, default=100000, help='Size of the synthetic history')
+    parser.add_argument('--delta', type=int, default=50, help='New records per scrape')
+    args = parser.parse_args()
+
+    history = synthetic_disclosures(args.records)
+    delta = synthetic_disclosures(args.delta, seed=2, first_id=args.records + 1)
+
+    legacy_time, legacy = timed(legacy_enrich, copy.deepcopy(history + delta))
+    pipeline_time, enriched = timed(COMPANY_DISCLOSURE_PIPELINE, copy.deepcopy(history + delta))
+    rerun_time, rerun = timed(COMPANY_DISCLOSURE_PIPELINE, copy.deepcopy(enriched))
+    print(f"Full history ({len(legacy)} records):")
+    print(f"  legacy two-pass enrichment   {legacy_time * 1000:9.1f} ms")
+    print(f"  EnrichmentPipeline           {pipeline_time * 1000:9.1f} ms")
+    print(f"  identical output: {legacy == enriched}, idempotent: {rerun == enriched}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = SegmentStore(tmp, lambda r: str(r['id']), record_date)
+        seed_time, _ = timed(store.upsert, copy.deepcopy(history), COMPANY_DISCLOSURE_PIPELINE)
+        upsert_time, new = timed(store.upsert, copy.deepcopy(delta), COMPANY_DISCLOSURE_PIPELINE)
+        view_time, view = timed(store.records)
+        expected = sorted(legacy, key=record_date, reverse=True)
+        print(f"Segment store ({len(store.segments())} monthly segments):")
+        print(f"  seed from history            {seed_time * 1000:9.1f} ms (one-off)")
+        print(f"  upsert {len(new):>5} new records     {upsert_time * 1000:9.1f} ms")
+        print(f"  build monolithic view        {view_time * 1000:9.1f} ms")
+        print(f"  view matches legacy output: {view == expected}")
+
+
+if __name__ == '__main__':
+    main()
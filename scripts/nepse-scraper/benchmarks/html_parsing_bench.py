@@ -0,0 +1,205 @@
+"""
+Time the HTML scrapers' parsing on fixture pages: the old full-page
+html.parser soup with a `soup.find(id=...)` per lookup vs. html_parsing
+(SoupStrainer-scoped parse, id index, lxml when installed), and check both
+give the same results.
+
+Pages are read from --fixtures DIR when given (company_list.html,
+live_trading.html, upcoming_ipo.html, proposed_dividend.html, e.g. saved
+from the live sites); missing ones are generated with the same structure
+and comparable size.
+
+    python benchmarks/html_parsing_bench.py [--fixtures DIR] [--repeat 5]
+"""
+import argparse
+import contextlib
+import os
+import random
+import sys
+import time
+
+from bs4 import BeautifulSoup
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import html_parsing  # noqa: E402
+import proposed_dividend_scraper  # noqa: E402
+import scraper  # noqa: E402
+import sectors  # noqa: E402
+import upcoming_ipo_scraper  # noqa: E402
+
+TIMESTAMP_FIELDS = ('scraped_at', 'last_updated')
+
+
+def page(body, rng):
+    """`body` wrapped in the navigation, scripts and footer bulk of a real page."""
+    menu = ''.join(f'<li class="nav-item"><a class="nav-link" href="/menu/{i}">Menu {i}</a></li>' for i in range(150))
+    news = ''.join(
+        f'<div class="col-md-4 card"><div class="card-body"><h5 class="card-title">Headline {i}</h5>'
+        f'<p class="card-text">{" ".join("word%d" % rng.randint(0, 999) for _ in range(40))}</p>'
+        f'<a href="/news/{i}" class="btn">Read</a></div></div>' for i in range(120)
+    )
+    scripts = ''.join(f'<script>var cfg{i} = {{"a": {i}, "b": "{"x" * 200}"}};</script>' for i in range(30))
+    return (
+        f'<!DOCTYPE html><html><head><title>Fixture</title>{scripts}</head><body>'
+        f'<nav><ul class="navbar-nav">{menu}</ul></nav><div class="container"><div class="row">{news}</div>'
+        f'{body}</div><footer>{menu}</footer></body></html>'
+    )
+
+
+def company_list_page(rng, sector_count=22, companies=40):
+    panels = []
+    for s in range(1, sector_count + 1):
+        rows = ''.join(
+            f'<tr><td><a href="/CompanyDetail.aspx?symbol=S{s}C{c}">S{s}C{c}</a></td>'
+            f'<td>  Company {c} of\n sector {s} Limited </td><td>{rng.randint(1, 999)}</td></tr>'
+            for c in range(companies)
+        )
+        panels.append(
+            f'<div class="panel panel-default"><div class="panel-heading"><h4 class="panel-title">'
+            f'<a data-toggle="collapse" data-parent="#accordion" href="#collapse_{s}">Sector {s}</a></h4></div>'
+            f'<div id="collapse_{s}" class="panel-collapse collapse"><div class="panel-body">'
+            f'<table class="table"><thead><tr><th>Symbol</th><th>Name</th></tr></thead><tbody>{rows}</tbody></table>'
+            f'</div></div></div>'
+        )
+    return page(f'<div class="panel-group" id="accordion">{"".join(panels)}</div>', rng)
+
+
+def live_trading_page(rng, symbols=320):
+    rows = ''.join(
+        f'<tr><td>{i}</td><td><a href="/company/s{i}">S{i}</a></td><td>{rng.uniform(100, 3000):,.2f}</td>'
+        f'<td>{rng.uniform(-50, 50):.2f}</td><td>{rng.uniform(-10, 10):.2f}%</td><td>{rng.uniform(100, 3000):.2f}</td>'
+        f'<td>{rng.uniform(100, 3000):.2f}</td><td>{rng.uniform(100, 3000):.2f}</td><td>{rng.randint(0, 99999):,}</td>'
+        f'<td>{rng.uniform(100, 3000):.2f}</td></tr>'
+        for i in range(symbols)
+    )
+    table = (
+        '<table class="table table-bordered dataTable" id="headFixed"><thead><tr>'
+        + ''.join(f'<th>H{i}</th>' for i in range(10))
+        + f'</tr></thead><tbody>{rows}</tbody></table>'
+    )
+    return page(table, rng)
+
+
+def upcoming_ipo_page(rng, announcements=40):
+    items = ''.join(
+        f'<div class="media"><div class="media-body"><small class="text-muted">Jan {i % 28 + 1}, 2026</small>'
+        f'<a href="/AnnouncementDetail.aspx?id={i}">Company {i} Limited is going to issue its '
+        f'{rng.randint(1, 99) * 10000:,} units of IPO shares to the general public from 1st - 5th Magh, 2082</a>'
+        f'</div></div>'
+        for i in range(announcements)
+    )
+    return page(f'<div class="announcement-list">{items}</div>', rng)
+
+
+def proposed_dividend_page(rng, years=18):
+    options = ''.join(f'<option value="{y}">FY {2064 + y}/{2065 + y}</option>' for y in range(1, years + 1))
+    return page(f'<form><select id="year" class="form-control"><option value="">All</option>{options}</select></form>', rng)
+
+
+PAGES = {
+    'company_list.html': company_list_page,
+    'live_trading.html': live_trading_page,
+    'upcoming_ipo.html': upcoming_ipo_page,
+    'proposed_dividend.html': proposed_dividend_page,
+}
+
+PARSE = {
+    'company_list.html': sectors.parse_sector_codes,
+    'live_trading.html': scraper.parse_live_trading,
+    'upcoming_ipo.html': upcoming_ipo_scraper.parse_upcoming_ipo,
+    'proposed_dividend.html': proposed_dividend_scraper.parse_year_options,
+}
+
+MODULES = (sectors, scraper, upcoming_ipo_scraper, proposed_dividend_scraper)
+
+
+def load_fixture(directory, name, rng):
+    if directory:
+        path = os.path.join(directory, name)
+        if os.path.exists(path):
+            with open(path, 'rb') as f:
+                return f.read(), 'saved'
+    return PAGES[name](rng).encode('utf-8'), 'generated'
+
+
+class FindById:
+    """Stands in for the id index: one `soup.find(id=...)` per lookup, as before."""
+
+    def __init__(self, soup):
+        self.soup = soup
+
+    def get(self, element_id):
+        return self.soup.find(id=element_id)
+
+
+@contextlib.contextmanager
+def legacy_parsing():
+    """Run the scrapers' parse functions the old way: whole page, html.parser, find(id)."""
+    saved = [(module, module.__dict__.get('parse_html'), module.__dict__.get('index_ids')) for module in MODULES]
+    for module in MODULES:
+        module.parse_html = lambda markup, only=None, parser=None: BeautifulSoup(markup, 'html.parser')
+        if 'index_ids' in module.__dict__:
+            module.index_ids = FindById
+    try:
+        yield
+    finally:
+        for module, parse_html, index_ids in saved:
+            module.parse_html = parse_html
+            if index_ids is not None:
+                module.index_ids = index_ids
+
+
+@contextlib.contextmanager
+def parser(name):
+    saved = html_parsing.DEFAULT_PARSER
+    html_parsing.DEFAULT_PARSER = name
+    try:
+        yield
+    finally:
+        html_parsing.DEFAULT_PARSER = saved
+
+
+def strip_timestamps(result):
+    if isinstance(result, list):
+        return [strip_timestamps(item) for item in result]
+    if isinstance(result, dict):
+        return {k: strip_timestamps(v) for k, v in result.items() if k not in TIMESTAMP_FIELDS}
+    return result
+
+
+def best_of(repeat, fn, *args):
+    best, result = float('inf'), None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn(*args)
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument('--fixtures', help='Directory with saved pages')
+    arg_parser.add_argument('--repeat', type=int, default=5, help='Runs per variant (best is reported)')
+    args = arg_parser.parse_args()
+    for module in MODULES:
+        module.print = lambda *a, **k: None  # silence per-page progress
+
+    rng = random.Random(5)
+    parsers = ['html.parser'] + (['lxml'] if html_parsing.DEFAULT_PARSER == 'lxml' else [])
+    print(f"default parser: {html_parsing.DEFAULT_PARSER}")
+    for name, parse in PARSE.items():
+        content, source = load_fixture(args.fixtures, name, rng)
+        with legacy_parsing():
+            legacy_time, expected = best_of(args.repeat, parse, content)
+        print(f"{name} ({source}, {len(content) / 1024:.0f} KiB)")
+        print(f"  full html.parser      {legacy_time * 1000:8.1f} ms")
+        for parser_name in parsers:
+            with parser(parser_name):
+                strained_time, actual = best_of(args.repeat, parse, content)
+            same = strip_timestamps(actual) == strip_timestamps(expected)
+            print(f"  strained {parser_name:<12} {strained_time * 1000:8.1f} ms  same result: {same}")
+
+
+if __name__ == '__main__':
+    main()
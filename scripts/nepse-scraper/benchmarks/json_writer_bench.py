@@ -0,0 +1,66 @@
+"""
+Compare output size and write time of the old json.dump(indent=4) writer
+with json_writer.write_json_atomic on the committed data files.
+
+    python benchmarks/json_writer_bench.py [--repeat 5] [files ...]
+"""
+import argparse
+import glob
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from json_writer import FORMATS, write_json_atomic  # noqa: E402
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+DEFAULT_FILES = ['disclosures.json', 'top_stocks.json', 'nepse_data.json', 'exchange_messages.json', 'notices.json']
+
+
+def legacy_write(path, data):
+    with open(path, 'w') as f:
+        json.dump(data, f, indent=4)
+
+
+def timed(write, path, data, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        write(path, data)
+        best = min(best, time.perf_counter() - started)
+    return best, os.path.getsize(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('files', nargs='*', help='Files to rewrite (default: the largest data/*.json outputs)')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    paths = args.files or [os.path.join(REPO_ROOT, 'data', name) for name in DEFAULT_FILES]
+    paths = [p for p in paths if glob.glob(p)]
+    out_dir = tempfile.mkdtemp(prefix='json-writer-bench-')
+
+    print(f"{'file':<26} {'writer':<14} {'bytes':>10} {'ms':>8}")
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        name = os.path.basename(path)
+        target = os.path.join(out_dir, name)
+
+        seconds, size = timed(legacy_write, target, data, args.repeat)
+        print(f"{name:<26} {'indent=4':<14} {size:>10} {seconds * 1000:>8.2f}")
+        for fmt in FORMATS:
+            seconds, size = timed(lambda p, d: write_json_atomic(p, d, format=fmt, compress=()), target, data, args.repeat)
+            print(f"{name:<26} {fmt:<14} {size:>10} {seconds * 1000:>8.2f}")
+        seconds, _ = timed(lambda p, d: write_json_atomic(p, d, format='lines', compress=('gz',)), target, data, args.repeat)
+        with open(target, 'r', encoding='utf-8') as f:
+            assert json.load(f) == data
+        print(f"{name:<26} {'lines + .gz':<14} {os.path.getsize(target + '.gz'):>10} {seconds * 1000:>8.2f}")
+
+
+if __name__ == '__main__':
+    main()
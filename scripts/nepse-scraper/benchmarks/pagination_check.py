@@ -0,0 +1,67 @@
+"""
+Check that get_trading_average returns what the single-request version did.
+
+Replays trading-average responses in three shapes (an object without
+`content`, a plain list, and a two-page body) and compares the result with
+the old `response.json()`: unpaginated bodies must come back unchanged, a
+paginated one as the rows of every page.
+
+    python benchmarks/pagination_check.py
+
+Exits with status 1 on any difference.
+"""
+import os
+import shutil
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import synthetic_fixtures  # noqa: E402
+from official_api import NepseScraper  # noqa: E402
+from official_api import replay  # noqa: E402
+
+# nDays -> the response pages recorded for it.
+TRADING_AVERAGE_PAGES = {
+    30: [{'nDays': 30, 'averageTurnover': 1234.5, 'averageVolume': 678}],
+    60: [[{'symbol': 'NABIL', 'averagePrice': 510.2}, {'symbol': 'NICA', 'averagePrice': 402.0}]],
+    90: [
+        {'content': [{'symbol': 'NABIL', 'averagePrice': 511.0}], 'number': 0, 'totalPages': 2, 'last': False},
+        {'content': [{'symbol': 'NICA', 'averagePrice': 401.5}], 'number': 1, 'totalPages': 2, 'last': True},
+    ],
+}
+
+
+def expected_result(pages):
+    if isinstance(pages[0], dict) and 'content' in pages[0]:
+        return [row for page in pages for row in page['content']]
+    return pages[0]
+
+
+def main() -> None:
+    fixtures = tempfile.mkdtemp(prefix='nepse-pagination-')
+    try:
+        store = synthetic_fixtures.build(fixtures)
+        for n_days, pages in TRADING_AVERAGE_PAGES.items():
+            for number, page in enumerate(pages):
+                params = {'nDays': n_days, 'page': number, 'size': 500}
+                store.add_json('GET', synthetic_fixtures.nepse_url('trading_average_api', params), page)
+        replay.configure(transport='replay', fixtures=fixtures)
+        scraper = NepseScraper(verify_ssl=False)
+
+        failures = 0
+        for n_days, pages in TRADING_AVERAGE_PAGES.items():
+            expected = expected_result(pages)
+            actual = scraper.get_trading_average(n_days=n_days)
+            ok = type(actual) is type(expected) and actual == expected
+            failures += not ok
+            shape = f"{len(pages)} pages" if len(pages) > 1 else type(expected).__name__
+            print(f"nDays={n_days} ({shape}): {'ok' if ok else f'MISMATCH, got {actual!r}'}")
+    finally:
+        shutil.rmtree(fixtures, ignore_errors=True)
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,160 @@
+"""
+Check that price_transform gives byte-identical nepse_data rows to the old
+per-row mapping (values and int/float types), then time the old loop, the
+pure-Python backend and the numpy backend on a synthetic backfill.
+
+    python benchmarks/price_transform_bench.py [--days 1000] [--symbols 300]
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from price_transform import map_omf_rows, map_today_prices, price_changes, today_price_columns  # noqa: E402
+
+
+# The mappings as they were inlined in official_scraper.py.
+def legacy_map_today_prices(raw_prices):
+    mapped_prices = []
+    for item in raw_prices:
+        ltp = item.get('lastUpdatedPrice', 0)
+        prev_close = item.get('previousDayClosePrice', 0)
+        change = round(ltp - prev_close, 2) if ltp and prev_close else 0
+        p_change = round((change / prev_close) * 100, 2) if prev_close != 0 else 0
+        mapped_prices.append({
+            "symbol": item.get('symbol'),
+            "name": item.get('securityName'),
+            "ltp": ltp,
+            "previous_close": prev_close,
+            "change": change,
+            "percent_change": p_change,
+            "high": item.get('highPrice'),
+            "low": item.get('lowPrice'),
+            "volume": item.get('totalTradedQuantity'),
+            "turnover": item.get('totalTradedValue'),
+            "trades": item.get('totalTrades'),
+            "last_updated": item.get('lastUpdatedTime'),
+            "market_cap": item.get('marketCapitalization')
+        })
+    return mapped_prices
+
+
+def legacy_map_omf_rows(omf_items):
+    mapped = []
+    for item in omf_items:
+        if not isinstance(item, dict) or not item.get('symbol') or not item.get('fund_name'):
+            continue
+        ltp = item.get('daily_nav')
+        previous_close = item.get('weekly_nav')
+        change = (
+            round(ltp - previous_close, 2)
+            if isinstance(ltp, (int, float)) and isinstance(previous_close, (int, float))
+            else 0
+        )
+        percent_change = (
+            round((change / previous_close) * 100, 2)
+            if isinstance(previous_close, (int, float)) and previous_close != 0
+            else 0
+        )
+        mapped.append({
+            "symbol": item.get('symbol'), "name": item.get('fund_name'), "ltp": ltp,
+            "previous_close": previous_close, "change": change, "percent_change": percent_change,
+            "high": None, "low": None, "volume": None, "turnover": None, "trades": None,
+            "last_updated": item.get('daily_nav_date') or item.get('scraped_at'),
+            "market_cap": item.get('fund_size'), "asset_type": "open_ended_mutual_fund"
+        })
+    return mapped
+
+
+def random_price(rng):
+    kind = rng.random()
+    if kind < 0.05:
+        return 0
+    if kind < 0.15:
+        return rng.randint(10, 5000)
+    if kind < 0.25:
+        # Values that sit on a rounding half after subtraction.
+        return rng.randint(1000, 500000) / 1000 + 0.005
+    return round(rng.uniform(10, 5000), rng.choice((1, 2)))
+
+
+def synthetic_today_prices(days, symbols, seed=1):
+    rng = random.Random(seed)
+    rows = []
+    for day in range(days):
+        for index in range(symbols):
+            rows.append({
+                'symbol': f'SYM{index:03d}',
+                'securityName': f'Security {index}',
+                'lastUpdatedPrice': random_price(rng),
+                'previousDayClosePrice': random_price(rng),
+                'highPrice': random_price(rng),
+                'lowPrice': random_price(rng),
+                'totalTradedQuantity': rng.randint(0, 100000),
+                'totalTradedValue': round(rng.uniform(0, 1e8), 2),
+                'totalTrades': rng.randint(0, 2000),
+                'lastUpdatedTime': f'day-{day}',
+                'marketCapitalization': round(rng.uniform(100, 1e5), 2),
+            })
+    return rows
+
+
+def synthetic_omf(count, seed=2):
+    rng = random.Random(seed)
+    navs = [None, 0, 10, 10.0, 9.995, 10.005]
+    return [{
+        'symbol': f'OMF{index}',
+        'fund_name': f'Fund {index}',
+        'daily_nav': rng.choice(navs) if rng.random() < 0.3 else round(rng.uniform(8, 15), 2),
+        'weekly_nav': rng.choice(navs) if rng.random() < 0.3 else round(rng.uniform(8, 15), 2),
+        'daily_nav_date': '2026-05-06',
+        'fund_size': rng.randint(1, 10 ** 9),
+    } for index in range(count)]
+
+
+def timed(fn, *args, **kwargs):
+    started = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return time.perf_counter() - started, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--days', type=int, default=1000)
+    parser.add_argument('--symbols', type=int, default=300)
+    args = parser.parse_args()
+
+    raw = synthetic_today_prices(args.days, args.symbols)
+    legacy_time, legacy = timed(legacy_map_today_prices, raw)
+    python_time, python_rows = timed(map_today_prices, raw, backend='python')
+    numpy_time, numpy_rows = timed(map_today_prices, raw, backend='numpy')
+    expected = json.dumps(legacy)
+    print(f"today_price rows: {len(raw)} ({args.days} days x {args.symbols} symbols)")
+    print(f"  legacy loop      {legacy_time * 1000:8.1f} ms")
+    print(f"  python backend   {python_time * 1000:8.1f} ms  identical: {json.dumps(python_rows) == expected}")
+    print(f"  numpy backend    {numpy_time * 1000:8.1f} ms  identical: {json.dumps(numpy_rows) == expected}")
+
+    columns_time, columns = timed(today_price_columns, raw, backend='numpy')
+    same_columns = all(columns[field] == [row[field] for row in legacy] for field in columns)
+    print(f"  numpy columns    {columns_time * 1000:8.1f} ms  identical: {same_columns} (no row dicts)")
+
+    ltps = [item.get('lastUpdatedPrice', 0) for item in raw]
+    prevs = [item.get('previousDayClosePrice', 0) for item in raw]
+    python_changes_time, _ = timed(price_changes, ltps, prevs, backend='python')
+    numpy_changes_time, _ = timed(price_changes, ltps, prevs, backend='numpy')
+    print(f"change/percent_change only: python {python_changes_time * 1000:.1f} ms, "
+          f"numpy {numpy_changes_time * 1000:.1f} ms")
+
+    omf = synthetic_omf(20000)
+    expected = json.dumps(legacy_map_omf_rows(omf))
+    print("OMF rows identical: "
+          f"python {json.dumps(map_omf_rows(omf, backend='python')) == expected}, "
+          f"numpy {json.dumps(map_omf_rows(omf, backend='numpy')) == expected}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,290 @@
+"""
+End-to-end benchmark of every scraper against fixtures instead of the live
+sites: the official stage graph (scrape_all_official_data), the
+proposed-dividend latest / all-years fetch and history merge, the
+open-ended fund NAVs, the upcoming IPOs and the sector codes. Reports the
+total and per-stage wall-clock times and compares them with a stored
+baseline.
+
+Requests go through official_api/replay.py: `--transport replay` answers
+them in-process, `--transport server` sends them over HTTP to a local
+fixture_server.py, so connection pooling, adapter retries and conditional
+GETs are part of the measurement. `--latency`, `--jitter` and
+`--error-rate` shape the responses. Without `--fixtures` a fixture set is
+synthesized from data/ (benchmarks/synthetic_fixtures.py).
+
+Every repeat starts like a CI run: a fresh copy of data/ and an empty
+cache directory (no token, validators or compiled WASM). The best repeat
+is reported. The proposed-dividend fetches are paced at `--rate` requests
+per second, the scraper's default; pass a large value to take pacing out.
+
+    python benchmarks/suite.py [--transport replay|server] [--fixtures DIR]
+        [--only official,omf] [--repeat 3] [--latency 0.05] [--error-rate 0.02]
+        [--baseline benchmarks/baseline.json] [--save-baseline] [--threshold 0.25]
+
+Exits with status 1 if a scenario's total (with --per-stage, any stage)
+regressed by more than `--threshold` (relative, and at least `--min-delta`
+seconds) against the baseline.
+Timings only compare on the same machine and settings; regenerate the
+baseline there with --save-baseline.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import warnings
+
+from urllib3.exceptions import InsecureRequestWarning
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import fixture_server  # noqa: E402
+import official_scraper  # noqa: E402
+import open_ended_mutual_fund_scraper as omf_scraper  # noqa: E402
+import proposed_dividend_scraper  # noqa: E402
+import sectors  # noqa: E402
+import synthetic_fixtures  # noqa: E402
+import upcoming_ipo_scraper  # noqa: E402
+from official_api import NepseScraper, SessionCache, ValidatorStore  # noqa: E402
+from official_api import replay  # noqa: E402
+from json_writer import write_json_atomic  # noqa: E402
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+
+class Timer:
+    """Named wall-clock timings of one scenario run."""
+
+    def __init__(self):
+        self.stages = {}
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] = time.perf_counter() - started
+
+
+def scenario_official(work_dir, rate, timer):
+    data_dir = os.path.join(work_dir, 'data')
+    scraper = NepseScraper(verify_ssl=False, session_cache=SessionCache(), validator_store=ValidatorStore())
+    runner = official_scraper.build_official_stages(scraper, data_dir)
+    ok = runner.run()
+    timer.stages.update(runner.timings)
+    if not ok:
+        raise RuntimeError(f"failed stages: {sorted(runner.errors) + sorted(runner.skipped)}")
+
+
+def scenario_proposed_dividend(work_dir, rate, timer):
+    out_dir = os.path.join(work_dir, 'data', 'proposed_dividend')
+    # Seeding the segment store from the committed view is a one-off migration, not part of a run.
+    proposed_dividend_scraper.open_history_store(out_dir)
+    session = proposed_dividend_scraper.create_session(pool_size=proposed_dividend_scraper.DEFAULT_WORKERS)
+    limiter = proposed_dividend_scraper.create_rate_limiter(rate)
+    with timer.stage('latest_1y'):
+        latest = proposed_dividend_scraper.fetch_latest_1y(session)
+    with timer.stage('all_years'):
+        all_years = proposed_dividend_scraper.fetch_all_years(session, limiter=limiter)
+    with timer.stage('merge'):
+        proposed_dividend_scraper.merge_into_history(out_dir, all_years)
+        proposed_dividend_scraper.write_latest(out_dir, latest)
+        proposed_dividend_scraper.merge_into_history(out_dir, latest)
+    if not latest or not all_years:
+        raise RuntimeError("no proposed-dividend rows")
+
+
+def scenario_omf(work_dir, rate, timer):
+    session = omf_scraper.create_session()
+    with timer.stage('fetch'):
+        rows = omf_scraper.fetch_open_ended_navs(session)
+    with timer.stage('normalize_write'):
+        data = omf_scraper.normalize_rows(rows)
+        omf_scraper.save_json(os.path.join(work_dir, 'data', omf_scraper.OUTPUT_FILE), data)
+    if not data:
+        raise RuntimeError("no open-ended fund rows")
+
+
+def scenario_upcoming_ipo(work_dir, rate, timer):
+    with timer.stage('scrape'):
+        data = upcoming_ipo_scraper.scrape_upcoming_ipo()
+    if not data:
+        raise RuntimeError("no upcoming IPOs")
+
+
+def scenario_sectors(work_dir, rate, timer):
+    with timer.stage('scrape'):
+        data = sectors.get_sector_wise_codes()
+    if not data:
+        raise RuntimeError("no sector codes")
+    with timer.stage('write'):
+        write_json_atomic(os.path.join(work_dir, 'data', 'nepse_sector_wise_codes.json'), data)
+
+
+SCENARIOS = {
+    'official': scenario_official,
+    'proposed_dividend': scenario_proposed_dividend,
+    'omf': scenario_omf,
+    'upcoming_ipo': scenario_upcoming_ipo,
+    'sectors': scenario_sectors,
+}
+
+
+def run_once(name, rate, fixtures):
+    """One run of scenario `name` in a fresh work and cache directory; returns its timings."""
+    work_dir = tempfile.mkdtemp(prefix=f'nepse-bench-{name}-')
+    saved_cache_dir = os.environ.get('NEPSE_CACHE_DIR')
+    try:
+        shutil.copytree(synthetic_fixtures.DATA_DIR, os.path.join(work_dir, 'data'))
+        os.environ['NEPSE_CACHE_DIR'] = os.path.join(work_dir, 'cache')
+        replay.fixture_store(fixtures).rewind()
+        timer = Timer()
+        output = io.StringIO()
+        started = time.perf_counter()
+        with contextlib.redirect_stdout(output):
+            SCENARIOS[name](work_dir, rate, timer)
+        timer.stages['total'] = time.perf_counter() - started
+        return timer.stages
+    finally:
+        if saved_cache_dir is None:
+            os.environ.pop('NEPSE_CACHE_DIR', None)
+        else:
+            os.environ['NEPSE_CACHE_DIR'] = saved_cache_dir
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def best_of(name, repeat, rate, fixtures):
+    """Per-stage minimum over `repeat` runs (the total is the best run's total)."""
+    best = {}
+    for _ in range(repeat):
+        timings = run_once(name, rate, fixtures)
+        for stage, seconds in timings.items():
+            best[stage] = min(seconds, best.get(stage, float('inf')))
+    return best
+
+
+def compare(results, baseline, threshold, min_delta, per_stage=False):
+    """
+    Print current vs. baseline timings; returns the regressed `scenario.stage`
+    names. Only scenario totals count unless `per_stage`: stages that run
+    concurrently share the interpreter and their times vary run to run.
+    """
+    regressions = []
+    for name, timings in results.items():
+        previous = baseline.get(name, {})
+        print(f"{name}")
+        for stage, seconds in sorted(timings.items(), key=lambda item: (item[0] != 'total', -item[1])):
+            before = previous.get(stage)
+            if before is None:
+                print(f"  {stage:<24} {seconds * 1000:9.1f} ms")
+                continue
+            ratio = seconds / before if before else float('inf')
+            slower = seconds - before > min_delta and ratio > 1 + threshold
+            regressed = slower and (per_stage or stage == 'total')
+            flag = '  REGRESSION' if regressed else ('  slower' if slower else '')
+            print(f"  {stage:<24} {seconds * 1000:9.1f} ms  baseline {before * 1000:9.1f} ms  x{ratio:5.2f}{flag}")
+            if regressed:
+                regressions.append(f"{name}.{stage}")
+    return regressions
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument('--transport', choices=('replay', 'server'), default='replay')
+    arg_parser.add_argument('--fixtures', help='Fixture directory (default: synthesized from data/)')
+    arg_parser.add_argument('--scale', type=int, default=1, help='Scale of the synthesized fixtures')
+    arg_parser.add_argument('--only', help=f"Comma-separated scenarios (default: all of {', '.join(SCENARIOS)})")
+    arg_parser.add_argument('--repeat', type=int, default=3, help='Runs per scenario (best is reported)')
+    arg_parser.add_argument('--latency', type=float, default=0.0, help='Seconds added to every response')
+    arg_parser.add_argument('--jitter', type=float, default=0.0, help='Extra random latency (server transport)')
+    arg_parser.add_argument('--error-rate', type=float, default=0.0, help='Share of responses turned into HTTP 503')
+    arg_parser.add_argument('--rate', type=float, default=proposed_dividend_scraper.DEFAULT_RATE,
+                            help='Proposed-dividend requests per second')
+    arg_parser.add_argument('--baseline', default=DEFAULT_BASELINE, help='Baseline file to compare with / save to')
+    arg_parser.add_argument('--save-baseline', action='store_true', help='Store these results as the baseline')
+    arg_parser.add_argument('--threshold', type=float, default=0.25, help='Relative slowdown reported as a regression')
+    arg_parser.add_argument('--min-delta', type=float, default=0.005, help='Ignore slowdowns below this many seconds')
+    arg_parser.add_argument('--per-stage', action='store_true', help='Also fail on slower stages, not just totals')
+    args = arg_parser.parse_args()
+    # The official scrape runs with verify_ssl=False, as in scrape_all_official_data.
+    warnings.filterwarnings('ignore', category=InsecureRequestWarning)
+
+    names = args.only.split(',') if args.only else list(SCENARIOS)
+    unknown = [name for name in names if name not in SCENARIOS]
+    if unknown:
+        arg_parser.error(f"unknown scenarios: {', '.join(unknown)}")
+
+    temp_fixtures = None
+    fixtures = args.fixtures
+    if fixtures is None:
+        temp_fixtures = fixtures = tempfile.mkdtemp(prefix='nepse-fixtures-')
+        synthetic_fixtures.build(fixtures, scale=args.scale)
+
+    server = None
+    if args.transport == 'server':
+        server = fixture_server.FixtureServer(replay.fixture_store(fixtures), port=0, latency=args.latency,
+                                              jitter=args.jitter, error_rate=args.error_rate)
+        replay.configure(transport='server', server_url=server.start())
+    else:
+        replay.configure(transport='replay', fixtures=fixtures, latency=args.latency, error_rate=args.error_rate)
+
+    settings = {
+        'transport': args.transport,
+        'fixtures': 'synthetic' if args.fixtures is None else os.path.abspath(args.fixtures),
+        'scale': args.scale if args.fixtures is None else None,
+        'latency': args.latency,
+        'jitter': args.jitter,
+        'error_rate': args.error_rate,
+        'rate': args.rate,
+    }
+    results, failures = {}, {}
+    try:
+        for name in names:
+            try:
+                results[name] = best_of(name, args.repeat, args.rate, fixtures)
+            except Exception as exc:
+                failures[name] = exc
+    finally:
+        if server is not None:
+            server.stop()
+        if temp_fixtures is not None:
+            shutil.rmtree(temp_fixtures, ignore_errors=True)
+
+    baseline = {}
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            stored = json.load(f)
+        baseline = stored.get('results', {})
+        if stored.get('settings') != settings:
+            print(f"Note: baseline was taken with different settings: {stored.get('settings')}")
+
+    print(f"Python {platform.python_version()}, {settings}")
+    regressions = compare(results, baseline, args.threshold, args.min_delta, per_stage=args.per_stage)
+    for name, exc in failures.items():
+        print(f"{name}: FAILED ({exc})")
+
+    if args.save_baseline and not failures:
+        write_json_atomic(args.baseline, {
+            'settings': settings,
+            'python': platform.python_version(),
+            'machine': platform.machine(),
+            'results': {name: {stage: round(seconds, 6) for stage, seconds in timings.items()}
+                        for name, timings in results.items()},
+        }, format='pretty', compress=())
+        print(f"Saved baseline to {args.baseline}")
+
+    if regressions:
+        print(f"Regressions: {', '.join(regressions)}")
+    if regressions or failures:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
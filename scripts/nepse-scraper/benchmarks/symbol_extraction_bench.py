@@ -0,0 +1,70 @@
+"""
+Compare the old two-search symbol extraction with text_utils.extract_symbol
+on the committed disclosure and exchange message titles: time per title and
+every title where the two disagree.
+
+    python benchmarks/symbol_extraction_bench.py [--repeat 200]
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from text_utils import extract_symbol, known_symbols  # noqa: E402
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+
+def legacy_extract_symbol(title):
+    if not title:
+        return ""
+    match = re.search(r'\[([A-Za-z0-9]+)\]', title)
+    if match:
+        return match.group(1).upper()
+    match = re.search(r'\(([A-Za-z0-9]+)\)', title)
+    if match:
+        return match.group(1).upper()
+    return ""
+
+
+def load_titles():
+    titles = []
+    for name in ('disclosures.json', 'exchange_messages.json'):
+        with open(os.path.join(REPO_ROOT, 'data', name), 'r', encoding='utf-8') as f:
+            for record in json.load(f):
+                title = record.get('newsHeadline') or record.get('messageTitle')
+                if title:
+                    titles.append(title)
+    return titles
+
+
+def per_title_us(fn, titles, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for title in titles:
+            fn(title)
+    return (time.perf_counter() - started) / (repeat * len(titles)) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args()
+
+    titles = load_titles()
+    print(f"{len(titles)} titles, {len(known_symbols())} known symbols")
+    print(f"  legacy        {per_title_us(legacy_extract_symbol, titles, args.repeat):6.2f} us/title")
+    print(f"  text_utils    {per_title_us(extract_symbol, titles, args.repeat):6.2f} us/title")
+
+    for title in titles:
+        old, new = legacy_extract_symbol(title), extract_symbol(title)
+        if old != new:
+            print(f"  {old or '-':>10} -> {new or '-':<10} {title.strip()[:70]}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,242 @@
+"""
+Build a replay fixture set (official_api/replay.py) for every request the
+scrapers make, from the committed data/ snapshots: NEPSE auth, market-open
+and API responses, the Sharesansar OMF and proposed-dividend pages and
+DataTables JSON, and the MeroLagani company-list and upcoming-IPO pages.
+
+Recorded fixtures (NEPSE_HTTP_TRANSPORT=record) are the better input; this
+is for when the sites are out of reach. `--scale N` repeats the price,
+fund and dividend rows N times (with distinct symbols and ids) to benchmark
+larger payloads.
+
+    python benchmarks/synthetic_fixtures.py OUT_DIR [--scale 1]
+"""
+import argparse
+import json
+import os
+import random
+import string
+import sys
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import open_ended_mutual_fund_scraper as omf_scraper  # noqa: E402
+import proposed_dividend_scraper  # noqa: E402
+from html_parsing_bench import page  # noqa: E402
+from official_api.core import ROOT_URL  # noqa: E402
+from official_api.endpoints import api_dict  # noqa: E402
+from official_api.replay import FixtureStore, prepared_url  # noqa: E402
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+DATA_DIR = os.path.join(REPO_DIR, 'data')
+
+SHARESANSAR_HTML = {'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8'}
+SHARESANSAR_XHR = {'Accept': 'application/json, text/javascript, */*; q=0.01', 'X-Requested-With': 'XMLHttpRequest'}
+
+
+def load(name, default=None):
+    try:
+        with open(os.path.join(DATA_DIR, name), 'r', encoding='utf-8-sig') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return default
+
+
+def scaled(rows, scale, suffix_fields=(), id_fields=()):
+    """`rows` repeated `scale` times, with copies made distinct in `suffix_fields` / `id_fields`."""
+    out = list(rows)
+    for copy in range(1, scale):
+        for row in rows:
+            row = dict(row)
+            for field in suffix_fields:
+                if row.get(field):
+                    row[field] = f'{row[field]}{copy}'
+            for field in id_fields:
+                if isinstance(row.get(field), int):
+                    row[field] += copy * 1_000_000
+            out.append(row)
+    return out
+
+
+def nepse_url(name, params=None, method=None):
+    endpoint = api_dict[name]
+    return prepared_url(method or endpoint['method'], ROOT_URL + endpoint['api'], params)
+
+
+def add_nepse(store, rng, scale):
+    alphabet = string.ascii_letters + string.digits
+    now_ms = int(datetime.now(timezone.utc).timestamp() * 1000)
+    store.add_json('GET', nepse_url('authenticate_api'), {
+        'serverTime': now_ms,
+        'salt1': rng.randint(1000, 99999), 'salt2': rng.randint(1000, 99999), 'salt3': rng.randint(1000, 99999),
+        'salt4': rng.randint(1000, 99999), 'salt5': rng.randint(1000, 99999),
+        'accessToken': ''.join(rng.choice(alphabet) for _ in range(400)),
+        'refreshToken': ''.join(rng.choice(alphabet) for _ in range(400)),
+        'isDisplayActive': False, 'popupDocFor': 'BOTH',
+    })
+    store.add_json('GET', nepse_url('marketopen_api'), {
+        'isOpen': 'CLOSE', 'asOf': datetime.now().strftime('%Y-%m-%dT15:00:00'), 'id': rng.randint(1, 99),
+    })
+
+    # nepse_data.json mapped back to today-price rows (minus the OMF funds it adds).
+    funds = {item.get('symbol') for item in load('OMF.json', [])}
+    prices = [
+        {
+            'symbol': row['symbol'], 'securityName': row.get('name'),
+            'lastUpdatedPrice': row.get('ltp'), 'previousDayClosePrice': row.get('previous_close'),
+            'highPrice': row.get('high'), 'lowPrice': row.get('low'),
+            'totalTradedQuantity': row.get('volume'), 'totalTradedValue': row.get('turnover'),
+            'totalTrades': row.get('trades'), 'lastUpdatedTime': row.get('last_updated'),
+            'marketCapitalization': row.get('market_cap'),
+        }
+        for row in load('nepse_data.json', []) if row.get('symbol') not in funds
+    ]
+    prices = scaled(prices, scale, suffix_fields=('symbol',))
+    size = 500
+    pages = [prices[i:i + size] for i in range(0, len(prices), size)] or [[]]
+    for number, content in enumerate(pages):
+        store.add_json('POST', nepse_url('today_price_api', {'page': number, 'size': size}), {
+            'content': content, 'totalElements': len(prices), 'totalPages': len(pages),
+            'number': number, 'size': size, 'last': number == len(pages) - 1,
+        })
+
+    store.add_json('GET', nepse_url('nepse_index_api'), load('indices.json', []))
+    store.add_json('GET', nepse_url('sector_index_api'), load('sector_indices.json', []))
+    for category, rows in load('top_stocks.json', {}).items():
+        store.add_json('GET', nepse_url(category, {'all': 'true'}), rows)
+    store.add_json('GET', nepse_url('market_summary_api'), load('market_summary.json', []))
+    store.add_json('GET', nepse_url('market_summary_history_api'), load('market_summary_history.json', []))
+    store.add_json('GET', nepse_url('supply_demand_api', {'all': 'true'}), load('supply_demand.json', {}))
+    store.add_json('GET', nepse_url('disclosure'), {
+        'companyNews': load('disclosures.json', []),
+        'exchangeMessages': load('exchange_messages.json', []),
+    })
+    store.add_json('GET', nepse_url('notice_api'), (load('notices.json', {}) or {}).get('general', []))
+    store.add_json('POST', nepse_url('broker_api', {'page': 0, 'size': 500}), {
+        'content': load('brokers.json', []), 'last': True,
+    })
+    store.add_json('POST', nepse_url('stock_live_api'), load('live_trades.json', []))
+
+
+def add_open_ended_funds(store, rng, scale):
+    funds = scaled(load('OMF.json', []), scale, suffix_fields=('symbol', 'fund_name'), id_fields=('company_id',))
+    rows = [
+        {
+            'companyid': item.get('company_id'), 'symbol': item.get('symbol'), 'companyname': item.get('fund_name'),
+            'fund_size': item.get('fund_size'), 'maturity_date': None, 'maturity_period': None,
+            'daily_nav_price': item.get('daily_nav'), 'daily_date': item.get('daily_nav_date'),
+            'weekly_nav_price': item.get('weekly_nav'), 'weekly_date': item.get('weekly_nav_date'),
+            'monthly_nav_price': item.get('monthly_nav'), 'monthly_date': item.get('monthly_nav_date'),
+            'close': item.get('ltp'), 'published_date': item.get('price_as_of'),
+            'prem_dis': item.get('premium_discount_percent'), 'refund_nav': item.get('refund_nav'),
+        }
+        for item in funds
+    ]
+    store.add_html('GET', omf_scraper.BASE_URL, page('<table id="myTable" class="table"></table>', rng),
+                   vary=SHARESANSAR_HTML)
+    size = 20
+    for start in range(0, max(len(rows), 1), size):
+        url = prepared_url('GET', omf_scraper.BASE_URL, omf_scraper.build_datatable_params(start=start, length=size))
+        store.add_json('GET', url, {
+            'draw': 1, 'recordsTotal': len(rows), 'recordsFiltered': len(rows), 'data': rows[start:start + size],
+        }, vary=SHARESANSAR_XHR)
+
+
+def raw_dividend_row(item):
+    """A normalized proposed-dividend record as Sharesansar's DataTables JSON returns it."""
+    symbol = item.get('symbol') or ''
+    url = item.get('company_url') or f'https://www.sharesansar.com/company/{symbol.lower()}'
+    return {
+        'id': item.get('id'),
+        'symbol': f'<a href="{url}" target="_blank">{symbol}</a>',
+        'companyname': f'<a href="{url}" target="_blank">{item.get("company_name") or ""}</a>',
+        'bonus_share': item.get('bonus_share'), 'cash_dividend': item.get('cash_dividend'),
+        'total_dividend': item.get('total_dividend'), 'announcement_date': item.get('announcement_date'),
+        'bookclose_date': item.get('bookclose_date'), 'distribution_date': item.get('distribution_date'),
+        'bonus_listing_date': item.get('bonus_listing_date'), 'year': item.get('fiscal_year'),
+        'close': item.get('ltp'), 'published_date': item.get('price_as_of'), 'status': item.get('status'),
+    }
+
+
+def add_paged_dividends(store, params, rows, size=50):
+    base = proposed_dividend_scraper.BASE_URL
+    for draw, start in enumerate(range(0, max(len(rows), 1), size), start=1):
+        url = prepared_url('GET', base, {**params, 'draw': draw, 'start': start, 'length': size})
+        store.add_json('GET', url, {
+            'draw': draw, 'recordsTotal': len(rows), 'recordsFiltered': len(rows), 'data': rows[start:start + size],
+        }, vary=SHARESANSAR_XHR)
+
+
+def add_proposed_dividends(store, rng, scale):
+    history = load(os.path.join('proposed_dividend', proposed_dividend_scraper.HISTORY_FILE), [])
+    latest = load(os.path.join('proposed_dividend', proposed_dividend_scraper.LATEST_FILE), [])
+    history = scaled(history, scale, suffix_fields=('symbol',), id_fields=('id',))
+    latest = scaled(latest, scale, suffix_fields=('symbol',), id_fields=('id',))
+
+    by_year = {}
+    for item in history:
+        by_year.setdefault(item.get('fiscal_year') or '', []).append(item)
+    years = sorted(by_year, reverse=True)
+    options = ''.join(f'<option value="{i}">{year or "Unknown"}</option>' for i, year in enumerate(years, start=1))
+    select = f'<form><select id="year" class="form-control"><option value="">All</option>{options}</select></form>'
+    store.add_html('GET', proposed_dividend_scraper.BASE_URL, page(select, rng), vary=SHARESANSAR_HTML)
+
+    add_paged_dividends(store, {'type': 'LATEST', 'duration': '1_YEAR'}, [raw_dividend_row(i) for i in latest])
+    for i, year in enumerate(years, start=1):
+        add_paged_dividends(store, {'type': 'YEARWISE', 'year': str(i), 'sector': '0'},
+                            [raw_dividend_row(item) for item in by_year[year]])
+
+
+def add_merolagani(store, rng):
+    items = ''.join(
+        f'<div class="media"><div class="media-body"><small class="text-muted">{item.get("announcement_date", "")}</small>'
+        f'<a href="{(item.get("url") or "").replace("https://merolagani.com", "")}">{item.get("full_text", "")}</a>'
+        f'</div></div>'
+        for item in load('upcoming_ipo.json', [])
+    )
+    store.add_html('GET', 'https://merolagani.com/Ipo.aspx?type=upcoming',
+                   page(f'<div class="announcement-list">{items}</div>', rng))
+
+    panels = []
+    for number, (sector, companies) in enumerate(load('nepse_sector_wise_codes.json', {}).items(), start=1):
+        rows = ''.join(
+            f'<tr><td><a href="/CompanyDetail.aspx?symbol={c["symbol"]}">{c["symbol"]}</a></td><td>{c["name"]}</td></tr>'
+            for c in companies
+        )
+        panels.append(
+            f'<div class="panel panel-default"><div class="panel-heading"><h4 class="panel-title">'
+            f'<a data-toggle="collapse" data-parent="#accordion" href="#collapse_{number}">{sector}</a></h4></div>'
+            f'<div id="collapse_{number}" class="panel-collapse collapse"><div class="panel-body">'
+            f'<table class="table"><tbody>{rows}</tbody></table></div></div></div>'
+        )
+    store.add_html('GET', 'https://merolagani.com/CompanyList.aspx',
+                   page(f'<div class="panel-group" id="accordion">{"".join(panels)}</div>', rng))
+
+
+def build(directory, scale=1, seed=25):
+    """Write the fixture set into `directory` (which should be empty)."""
+    rng = random.Random(seed)
+    store = FixtureStore(directory)
+    add_nepse(store, rng, scale)
+    add_open_ended_funds(store, rng, scale)
+    add_proposed_dividends(store, rng, scale)
+    add_merolagani(store, rng)
+    return store
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('out_dir', help='Fixture directory to create')
+    parser.add_argument('--scale', type=int, default=1, help='Repeat price, fund and dividend rows this many times')
+    parser.add_argument('--seed', type=int, default=25)
+    args = parser.parse_args()
+    if os.path.isdir(args.out_dir) and os.listdir(args.out_dir):
+        parser.error(f"{args.out_dir} is not empty")
+    build(args.out_dir, scale=args.scale, seed=args.seed)
+    count = sum(len(files) for _, _, files in os.walk(args.out_dir))
+    print(f"Wrote {count} fixtures to {args.out_dir}")
+
+
+if __name__ == '__main__':
+    main()
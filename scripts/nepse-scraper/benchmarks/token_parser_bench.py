@@ -0,0 +1,116 @@
+"""
+Check the pure-Python token index functions against nepse.wasm and time both paths.
+
+    python benchmarks/token_parser_bench.py [--samples 50000] [--seed 0]
+
+Exits with status 1 if any input gives a different result.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from official_api.auth import TokenParser, py_bdx, py_cdx, py_mdx, py_ndx, py_rdx  # noqa: E402
+
+PY_FUNCTIONS = {'cdx': py_cdx, 'rdx': py_rdx, 'bdx': py_bdx, 'ndx': py_ndx, 'mdx': py_mdx}
+
+
+EDGE_SALTS = [0, 1, -1, 9, 10, 99, 100, 999, 1000, -999, -1000,
+              2**31 - 1, 2**31, -2**31, 2**32 - 1, 2**32, 2**32 + 5]
+
+
+def random_salt(rng: random.Random) -> int:
+    kind = rng.random()
+    if kind < 0.05:
+        return rng.choice(EDGE_SALTS)
+    if kind < 0.4:
+        # NEPSE salts are small positive integers.
+        return rng.randint(0, 100000)
+    if kind < 0.7:
+        return rng.randint(-2**31, 2**31 - 1)
+    # Outside the i32 range: the WASM sees the value wrapped to 32 bits.
+    return rng.randint(-2**32 + 1, 2**32 - 1)
+
+
+def build_corpus(samples: int, seed: int):
+    """
+    Five-argument inputs. All of them vary, not just the second one the port
+    reads, so a dependency on any other argument shows up as a mismatch.
+    """
+    rng = random.Random(seed)
+    corpus = []
+    # Every edge value in every position, the other arguments random.
+    for position in range(5):
+        for value in EDGE_SALTS:
+            args = [random_salt(rng) for _ in range(5)]
+            args[position] = value
+            corpus.append(tuple(args))
+    # The same edge value in all positions.
+    corpus.extend((value,) * 5 for value in EDGE_SALTS)
+    for _ in range(samples):
+        corpus.append(tuple(random_salt(rng) for _ in range(5)))
+    return corpus
+
+
+def check_equivalence(corpus) -> int:
+    parser = TokenParser(backend='wasm')
+    parser._ensure_instance()
+    mismatches = 0
+    for name, py_func in PY_FUNCTIONS.items():
+        wasm_func = getattr(parser, name)
+        for args in corpus:
+            expected = wasm_func(parser.store, *args)
+            actual = py_func(*args)
+            if expected != actual:
+                mismatches += 1
+                if mismatches <= 10:
+                    print(f"MISMATCH {name}{args}: wasm={expected} python={actual}")
+    return mismatches
+
+
+def time_backend(backend: str, salt_tuples, repeat: int) -> float:
+    parser = TokenParser(backend=backend)
+    derive = parser._derive_indices_wasm if backend == 'wasm' else parser._derive_indices_python
+    derive(*salt_tuples[0])  # Load the module outside the timed loop.
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for salts in salt_tuples:
+            derive(*salts)
+    return time.perf_counter() - started
+
+
+def time_cold_start(backend: str, salts) -> float:
+    started = time.perf_counter()
+    TokenParser(backend=backend).derive_indices(salts)
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--samples', type=int, default=50000, help='Random inputs per function.')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=5, help='Timing passes over the salt tuples.')
+    args = parser.parse_args()
+
+    corpus = build_corpus(args.samples, args.seed)
+    mismatches = check_equivalence(corpus)
+    print(f"Equivalence: {len(corpus)} inputs x {len(PY_FUNCTIONS)} functions, {mismatches} mismatches.")
+
+    rng = random.Random(args.seed + 1)
+    salt_tuples = [tuple(rng.randint(0, 100000) for _ in range(5)) for _ in range(2000)]
+    calls = len(salt_tuples) * args.repeat
+
+    print(f"Cold start (first parse): wasm {time_cold_start('wasm', salt_tuples[0]) * 1000:.2f} ms, "
+          f"python {time_cold_start('python', salt_tuples[0]) * 1000:.3f} ms")
+    for backend in ('wasm', 'python'):
+        seconds = time_backend(backend, salt_tuples, args.repeat)
+        print(f"{backend:<7} {calls} derivations in {seconds:.3f}s ({seconds / calls * 1e6:.2f} us each)")
+
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,137 @@
+import json
+import os
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from json_writer import write_json_atomic
+
+try:
+    import numpy as np
+except ImportError:  # Optional: read_columnar(as_numpy=False) works without it.
+    np = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Optional: the .parquet sibling is skipped without it.
+    pa = pq = None
+
+FORMAT = 'columnar-v1'
+
+# Column dtypes, chosen from the values at write time:
+#   'int'   - integers only
+#   'float' - numbers, with None stored as NaN
+#   'bool'  - booleans only
+#   'str'   - anything else (None stays None)
+_NUMPY_DTYPES = {'int': 'int64', 'float': 'float64', 'bool': 'bool'}
+
+
+def _column_dtype(values: Sequence[Any]) -> str:
+    kinds = set()
+    for value in values:
+        if value is None:
+            kinds.add('none')
+        elif isinstance(value, bool):
+            kinds.add('bool')
+        elif isinstance(value, int):
+            kinds.add('int')
+        elif isinstance(value, float):
+            kinds.add('float')
+        else:
+            return 'str'
+    numeric = kinds - {'none'}
+    if numeric == {'bool'} and 'none' not in kinds:
+        return 'bool'
+    if numeric == {'int'} and 'none' not in kinds:
+        return 'int'
+    if numeric and numeric <= {'int', 'float'}:
+        return 'float'
+    return 'str'
+
+
+def to_columns(rows: Iterable[Dict[str, Any]], fields: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+    """
+    Turn a list of row dicts into one list per field.
+
+    `fields` defaults to every key seen, in first-seen order; rows missing a
+    field get None in that column.
+    """
+    rows = [row for row in rows if isinstance(row, dict)]
+    if fields is None:
+        seen: Dict[str, None] = {}
+        for row in rows:
+            for key in row:
+                seen.setdefault(key, None)
+        fields = list(seen)
+    columns = {field: [row.get(field) for row in rows] for field in fields}
+    return {
+        'format': FORMAT,
+        'length': len(rows),
+        'dtypes': {field: _column_dtype(values) for field, values in columns.items()},
+        'columns': columns,
+    }
+
+
+def _arrow_table(table: Dict[str, Any]) -> Any:
+    arrow_types = {'int': pa.int64(), 'float': pa.float64(), 'bool': pa.bool_(), 'str': pa.string()}
+    arrays = {}
+    for field, values in table['columns'].items():
+        dtype = table['dtypes'][field]
+        if dtype == 'str':
+            values = [None if value is None else str(value) for value in values]
+        arrays[field] = pa.array(values, type=arrow_types[dtype])
+    return pa.table(arrays)
+
+
+def write_columnar(path: str, rows: Iterable[Dict[str, Any]], parquet: bool = True) -> Dict[str, Any]:
+    """
+    Write `rows` as a columnar JSON snapshot to `path`. When pyarrow is
+    installed and `parquet` is true, the same table is also written to
+    `path` with a `.parquet` extension. Returns the columnar document.
+    """
+    table = to_columns(rows)
+    write_json_atomic(path, table)
+    if parquet and pa is not None:
+        parquet_path = os.path.splitext(path)[0] + '.parquet'
+        tmp_path = parquet_path + '.tmp'
+        pq.write_table(_arrow_table(table), tmp_path)
+        os.replace(tmp_path, parquet_path)
+    return table
+
+
+def _to_numpy(values: List[Any], dtype: str) -> Any:
+    numpy_dtype = _NUMPY_DTYPES.get(dtype)
+    if numpy_dtype is not None:
+        # For float64 columns None becomes NaN.
+        return np.array(values, dtype=numpy_dtype)
+    array = np.empty(len(values), dtype=object)
+    array[:] = values
+    return array
+
+
+def read_columnar(path: str, as_numpy: bool = True) -> Dict[str, Any]:
+    """
+    Load a snapshot written by `write_columnar` (the JSON file or its
+    `.parquet` sibling) as `{field: column}`, without building a dict per
+    row. Columns are NumPy arrays when `as_numpy` is true (numbers as
+    int64/float64, text as object arrays), else plain lists.
+    """
+    if as_numpy and np is None:
+        raise ImportError("read_columnar(as_numpy=True) requires numpy.")
+
+    if path.endswith('.parquet'):
+        if pq is None:
+            raise ImportError("Reading .parquet snapshots requires pyarrow.")
+        table = pq.read_table(path)
+        if as_numpy:
+            return {name: table.column(name).to_numpy(zero_copy_only=False) for name in table.column_names}
+        return table.to_pydict()
+
+    with open(path, 'r', encoding='utf-8') as f:
+        document = json.load(f)
+    if not isinstance(document, dict) or document.get('format') != FORMAT:
+        raise ValueError(f"{path} is not a {FORMAT} snapshot.")
+    columns = document['columns']
+    if not as_numpy:
+        return columns
+    dtypes = document.get('dtypes', {})
+    return {field: _to_numpy(values, dtypes.get(field, 'str')) for field, values in columns.items()}
@@ -0,0 +1,96 @@
+import urllib.parse
+from typing import Any, Callable, Optional
+
+from text_utils import extract_symbol
+
+FILE_URL_BASE = "https://www.nepalstock.com.np/api/nots/security/fetchFiles?fileLocation="
+
+Step = Callable[[dict], None]
+
+
+def build_file_url(file_path: Any) -> Optional[str]:
+    """Construct the full, valid download URL for a NEPSE attachment path."""
+    if not file_path:
+        return None
+    file_path = str(file_path)
+    if file_path.startswith(('http://', 'https://')):
+        return file_path
+    return FILE_URL_BASE + urllib.parse.quote(file_path, safe="/%")
+
+
+def extract_symbol_from_title(title: Any) -> str:
+    """Extract ticker symbol from a title like '[SYMBOL]' or '(SYMBOL)'."""
+    return extract_symbol(title)
+
+
+def document_file_urls(record: dict) -> None:
+    """Attach fileUrl to each entry of `applicationDocumentDetailsList`."""
+    documents = record.get('applicationDocumentDetailsList')
+    if not isinstance(documents, list):
+        return
+    for doc in documents:
+        if isinstance(doc, dict):
+            file_url = build_file_url(doc.get('filePath'))
+            if file_url:
+                doc['fileUrl'] = file_url
+
+
+def record_file_url(record: dict) -> None:
+    """Attach fileUrl to a record that has its own filePath."""
+    file_url = build_file_url(record.get('filePath'))
+    if file_url:
+        record['fileUrl'] = file_url
+
+
+def symbol_from(*title_keys: str) -> Step:
+    """Step that sets `symbol` from the first non-empty of `title_keys`."""
+    def step(record: dict) -> None:
+        for key in title_keys:
+            title = record.get(key)
+            if title:
+                break
+        else:
+            return
+        symbol = extract_symbol_from_title(title)
+        if symbol:
+            record['symbol'] = symbol
+    return step
+
+
+class EnrichmentPipeline:
+    """
+    Per-record enrichment steps applied in one pass over a record list.
+
+    Every step only derives fields from other fields of the same record, so
+    running a pipeline again over already enriched records changes nothing;
+    callers hand it just the new or updated records (see
+    `SegmentStore.upsert(prepare=...)`) instead of the whole history.
+    """
+
+    def __init__(self, *steps: Step) -> None:
+        self.steps = steps
+
+    def then(self, *steps: Step) -> 'EnrichmentPipeline':
+        """A new pipeline running these steps after the current ones."""
+        return EnrichmentPipeline(*self.steps, *steps)
+
+    def __call__(self, records: Any) -> Any:
+        if not isinstance(records, list):
+            return records
+        steps = self.steps
+        for record in records:
+            if isinstance(record, dict):
+                for step in steps:
+                    step(record)
+        return records
+
+
+COMPANY_DISCLOSURE_PIPELINE = EnrichmentPipeline(
+    document_file_urls,
+    symbol_from('newsHeadline', 'messageTitle'),
+)
+EXCHANGE_MESSAGE_PIPELINE = EnrichmentPipeline(
+    record_file_url,
+    symbol_from('messageTitle', 'newsHeadline'),
+)
+
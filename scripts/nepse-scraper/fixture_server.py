@@ -0,0 +1,169 @@
+import argparse
+import hashlib
+import os
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+# Add the current directory to path to find official_api
+sys.path.append(os.path.dirname(__file__))
+
+from official_api.replay import ERROR_STATUS, FixtureStore, fixture_store, original_url
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    """
+    Serves recorded fixtures for `/<scheme>/<host>/<path>?<query>` (see
+    official_api.replay.server_url_for). Keeps connections alive, answers
+    If-None-Match with 304 like the real sites, and applies the server's
+    latency and error injection.
+    """
+
+    protocol_version = 'HTTP/1.1'
+    server: 'FixtureServer'
+
+    def do_GET(self) -> None:
+        self._serve()
+
+    def do_POST(self) -> None:
+        self._serve()
+
+    def do_HEAD(self) -> None:
+        self._serve()
+
+    def _reply(self, status: int, headers: dict, body: bytes = b'') -> None:
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if body and self.command != 'HEAD':
+            self.wfile.write(body)
+
+    def _serve(self) -> None:
+        # Request bodies are not part of a fixture's key, but must be drained
+        # for the connection to be reused.
+        length = int(self.headers.get('Content-Length') or 0)
+        if length:
+            self.rfile.read(length)
+
+        delay = self.server.next_delay()
+        if delay:
+            time.sleep(delay)
+        if self.server.inject_error():
+            self._reply(ERROR_STATUS, {'Retry-After': '0'})
+            return
+
+        url = original_url(self.path)
+        recorded = self.server.store.match(self.command, url, self.headers) if url else None
+        if recorded is None:
+            self._reply(404, {'Content-Type': 'text/plain'}, f'No fixture for {self.command} {url or self.path}'.encode('utf-8'))
+            return
+
+        headers = dict(recorded['headers'])
+        content = recorded['content']
+        if recorded['status'] == 200 and self.command in ('GET', 'HEAD'):
+            etag = headers.setdefault('ETag', '"%s"' % hashlib.sha256(content).hexdigest()[:20])
+            if self.headers.get('If-None-Match') == etag:
+                self._reply(304, {'ETag': etag})
+                return
+        self._reply(recorded['status'], headers, content)
+
+    def log_message(self, format: str, *args) -> None:
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class FixtureServer(ThreadingHTTPServer):
+    """
+    Local stand-in for NEPSE, Sharesansar and MeroLagani serving a fixture
+    directory. Every response is delayed by `latency` plus up to `jitter`
+    seconds, and `error_rate` of them are replaced by ERROR_STATUS.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        store: FixtureStore,
+        host: str = DEFAULT_HOST,
+        port: int = DEFAULT_PORT,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        seed: Optional[int] = None,
+        verbose: bool = False,
+    ) -> None:
+        super().__init__((host, port), FixtureHandler)
+        self.store = store
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.verbose = verbose
+        self._random = random.Random(seed)
+        self._random_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def next_delay(self) -> float:
+        if not self.jitter:
+            return self.latency
+        with self._random_lock:
+            return self.latency + self._random.uniform(0, self.jitter)
+
+    def inject_error(self) -> bool:
+        if not self.error_rate:
+            return False
+        with self._random_lock:
+            return self._random.random() < self.error_rate
+
+    def start(self) -> str:
+        """Serve from a background thread; returns the base URL."""
+        self._thread = threading.Thread(target=self.serve_forever, name='fixture-server', daemon=True)
+        self._thread.start()
+        return self.base_url
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Serve recorded NEPSE / Sharesansar / MeroLagani fixtures over HTTP')
+    parser.add_argument('fixtures', help='Fixture directory (see official_api/replay.py)')
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help='Port (0 picks a free one)')
+    parser.add_argument('--latency', type=float, default=0.0, help='Seconds added to every response')
+    parser.add_argument('--jitter', type=float, default=0.0, help='Up to this many extra seconds per response')
+    parser.add_argument('--error-rate', type=float, default=0.0, help=f'Share of responses replaced by HTTP {ERROR_STATUS}')
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--verbose', action='store_true', help='Log every request')
+    args = parser.parse_args()
+
+    server = FixtureServer(fixture_store(args.fixtures), host=args.host, port=args.port, latency=args.latency,
+                           jitter=args.jitter, error_rate=args.error_rate, seed=args.seed, verbose=args.verbose)
+    print(f"Serving {args.fixtures} at {server.base_url}")
+    print(f"Point the scrapers at it with NEPSE_HTTP_TRANSPORT=server NEPSE_HTTP_SERVER={server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+import importlib.util
+import os
+import re
+from typing import Any, Dict, Optional, Pattern
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+def _default_parser() -> str:
+    configured = os.environ.get('NEPSE_HTML_PARSER')
+    if configured:
+        return configured
+    # lxml is optional: several times faster than html.parser when installed.
+    return 'lxml' if importlib.util.find_spec('lxml') is not None else 'html.parser'
+
+
+DEFAULT_PARSER = _default_parser()
+
+
+def css_class(name: str) -> Pattern:
+    """
+    Strainer value for `class_` that matches `name` among several classes.
+    While parsing, strainers see the raw attribute ("table dataTable"), so a
+    plain string only matches an element whose class is exactly `name`.
+    """
+    return re.compile(r'(?:^|\s)' + re.escape(name) + r'(?:\s|$)')
+
+
+class AnyOf(SoupStrainer):
+    """
+    Keeps the top-level elements matched by any of `strainers`, e.g. the
+    accordion toggles *and* the panels they point to. Works with the strainer
+    hooks of both bs4 >= 4.13 (`allow_tag_creation`) and older releases
+    (`search_tag`).
+    """
+
+    def __init__(self, *strainers: SoupStrainer) -> None:
+        super().__init__()
+        self.strainers = strainers
+
+    def allow_tag_creation(self, nsprefix: Any, name: str, attrs: Any) -> bool:
+        return any(strainer.allow_tag_creation(nsprefix, name, attrs) for strainer in self.strainers)
+
+    def allow_string_creation(self, string: str) -> bool:
+        return False
+
+    def search_tag(self, markup_name: Any = None, markup_attrs: Any = {}) -> Any:
+        for strainer in self.strainers:
+            found = strainer.search_tag(markup_name, markup_attrs)
+            if found:
+                return found
+        return None
+
+
+def any_of(*strainers: SoupStrainer) -> SoupStrainer:
+    return strainers[0] if len(strainers) == 1 else AnyOf(*strainers)
+
+
+def parse_html(markup: Any, only: Optional[SoupStrainer] = None, parser: Optional[str] = None) -> BeautifulSoup:
+    """
+    Parse `markup` with `parser` (default: lxml if installed, else
+    html.parser; NEPSE_HTML_PARSER overrides). With `only`, just the elements
+    it matches (and their contents) are built into the tree, so the rest of
+    the page is tokenized but never turned into Tag objects.
+    """
+    return BeautifulSoup(markup, parser or DEFAULT_PARSER, parse_only=only)
+
+
+def index_ids(soup: Any) -> Dict[str, Any]:
+    """id -> element for every element with an id, first one winning like `soup.find(id=...)`."""
+    index: Dict[str, Any] = {}
+    for element in soup.find_all(id=True):
+        index.setdefault(element['id'], element)
+    return index
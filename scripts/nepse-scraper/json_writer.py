@@ -0,0 +1,183 @@
+import contextlib
+import gzip
+import json
+import os
+import tempfile
+from typing import Any, Iterable, Iterator, List, Optional, Sequence
+
+try:
+    import brotli
+except ImportError:  # Optional: .br siblings are skipped without it.
+    brotli = None
+
+# Output layouts:
+#   'lines'   - valid JSON with one compact record per line, so git diffs of
+#               the committed data files stay small and readable (default)
+#   'compact' - minified, no whitespace at all
+#   'pretty'  - the old json.dump(indent=4) layout
+FORMATS = ('lines', 'compact', 'pretty')
+
+DEFAULT_FORMAT = os.environ.get('NEPSE_JSON_FORMAT', 'lines')
+# Comma-separated pre-compressed siblings to keep next to each output, e.g. "gz,br".
+DEFAULT_COMPRESS: Sequence[str] = tuple(
+    ext.strip() for ext in os.environ.get('NEPSE_JSON_COMPRESS', '').split(',') if ext.strip()
+)
+
+
+def configure(format: Optional[str] = None, compress: Optional[Iterable[str]] = None) -> None:
+    """Change the process-wide defaults used by `write_json_atomic`."""
+    global DEFAULT_FORMAT, DEFAULT_COMPRESS
+    if format is not None:
+        if format not in FORMATS:
+            raise ValueError(f"Unknown JSON format '{format}'. Use one of {FORMATS}.")
+        DEFAULT_FORMAT = format
+    if compress is not None:
+        DEFAULT_COMPRESS = tuple(compress)
+
+
+def _iter_lines(data: Any, dumps, depth: int = 0) -> Iterator[str]:
+    if isinstance(data, list) and depth < 2:
+        if not data:
+            yield '[]'
+            return
+        yield '[\n'
+        for index, item in enumerate(data):
+            if index:
+                yield ',\n'
+            yield dumps(item)
+        yield '\n]'
+    elif isinstance(data, dict) and depth == 0:
+        if not data:
+            yield '{}'
+            return
+        yield '{\n'
+        for index, (key, value) in enumerate(data.items()):
+            if index:
+                yield ',\n'
+            yield dumps(str(key)) + ':'
+            yield from _iter_lines(value, dumps, depth + 1)
+        yield '\n}'
+    else:
+        yield dumps(data)
+
+
+def iter_json_chunks(data: Any, format: str = 'lines', ensure_ascii: bool = False) -> Iterator[str]:
+    """Encode `data` record by record, so large lists never exist as one string."""
+    if format == 'pretty':
+        yield json.dumps(data, indent=4, ensure_ascii=ensure_ascii)
+        return
+
+    def dumps(value: Any) -> str:
+        # json.dumps uses the C encoder; json.dump on a file does not.
+        return json.dumps(value, ensure_ascii=ensure_ascii, separators=(',', ':'))
+
+    if format == 'compact':
+        if isinstance(data, list):
+            yield '['
+            for index, item in enumerate(data):
+                yield (',' if index else '') + dumps(item)
+            yield ']'
+        else:
+            yield dumps(data)
+    elif format == 'lines':
+        yield from _iter_lines(data, dumps)
+    else:
+        raise ValueError(f"Unknown JSON format '{format}'. Use one of {FORMATS}.")
+
+
+def _open_temp(path: str):
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix='.' + os.path.basename(path) + '.', suffix='.tmp', dir=directory)
+    return os.fdopen(fd, 'wb'), tmp_path
+
+
+def write_text_atomic(path: str, text: str) -> int:
+    """Atomically replace `path` with already-encoded JSON `text`. Returns its size in bytes."""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    encoded = text.encode('utf-8')
+    handle, tmp_path = _open_temp(path)
+    try:
+        with handle:
+            handle.write(encoded)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.remove(tmp_path)
+        raise
+    return len(encoded)
+
+
+def write_json_atomic(
+    path: str,
+    data: Any,
+    format: Optional[str] = None,
+    compress: Optional[Iterable[str]] = None,
+    ensure_ascii: bool = False,
+) -> int:
+    """
+    Write `data` as UTF-8 JSON to `path` without ever exposing a partial file.
+
+    Records are streamed into a temp file next to `path`, which is fsynced and
+    renamed over the target. `compress` lists pre-compressed siblings to
+    produce in the same pass ('gz' -> `path.gz`, 'br' -> `path.br`, the latter
+    only when the `brotli` package is installed). Returns the size in bytes of
+    the uncompressed output.
+    """
+    format = format or DEFAULT_FORMAT
+    compress = tuple(DEFAULT_COMPRESS if compress is None else compress)
+    if 'br' in compress and brotli is None:
+        compress = tuple(ext for ext in compress if ext != 'br')
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    opened: List[Any] = []
+    try:
+        main_file, main_tmp = _open_temp(path)
+        opened.append((main_file, main_tmp, path))
+        gz_file = br_file = br_compressor = None
+        if 'gz' in compress:
+            gz_raw, gz_tmp = _open_temp(path + '.gz')
+            opened.append((gz_raw, gz_tmp, path + '.gz'))
+            # mtime=0 keeps the .gz byte-identical when the content is.
+            gz_file = gzip.GzipFile(filename='', mode='wb', fileobj=gz_raw, compresslevel=9, mtime=0)
+        if 'br' in compress:
+            br_file, br_tmp = _open_temp(path + '.br')
+            opened.append((br_file, br_tmp, path + '.br'))
+            br_compressor = brotli.Compressor(quality=11)
+
+        size = 0
+        for chunk in iter_json_chunks(data, format=format, ensure_ascii=ensure_ascii):
+            encoded = chunk.encode('utf-8')
+            size += len(encoded)
+            main_file.write(encoded)
+            if gz_file is not None:
+                gz_file.write(encoded)
+            if br_compressor is not None:
+                br_file.write(br_compressor.process(encoded))
+        if format != 'compact':
+            main_file.write(b'\n')
+            size += 1
+            if gz_file is not None:
+                gz_file.write(b'\n')
+            if br_compressor is not None:
+                br_file.write(br_compressor.process(b'\n'))
+        if gz_file is not None:
+            gz_file.close()
+        if br_compressor is not None:
+            br_file.write(br_compressor.finish())
+
+        for handle, _, _ in opened:
+            handle.flush()
+            os.fsync(handle.fileno())
+            handle.close()
+        for _, tmp_path, final_path in opened:
+            os.replace(tmp_path, final_path)
+        return size
+    except BaseException:
+        for handle, tmp_path, _ in opened:
+            with contextlib.suppress(OSError):
+                handle.close()
+            with contextlib.suppress(OSError):
+                os.remove(tmp_path)
+        raise
@@ -0,0 +1,226 @@
+import argparse
+import glob
+import gzip
+import json
+import os
+import shutil
+import sys
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# Add the current directory to path to find official_api
+sys.path.append(os.path.dirname(__file__))
+
+from official_api.response_cache import NEPAL_TZ, is_market_hours, seconds_until_market_open
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DEFAULT_LOG_DIR = os.path.join(BASE_DIR, 'data', 'live_capture')
+DEFAULT_INTERVAL = 10.0
+DEFAULT_MAX_BYTES = 8 * 1024 * 1024
+# How often the NEPSE market-open flag is re-checked while polling.
+MARKET_CHECK_INTERVAL = 120.0
+
+Snapshot = Dict[str, Dict[str, Any]]
+
+
+def snapshot_of(rows: Any) -> Snapshot:
+    """Live trade rows keyed by symbol."""
+    if not isinstance(rows, list):
+        return {}
+    return {str(row['symbol']): row for row in rows if isinstance(row, dict) and row.get('symbol')}
+
+
+def diff_snapshots(previous: Snapshot, current: Snapshot) -> Tuple[Dict[str, Dict[str, Any]], List[str]]:
+    """
+    Changes from `previous` to `current`: the changed fields of every new or
+    changed row, by symbol, and the symbols that disappeared.
+    """
+    changes: Dict[str, Dict[str, Any]] = {}
+    for symbol, row in current.items():
+        before = previous.get(symbol)
+        if before is None:
+            changes[symbol] = row
+        elif before != row:
+            changes[symbol] = {key: value for key, value in row.items() if before.get(key, object()) != value}
+    removed = [symbol for symbol in previous if symbol not in current]
+    return changes, removed
+
+
+class LiveTradeLog:
+    """
+    Append-only JSON-lines log of live trade snapshots.
+
+    Every file starts with a full keyframe (`{"t", "full": rows}`); each
+    later line holds only what changed since the previous poll
+    (`{"t", "changes": {symbol: changed fields}, "removed": [symbols]}`), and
+    polls without changes write nothing. Files live in one directory per
+    trading day and are gzipped once they grow past `max_bytes`, after which
+    a new file starts with a fresh keyframe. `replay` rebuilds the full
+    snapshot at every logged moment.
+    """
+
+    def __init__(self, directory: str = DEFAULT_LOG_DIR, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.previous: Snapshot = {}
+        # Whether the current file has its keyframe yet; `previous` can be
+        # empty after one (a poll before the first trade) and must not cause another.
+        self._keyframed = False
+        self.lines = 0
+        self._file = None
+        self._path: Optional[str] = None
+        self._day: Optional[str] = None
+
+    def _next_path(self, day: str) -> str:
+        day_dir = os.path.join(self.directory, day)
+        os.makedirs(day_dir, exist_ok=True)
+        existing = glob.glob(os.path.join(day_dir, 'trades-*.jsonl*'))
+        numbers = [int(os.path.basename(path)[7:11]) for path in existing]
+        return os.path.join(day_dir, f'trades-{max(numbers, default=0) + 1:04d}.jsonl')
+
+    def _rotate(self, day: str) -> None:
+        self.close()
+        self._path = self._next_path(day)
+        self._file = open(self._path, 'a', encoding='utf-8')
+        self._day = day
+        # A new file has no context, so it starts from a keyframe.
+        self.previous = {}
+        self._keyframed = False
+
+    def _write(self, entry: Dict[str, Any]) -> None:
+        self._file.write(json.dumps(entry, ensure_ascii=False, separators=(',', ':')) + '\n')
+        self._file.flush()
+        self.lines += 1
+
+    def append(self, rows: Any, now: Optional[datetime] = None) -> bool:
+        """Log one poll. Returns False if nothing changed since the previous one."""
+        now = (now or datetime.now(NEPAL_TZ)).astimezone(NEPAL_TZ)
+        day = now.date().isoformat()
+        if self._file is None or day != self._day or self._file.tell() >= self.max_bytes:
+            self._rotate(day)
+
+        current = snapshot_of(rows)
+        timestamp = now.isoformat(timespec='seconds')
+        if not self._keyframed:
+            self._write({'t': timestamp, 'full': list(current.values())})
+            self._keyframed = True
+        else:
+            changes, removed = diff_snapshots(self.previous, current)
+            if not changes and not removed:
+                return False
+            entry: Dict[str, Any] = {'t': timestamp, 'changes': changes}
+            if removed:
+                entry['removed'] = removed
+            self._write(entry)
+        self.previous = current
+        return True
+
+    def close(self) -> None:
+        """Close the current file and gzip it."""
+        if self._file is None:
+            return
+        self._file.close()
+        self._file = None
+        with open(self._path, 'rb') as src, gzip.open(self._path + '.gz', 'wb') as dst:
+            shutil.copyfileobj(src, dst)
+        os.remove(self._path)
+
+
+def _open_log(path: str):
+    if path.endswith('.gz'):
+        return gzip.open(path, 'rt', encoding='utf-8')
+    return open(path, 'r', encoding='utf-8')
+
+
+def replay(paths: List[str]) -> Iterator[Tuple[str, Snapshot]]:
+    """Yield (timestamp, full snapshot by symbol) for every line of the given log files, in order."""
+    for path in paths:
+        snapshot: Snapshot = {}
+        with _open_log(path) as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                if 'full' in entry:
+                    snapshot = snapshot_of(entry['full'])
+                else:
+                    for symbol, fields in entry.get('changes', {}).items():
+                        snapshot[symbol] = {**snapshot.get(symbol, {}), **fields}
+                    for symbol in entry.get('removed', []):
+                        snapshot.pop(symbol, None)
+                yield entry['t'], {symbol: dict(row) for symbol, row in snapshot.items()}
+
+
+def day_log_files(day: str, directory: str = DEFAULT_LOG_DIR) -> List[str]:
+    """Log files of one trading day (YYYY-MM-DD), oldest first."""
+    return sorted(glob.glob(os.path.join(directory, day, 'trades-*.jsonl*')))
+
+
+def capture(scraper: Any, log: LiveTradeLog, interval: float = DEFAULT_INTERVAL) -> int:
+    """
+    Poll live trades every `interval` seconds and log the changes until the
+    market closes. The open flag is taken from NEPSE every
+    MARKET_CHECK_INTERVAL seconds (a failed check is retried after one
+    interval); outside trading hours (NPT) polling stops without asking.
+    Returns the number of polls.
+    """
+    polls = 0
+    checked_at = float('-inf')
+    try:
+        while True:
+            started = time.monotonic()
+            if not is_market_hours():
+                break
+            if started - checked_at >= MARKET_CHECK_INTERVAL:
+                try:
+                    market_open = scraper.is_market_open()
+                except Exception as e:
+                    # Only an explicit "closed" ends the session; retry the check next interval.
+                    print(f"Market status check failed: {e}")
+                    time.sleep(max(0.0, interval - (time.monotonic() - started)))
+                    continue
+                if not market_open:
+                    break
+                checked_at = started
+            try:
+                rows = scraper.get_live_trades(check_market=False)
+            except Exception as e:
+                print(f"Live trade poll failed: {e}")
+            else:
+                polls += 1
+                if log.append(rows):
+                    print(f"{datetime.now(NEPAL_TZ):%H:%M:%S} logged {len(rows)} rows (poll {polls}).")
+            time.sleep(max(0.0, interval - (time.monotonic() - started)))
+    finally:
+        log.close()
+    print(f"Market closed. Stopped after {polls} polls, {log.lines} log lines.")
+    return polls
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Capture intraday NEPSE live trades as a diffed, rotating log')
+    parser.add_argument('--interval', type=float, default=DEFAULT_INTERVAL, help='Seconds between polls')
+    parser.add_argument('--dir', default=DEFAULT_LOG_DIR, help='Log directory (default: data/live_capture)')
+    parser.add_argument('--max-mb', type=float, default=DEFAULT_MAX_BYTES / (1024 * 1024),
+                        help='Rotate (and gzip) a log file once it reaches this size')
+    parser.add_argument('--wait', action='store_true', help='Sleep until the next market open instead of exiting')
+    args = parser.parse_args()
+
+    if not is_market_hours():
+        if not args.wait:
+            print("Outside NEPSE trading hours. Use --wait to start at the next open.")
+            return
+        delay = seconds_until_market_open()
+        print(f"Waiting {delay / 60:.0f} minutes for the market to open...")
+        time.sleep(delay)
+
+    from official_api import NepseScraper, SessionCache
+
+    scraper = NepseScraper(verify_ssl=False, session_cache=SessionCache())
+    log = LiveTradeLog(args.dir, max_bytes=int(args.max_mb * 1024 * 1024))
+    capture(scraper, log, interval=args.interval)
+
+
+if __name__ == '__main__':
+    main()
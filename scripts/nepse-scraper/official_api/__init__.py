@@ -1,3 +1,15 @@
 from .client import NepseScraper
 from .core import NepseAPISession
-from .auth import TokenParser, PayloadParser
\ No newline at end of file
+from .auth import TokenParser, PayloadParser
+from .session_cache import SessionCache
+from .response_cache import DiskCache, MemoryCache, ResponseCache
+from .conditional import ConditionalHTTPAdapter, ValidatorStore, is_not_modified
+from .rate_limit import GroupLimit, RateLimiter, RetryBudget, get_rate_limiter
+from .replay import FixtureStore, ReplayAdapter, install_transport
+
+try:
+    # The asyncio client needs the optional `httpx` dependency.
+    from .async_client import AsyncNepseScraper
+    from .async_core import AsyncNepseAPISession
+except ImportError:
+    pass
@@ -0,0 +1,292 @@
+import asyncio
+import logging
+import ssl
+import warnings
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+import certifi
+import httpx
+from urllib3.exceptions import InsecureRequestWarning
+
+from .auth import PayloadParser, TokenParser
+from .core import AUTH_FAILURE_STATUSES, MAX_STATUS_RETRIES, ROOT_URL
+from .endpoints import api_dict
+from .exceptions import SSLCertVerificationError
+from .rate_limit import THROTTLE_STATUSES, RateLimiter, get_rate_limiter, retry_delay
+from .response_cache import ResponseCache
+from .session_cache import SessionCache
+
+logger = logging.getLogger(__name__)
+
+
+def _clean_params(params: Optional[Dict]) -> Optional[Dict]:
+    # requests silently drops None-valued params; httpx would send them as empty strings.
+    if params is None:
+        return None
+    return {key: value for key, value in params.items() if value is not None}
+
+
+def _response_from_cache(method: str, entry: Dict[str, Any]) -> httpx.Response:
+    return httpx.Response(
+        entry['status'], headers=entry['headers'], content=entry['content'],
+        request=httpx.Request(method, entry['url']),
+    )
+
+
+class AsyncNepseAPISession:
+    """
+    asyncio counterpart of NepseAPISession built on a pooled httpx.AsyncClient.
+
+    The access token and market-open ID are shared by every coroutine using the
+    session; the first caller to need them fetches them while the rest wait.
+    """
+    def __init__(self, verify_ssl: bool = True, max_connections: int = 100, timeout: float = 30.0,
+                 session_cache: Optional[SessionCache] = None, response_cache: Optional[ResponseCache] = None,
+                 rate_limiter: Optional[RateLimiter] = None):
+        self._token_parser = TokenParser()
+        self._payload_parser = PayloadParser()
+        self.access_token: Optional[str] = None
+        self.token_details: Optional[Dict[str, Any]] = None
+
+        self._market_open_id: Optional[int] = None
+        self.session_cache = session_cache
+        self.response_cache = response_cache
+        self.rate_limiter = rate_limiter if rate_limiter is not None else get_rate_limiter()
+        # Created on first use so they bind to the loop that runs the requests
+        # (Python 3.9 locks capture the current loop at construction time).
+        self._auth_lock: Optional[asyncio.Lock] = None
+        self._market_open_lock: Optional[asyncio.Lock] = None
+
+        if verify_ssl:
+            verify = certifi.where()
+        else:
+            verify = False
+            warnings.warn(
+                "SSL certificate verification has been disabled. This is not recommended and may be insecure.",
+                InsecureRequestWarning
+            )
+
+        limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections)
+        self.client = httpx.AsyncClient(
+            base_url=ROOT_URL,
+            timeout=timeout,
+            transport=httpx.AsyncHTTPTransport(verify=verify, limits=limits, retries=3),
+            headers={
+                'User-Agent': 'Mozilla/5.0 (X11; Ubuntu; Linux x86_64; rv:89.0) Gecko/20100101 Firefox/89.0',
+                'Accept': 'application/json, text/plain, */*', 'Accept-Language': 'en-US,en;q=0.5',
+                'Referer': f'{ROOT_URL}/',
+            },
+        )
+        logger.debug("AsyncNepseAPISession initialized.")
+
+    async def __aenter__(self) -> "AsyncNepseAPISession":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
+
+    async def _get_access_token(self) -> None:
+        if self.access_token: return
+        await self._authenticate()
+
+    async def _authenticate(self, stale_token: Optional[str] = None) -> None:
+        """Async counterpart of NepseAPISession._authenticate (single-flight re-authentication)."""
+        if self._auth_lock is None:
+            self._auth_lock = asyncio.Lock()
+        async with self._auth_lock:
+            if self.access_token and self.access_token != stale_token:
+                return
+
+            # SessionCache takes a file lock and does blocking I/O: keep it off the event loop.
+            if stale_token is not None:
+                if self.session_cache is not None:
+                    await asyncio.to_thread(self.session_cache.invalidate, stale_token)
+                self.access_token = None
+                self.token_details = None
+                self._market_open_id = None
+
+            if self.session_cache is not None:
+                cached = await asyncio.to_thread(self.session_cache.load_token)
+                if cached is not None and cached['access_token'] != stale_token:
+                    self.access_token = cached['access_token']
+                    self.token_details = cached['token_details']
+                    return
+            logger.info("No active token found. Fetching new access token from NEPSE.")
+            auth_endpoint = api_dict['authenticate_api']
+            try:
+                response = await self._paced_request(auth_endpoint['method'], auth_endpoint['api'])
+                response.raise_for_status()
+                token_response = response.json()
+                for i in range(1, 6): token_response[f'salt{i}'] = int(token_response[f'salt{i}'])
+                access_token, _ = self._token_parser.parse_token_response(token_response)
+                self.token_details = token_response
+                self.access_token = access_token
+                if self.session_cache is not None:
+                    await asyncio.to_thread(self.session_cache.save_token, self.access_token, self.token_details)
+                logger.info("Successfully authenticated and stored new token.")
+            except httpx.ConnectError as e:
+                if isinstance(e.__context__, ssl.SSLError) or 'CERTIFICATE_VERIFY_FAILED' in str(e):
+                    logger.error(f"SSL Certificate Verification failed: {e}", exc_info=True)
+                    raise SSLCertVerificationError(
+                        "SSL certificate verification failed. This is likely due to the NEPSE server's "
+                        "incomplete certificate chain or a network proxy. "
+                        "Try initializing the client with: AsyncNepseScraper(verify_ssl=False)"
+                    ) from e
+                logger.error(f"Failed to authenticate with NEPSE API: {e}", exc_info=True)
+                raise
+            except httpx.HTTPError as e:
+                logger.error(f"Failed to authenticate with NEPSE API: {e}", exc_info=True)
+                raise
+
+    async def _fetch_market_open_id(self) -> int:
+        if self._market_open_id is not None:
+            return self._market_open_id
+
+        if self._market_open_lock is None:
+            self._market_open_lock = asyncio.Lock()
+        async with self._market_open_lock:
+            if self._market_open_id is not None:
+                return self._market_open_id
+            if self.session_cache is not None:
+                self._market_open_id = await asyncio.to_thread(self.session_cache.load_market_open_id)
+                if self._market_open_id is not None:
+                    return self._market_open_id
+            logger.debug("Fetching market open ID for payload calculation.")
+            endpoint = api_dict['marketopen_api']
+            try:
+                response = await self._send('GET', endpoint['api'])
+                self._market_open_id = response.json()["id"]
+                if self.session_cache is not None:
+                    await asyncio.to_thread(self.session_cache.save_market_open_id, self._market_open_id)
+                return self._market_open_id
+            except (httpx.HTTPError, KeyError) as e:
+                logger.error(f"Failed to fetch or parse market open ID: {e}", exc_info=True)
+                raise IOError("Could not retrieve the necessary payload ID from NEPSE.") from e
+
+    async def _get_payload_id(self, which_payload: str) -> int:
+        await self._get_access_token()
+        given_id = await self._fetch_market_open_id()
+
+        return self._payload_parser.calculate_payload_id(
+            given_id=given_id,
+            token_details=self.token_details,
+            which=which_payload
+        )
+
+    async def _paced_request(self, method: str, path: str, **kwargs: Any) -> httpx.Response:
+        """Async counterpart of NepseAPISession._paced_request."""
+        attempt = 0
+        while True:
+            group = await self.rate_limiter.acquire_async(path)
+            resp = await self.client.request(method, path, **kwargs)
+            self.rate_limiter.record(group, resp.status_code)
+            if (resp.status_code not in THROTTLE_STATUSES or attempt >= MAX_STATUS_RETRIES
+                    or not self.rate_limiter.allow_retry()):
+                return resp
+            delay = retry_delay(resp.headers, attempt)
+            logger.warning(f"HTTP {resp.status_code} from {path}; retrying in {delay:.1f}s.")
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def _send(
+        self,
+        method: str,
+        path: str,
+        params: Optional[Dict] = None,
+        payload: Optional[Dict] = None,
+        which_payload: Optional[str] = None,
+    ) -> httpx.Response:
+        """Send an authenticated request, re-authenticating and retrying once on 401/403."""
+        cache_key = None
+        if self.response_cache is not None:
+            cache_key = self.response_cache.key_for(method, path, params, payload, which_payload)
+            if cache_key is not None:
+                entry = self.response_cache.get(cache_key)
+                if entry is not None:
+                    return _response_from_cache(method, entry)
+
+        for attempt in range(2):
+            await self._get_access_token()
+            token = self.access_token
+            headers = {'Authorization': f'Salter {token}'}
+
+            final_payload = payload
+            if method == 'POST' and payload is None:
+                final_payload = {'id': await self._get_payload_id(which_payload=which_payload)}
+
+            logger.debug(f"Making async {method} request to: {path} with payload: {final_payload} and params: {params}")
+            resp = await self._paced_request(
+                method, path, params=_clean_params(params), json=final_payload, headers=headers
+            )
+            if resp.status_code in AUTH_FAILURE_STATUSES and attempt == 0:
+                logger.warning(f"NEPSE rejected the access token with HTTP {resp.status_code}; re-authenticating.")
+                await self._authenticate(stale_token=token)
+                continue
+            resp.raise_for_status()
+            if cache_key is not None and resp.status_code == 200:
+                self.response_cache.put(cache_key, resp.status_code, resp.headers, resp.content, str(resp.url))
+            return resp
+
+    async def get(self, path: str, params: Optional[Dict] = None) -> httpx.Response:
+        return await self._send('GET', path, params=params)
+
+    async def post(self, path: str, payload: Optional[Dict] = None, params: Optional[Dict] = None, which_payload: Optional[str] = None) -> httpx.Response:
+        return await self._send('POST', path, params=params, payload=payload, which_payload=which_payload)
+
+    async def _request_page(self, method: str, path: str, params: Dict, payload: Optional[Dict], which_payload: Optional[str], page: int, size: int) -> Any:
+        page_params = {**params, 'page': page, 'size': size}
+        return (await self._send(method, path, params=page_params, payload=payload, which_payload=which_payload)).json()
+
+    async def iter_pages(
+        self,
+        method: str,
+        path: str,
+        params: Optional[Dict] = None,
+        payload: Optional[Dict] = None,
+        which_payload: Optional[str] = None,
+        size: int = 500,
+        prefetch: bool = False,
+    ) -> AsyncIterator[Any]:
+        """Async counterpart of NepseAPISession.iter_pages."""
+        method = method.upper()
+        params = dict(params or {})
+        pending: Optional[asyncio.Task] = None
+        page = 0
+        try:
+            body = await self._request_page(method, path, params, payload, which_payload, page, size)
+            while True:
+                if not isinstance(body, dict) or 'content' not in body:
+                    if body:
+                        yield body
+                    return
+
+                content = body.get('content') or []
+                if 'last' in body:
+                    has_next = not body['last']
+                elif body.get('totalPages') is not None:
+                    has_next = page + 1 < int(body['totalPages'])
+                else:
+                    has_next = len(content) >= size
+                has_next = has_next and bool(content)
+
+                if has_next and prefetch:
+                    pending = asyncio.ensure_future(
+                        self._request_page(method, path, params, payload, which_payload, page + 1, size)
+                    )
+
+                if content:
+                    yield content
+                if not has_next:
+                    return
+
+                page += 1
+                if pending is not None:
+                    body, pending = await pending, None
+                else:
+                    body = await self._request_page(method, path, params, payload, which_payload, page, size)
+        finally:
+            if pending is not None:
+                pending.cancel()
@@ -1,33 +1,244 @@
-import json
+import hashlib
+import importlib.util
 import os
 import logging
+import tempfile
+import threading
 from datetime import datetime
-from wasmtime import Store, Module, Instance
-from typing import Any, Callable, Dict, List, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .session_cache import get_cache_dir
 
 logger = logging.getLogger(__name__)
 
 # Use relative path to the wasm file in the same directory
 WASM_FILE = os.path.join(os.path.dirname(__file__), 'nepse.wasm')
 
+_wasm_lock = threading.Lock()
+_wasm_module: Optional[Tuple[Any, Any]] = None
+
+
+def _compiled_artifact_path() -> str:
+    """Cache path for the precompiled module, keyed by wasm contents and wasmtime version."""
+    try:
+        from importlib.metadata import version
+        wasmtime_version = version('wasmtime')
+    except Exception:
+        wasmtime_version = 'unknown'
+    with open(WASM_FILE, 'rb') as f:
+        digest = hashlib.sha256(f.read()).hexdigest()[:16]
+    return os.path.join(get_cache_dir(), f'nepse-{digest}-wasmtime-{wasmtime_version}.cwasm')
+
+
+def load_wasm_module() -> Tuple[Any, Any]:
+    """
+    Return the process-wide `(Engine, Module)` for nepse.wasm.
+
+    The module is compiled once per process. The compiled artifact is also
+    serialized to the cache directory so later processes only deserialize it,
+    which is much cheaper than compiling.
+    """
+    global _wasm_module
+    if _wasm_module is not None:
+        return _wasm_module
+
+    with _wasm_lock:
+        if _wasm_module is not None:
+            return _wasm_module
+
+        from wasmtime import Engine, Module
+
+        engine = Engine()
+        module = None
+        try:
+            artifact = _compiled_artifact_path()
+        except OSError:
+            artifact = None
+
+        if artifact and os.path.exists(artifact):
+            try:
+                module = Module.deserialize_file(engine, artifact)
+                logger.debug(f"Loaded precompiled WASM module from {artifact}.")
+            except Exception as e:
+                logger.debug(f"Discarding unusable precompiled WASM module {artifact}: {e}")
+
+        if module is None:
+            module = Module.from_file(engine, WASM_FILE)
+            logger.debug("Compiled WASM module.")
+            if artifact:
+                try:
+                    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(artifact), suffix='.tmp')
+                    with os.fdopen(fd, 'wb') as f:
+                        f.write(module.serialize())
+                    os.replace(tmp_path, artifact)
+                except OSError as e:
+                    logger.debug(f"Could not store precompiled WASM module: {e}")
+
+        _wasm_module = (engine, module)
+        return _wasm_module
+
+
+# The five index functions exported by nepse.wasm only look at their second
+# argument: they split it into its hundreds, tens and units digits (i32, with
+# truncating division) and add an offset plus an entry of this table, which
+# is the module's data segment at address 1024. Indices outside the table
+# read zeroed memory.
+_WASM_INDEX_TABLE: Tuple[int, ...] = (
+    5, 8, 4, 7, 9, 4, 6, 9, 5, 5, 6, 5, 3, 5, 4, 4, 9, 6, 6, 8,
+    8, 6, 8, 6, 5, 8, 4, 9, 5, 9, 8, 5, 3, 4, 7, 7, 4, 7, 3, 9,
+)
+
+
+def _to_i32(value: int) -> int:
+    return (value + 2**31) % 2**32 - 2**31
+
+
+def _tdiv(value: int, divisor: int) -> int:
+    quotient = abs(value) // divisor
+    return -quotient if value < 0 else quotient
+
+
+def _salt_terms(salt: int) -> Tuple[int, int, int]:
+    """Return (hundreds digit, tens digit, table entry) exactly as the WASM computes them."""
+    x = _to_i32(salt)
+    tens_quotient = _tdiv(x, 10)
+    hundreds = _tdiv(x, 100) - _tdiv(_tdiv(x, 100), 10) * 10
+    tens = tens_quotient - _tdiv(tens_quotient, 10) * 10
+    units = x - tens_quotient * 10
+    index = hundreds + tens + units
+    entry = _WASM_INDEX_TABLE[index] if 0 <= index < len(_WASM_INDEX_TABLE) else 0
+    return hundreds, tens, entry
+
+
+def py_cdx(_a: int, salt: int, *_rest: int) -> int:
+    _, _, entry = _salt_terms(salt)
+    return entry + 22
+
+
+def py_rdx(_a: int, salt: int, *_rest: int) -> int:
+    hundreds, tens, entry = _salt_terms(salt)
+    return hundreds + tens + entry + 32
+
+
+def py_bdx(_a: int, salt: int, *_rest: int) -> int:
+    hundreds, tens, entry = _salt_terms(salt)
+    return hundreds + tens + entry + 60
+
+
+def py_ndx(_a: int, salt: int, *_rest: int) -> int:
+    _, tens, entry = _salt_terms(salt)
+    return tens + entry + 88
+
+
+def py_mdx(_a: int, salt: int, *_rest: int) -> int:
+    hundreds, _, entry = _salt_terms(salt)
+    return hundreds + entry + 110
+
+
+def _wasm_available() -> bool:
+    # Only looks the package up: wasmtime itself is imported by _ensure_instance.
+    return importlib.util.find_spec('wasmtime') is not None
+
 
 class TokenParser:
     """
     TokenParser is responsible for parsing access and refresh tokens 
     using WebAssembly functions.
+
+    The WASM module is only loaded on the first parse, so sessions that reuse
+    a cached token never pay for it.
+
+    `backend` selects how the token indices are derived: 'wasm' runs
+    nepse.wasm, 'python' uses the pure-Python port of its five functions
+    (checked against the WASM by benchmarks/token_parser_bench.py), and
+    'auto' uses the WASM when wasmtime is installed and Python otherwise.
+    The NEPSE_TOKEN_BACKEND environment variable overrides 'auto'.
+    Derived indices are memoized per salt tuple.
     """
 
-    def __init__(self) -> None:
-        self.store: Store = Store()
-        module: Module = Module.from_file(self.store.engine, WASM_FILE)
-        instance: Instance = Instance(self.store, module, [])
+    _MAX_CACHED_SALTS = 256
+
+    def __init__(self, backend: str = 'auto') -> None:
+        if backend == 'auto':
+            backend = os.environ.get('NEPSE_TOKEN_BACKEND') or ('wasm' if _wasm_available() else 'python')
+        if backend not in ('wasm', 'python'):
+            raise ValueError(f"Unknown token parser backend: {backend!r}. Use 'wasm', 'python' or 'auto'.")
+        self.backend = backend
+        self.store = None
+        self._lock = threading.Lock()
+        self._index_cache: Dict[Tuple[int, ...], Tuple[int, ...]] = {}
+        self.cdx: Optional[Callable[..., int]] = None
+        self.rdx: Optional[Callable[..., int]] = None
+        self.bdx: Optional[Callable[..., int]] = None
+        self.ndx: Optional[Callable[..., int]] = None
+        self.mdx: Optional[Callable[..., int]] = None
+        logger.debug(f"TokenParser initialized with the {backend} backend.")
 
-        self.cdx: Callable[..., int] = instance.exports(self.store)["cdx"]
-        self.rdx: Callable[..., int] = instance.exports(self.store)["rdx"]
-        self.bdx: Callable[..., int] = instance.exports(self.store)["bdx"]
-        self.ndx: Callable[..., int] = instance.exports(self.store)["ndx"]
-        self.mdx: Callable[..., int] = instance.exports(self.store)["mdx"]
-        logger.debug("TokenParser initialized with WASM module.")
+    def _ensure_instance(self) -> None:
+        if self.store is not None:
+            return
+        from wasmtime import Instance, Store
+
+        engine, module = load_wasm_module()
+        store = Store(engine)
+        instance = Instance(store, module, [])
+        exports = instance.exports(store)
+        self.cdx = exports["cdx"]
+        self.rdx = exports["rdx"]
+        self.bdx = exports["bdx"]
+        self.ndx = exports["ndx"]
+        self.mdx = exports["mdx"]
+        self.store = store
+        logger.debug("TokenParser instantiated WASM module.")
+
+    def _derive_indices_wasm(self, salt1: int, salt2: int, salt3: int, salt4: int, salt5: int) -> Tuple[int, ...]:
+        self._ensure_instance()
+        store = self.store
+        return (
+            self.cdx(store, salt1, salt2, salt3, salt4, salt5),
+            self.rdx(store, salt1, salt2, salt4, salt3, salt5),
+            self.bdx(store, salt1, salt2, salt4, salt3, salt5),
+            self.ndx(store, salt1, salt2, salt4, salt3, salt5),
+            self.mdx(store, salt1, salt2, salt4, salt3, salt5),
+            self.cdx(store, salt2, salt1, salt3, salt5, salt4),
+            self.rdx(store, salt2, salt1, salt3, salt4, salt5),
+            self.bdx(store, salt2, salt1, salt4, salt3, salt5),
+            self.ndx(store, salt2, salt1, salt4, salt3, salt5),
+            self.mdx(store, salt2, salt1, salt4, salt3, salt5),
+        )
+
+    @staticmethod
+    def _derive_indices_python(salt1: int, salt2: int, salt3: int, salt4: int, salt5: int) -> Tuple[int, ...]:
+        return (
+            py_cdx(salt1, salt2, salt3, salt4, salt5),
+            py_rdx(salt1, salt2, salt4, salt3, salt5),
+            py_bdx(salt1, salt2, salt4, salt3, salt5),
+            py_ndx(salt1, salt2, salt4, salt3, salt5),
+            py_mdx(salt1, salt2, salt4, salt3, salt5),
+            py_cdx(salt2, salt1, salt3, salt5, salt4),
+            py_rdx(salt2, salt1, salt3, salt4, salt5),
+            py_bdx(salt2, salt1, salt4, salt3, salt5),
+            py_ndx(salt2, salt1, salt4, salt3, salt5),
+            py_mdx(salt2, salt1, salt4, salt3, salt5),
+        )
+
+    def derive_indices(self, salts: Tuple[int, int, int, int, int]) -> Tuple[int, ...]:
+        """
+        Return the ten cut positions (five for the access token, five for the
+        refresh token) for a salt tuple, memoized per tuple.
+        """
+        # A wasmtime Store must not be used from two threads at once.
+        with self._lock:
+            indices = self._index_cache.get(salts)
+            if indices is None:
+                if self.backend == 'wasm':
+                    indices = self._derive_indices_wasm(*salts)
+                else:
+                    indices = self._derive_indices_python(*salts)
+                if len(self._index_cache) >= self._MAX_CACHED_SALTS:
+                    self._index_cache.clear()
+                self._index_cache[salts] = indices
+            return indices
 
     def parse_token_response(self, token_response: Dict[str, Any]) -> Tuple[str, str]:
         """
@@ -35,26 +246,8 @@ class TokenParser:
         WASM functions.
         """
         logger.debug("Starting token response parsing.")
-        n: int = self.cdx(self.store, token_response['salt1'], token_response['salt2'],
-                          token_response['salt3'], token_response['salt4'], token_response['salt5'])
-        l: int = self.rdx(self.store, token_response['salt1'], token_response['salt2'],
-                          token_response['salt4'], token_response['salt3'], token_response['salt5'])
-        o: int = self.bdx(self.store, token_response['salt1'], token_response['salt2'],
-                          token_response['salt4'], token_response['salt3'], token_response['salt5'])
-        p: int = self.ndx(self.store, token_response['salt1'], token_response['salt2'],
-                          token_response['salt4'], token_response['salt3'], token_response['salt5'])
-        q: int = self.mdx(self.store, token_response['salt1'], token_response['salt2'],
-                          token_response['salt4'], token_response['salt3'], token_response['salt5'])
-        i: int = self.cdx(self.store, token_response['salt2'], token_response['salt1'],
-                          token_response['salt3'], token_response['salt5'], token_response['salt4'])
-        r: int = self.rdx(self.store, token_response['salt2'], token_response['salt1'],
-                          token_response['salt3'], token_response['salt4'], token_response['salt5'])
-        s: int = self.bdx(self.store, token_response['salt2'], token_response['salt1'],
-                          token_response['salt4'], token_response['salt3'], token_response['salt5'])
-        t: int = self.ndx(self.store, token_response['salt2'], token_response['salt1'],
-                          token_response['salt4'], token_response['salt3'], token_response['salt5'])
-        u: int = self.mdx(self.store, token_response['salt2'], token_response['salt1'],
-                          token_response['salt4'], token_response['salt3'], token_response['salt5'])
+        salts = tuple(token_response[f'salt{i}'] for i in range(1, 6))
+        n, l, o, p, q, i, r, s, t, u = self.derive_indices(salts)
 
         access_token: str = token_response['accessToken']
         refresh_token: str = token_response['refreshToken']
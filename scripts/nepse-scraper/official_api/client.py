@@ -1,7 +1,12 @@
 import logging
-from typing import Any, Dict, List, Optional, Union
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
 
+from .conditional import ValidatorStore
 from .core import NepseAPISession
+from .rate_limit import RateLimiter
+from .response_cache import ResponseCache
+from .session_cache import SessionCache
 from .endpoints import api_dict
 
 logger = logging.getLogger(__name__)
@@ -11,9 +16,27 @@ class NepseScraper:
     """
     The main client for interacting with the Nepal Stock Exchange (NEPSE) API.
     """
-    def __init__(self, verify_ssl: bool = True) -> None:
-        """Initializes the client and the underlying API session."""
-        self.session = NepseAPISession(verify_ssl=verify_ssl)
+    def __init__(self, verify_ssl: bool = True, session_cache: Optional[SessionCache] = None,
+                 response_cache: Optional[ResponseCache] = None, validator_store: Optional[ValidatorStore] = None,
+                 rate_limiter: Optional[RateLimiter] = None) -> None:
+        """
+        Initializes the client and the underlying API session.
+
+        Args:
+            verify_ssl (bool): Verify NEPSE's TLS certificate. Defaults to True.
+            session_cache (SessionCache, optional): Persist the token and market-open ID on disk
+                                                    so later processes can skip re-authenticating.
+            response_cache (ResponseCache, optional): Serve slow-changing endpoints (securities, sectors,
+                                                      brokers, ...) from a cache for their `ttl` in `api_dict`.
+            validator_store (ValidatorStore, optional): Send conditional GETs (ETag / Last-Modified) and
+                                                        reuse the stored body when NEPSE answers 304.
+            rate_limiter (RateLimiter, optional): Pacing and retry budget for requests. Defaults to the
+                                                  limiter shared by every session in the process.
+        """
+        self.session = NepseAPISession(
+            verify_ssl=verify_ssl, session_cache=session_cache, response_cache=response_cache,
+            validator_store=validator_store, rate_limiter=rate_limiter,
+        )
         self._security_map: Optional[Dict[str, int]] = None
         self._sector_map: Optional[Dict[str, int]] = None
 
@@ -49,11 +72,58 @@ class NepseScraper:
             raise ValueError(f"Ticker(s) not found: {missing}")
         return resolved_tickers
 
+    def _iter_ticker_batch(
+        self,
+        tickers: List[str],
+        fetch: Callable[[int], Any],
+        max_workers: int,
+    ) -> Iterator[Tuple[str, Optional[Any], Optional[Exception]]]:
+        """
+        Runs `fetch(security_id)` for every ticker on a bounded thread pool and
+        yields `(symbol, result, error)` as each request finishes. Unknown
+        tickers are reported as failures instead of aborting the batch.
+        """
+        security_map = self._get_security_map()
+        ticker_list = list(dict.fromkeys(t.upper() for t in tickers))
+
+        resolved = {}
+        for symbol in ticker_list:
+            security_id = security_map.get(symbol)
+            if security_id:
+                resolved[symbol] = security_id
+            else:
+                yield symbol, None, ValueError(f"Ticker not found: {symbol}")
+
+        if not resolved:
+            return
+
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(resolved)))) as executor:
+            futures = {executor.submit(fetch, security_id): symbol for symbol, security_id in resolved.items()}
+            for future in as_completed(futures):
+                symbol = futures[future]
+                try:
+                    yield symbol, future.result(), None
+                except Exception as e:
+                    logger.warning(f"Batch request failed for {symbol}: {e}")
+                    yield symbol, None, e
+
+    @staticmethod
+    def _collect_batch(
+        batch: Iterator[Tuple[str, Optional[Any], Optional[Exception]]]
+    ) -> Tuple[Dict[str, Any], Dict[str, Exception]]:
+        results, failures = {}, {}
+        for symbol, result, error in batch:
+            if error is None:
+                results[symbol] = result
+            else:
+                failures[symbol] = error
+        return results, failures
+
     # =========================================================================
     # Extensibility Methods
     # =========================================================================
 
-    def register_endpoint(self, name: str, path: str, method: str = 'GET'):
+    def register_endpoint(self, name: str, path: str, method: str = 'GET', ttl: Optional[Tuple[float, float]] = None):
         """
         Dynamically registers a new API endpoint.
 
@@ -64,11 +134,17 @@ class NepseScraper:
             name: A unique name for the endpoint (e.g., 'new_market_data').
             path: The API path (e.g., '/api/nots/new-data-point').
             method: The HTTP method, 'GET' or 'POST'. Defaults to 'GET'.
+            ttl: Optional `(seconds while the market is open, seconds while it is closed)`
+                 for which the response cache may serve this endpoint.
         """
         if name in self.endpoints:
             logger.warning(f"Endpoint '{name}' already exists. Overwriting.")
         
         self.endpoints[name] = {"api": path, "method": method.upper()}
+        if ttl is not None:
+            self.endpoints[name]['ttl'] = ttl
+        if self.session.response_cache is not None:
+            self.session.response_cache.set_ttl(name, path, method, ttl)
         logger.info(f"Successfully registered new endpoint: '{name}'")
 
     def call_endpoint(self, name: str, params: Optional[Dict] = None, payload: Optional[Dict] = None, which_payload: Optional[str] = None) -> Any:
@@ -107,6 +183,20 @@ class NepseScraper:
             
         return response.json()
 
+    def cache_stats(self) -> Dict[str, Any]:
+        """
+        Returns the response cache hit/miss counters, in total and per endpoint.
+
+        Empty when the client was created without a `response_cache`.
+        """
+        if self.session.response_cache is None:
+            return {}
+        return self.session.response_cache.stats()
+
+    def rate_limit_stats(self) -> Dict[str, Any]:
+        """Returns the current request rate, queue depth and throttling counters per endpoint group."""
+        return self.session.rate_limiter.stats()
+
     # =========================================================================
     # Public API Methods
     # =========================================================================
@@ -136,9 +226,9 @@ class NepseScraper:
         """
         logger.info(f"Fetching today's price for date: {business_date or 'latest'}")
         endpoint = self.endpoints['today_price_api']
-        params = {"page": "0", "size": "500", "businessDate": business_date}
-        response = self.session.post(endpoint['api'], params=params)
-        return response.json().get('content', [])
+        params = {"businessDate": business_date}
+        pages = self.session.iter_pages('POST', endpoint['api'], params=params)
+        return [row for page in pages if isinstance(page, list) for row in page]
 
     def get_top_stocks(self, category: str, show_all: bool = False) -> List[Dict[str, Any]]:
         """
@@ -198,14 +288,53 @@ class NepseScraper:
             
         return results[ticker_list[0]] if len(ticker_list) == 1 else results
 
-    def get_live_trades(self) -> List[Dict[str, Any]]:
+    def iter_ticker_info(self, tickers: List[str], max_workers: int = 8) -> Iterator[Tuple[str, Optional[Dict[str, Any]], Optional[Exception]]]:
+        """
+        Fetches ticker info for many symbols concurrently, streaming results as they complete.
+
+        The payload ID is calculated once and reused for every request in the batch.
+
+        Args:
+            tickers (List[str]): Ticker symbols to fetch, e.g. the whole security universe.
+            max_workers (int): Maximum number of requests in flight. Defaults to 8.
+
+        Yields:
+            Tuple[str, Optional[Dict[str, Any]], Optional[Exception]]:
+                `(symbol, info, None)` on success or `(symbol, None, error)` on failure.
+        """
+        logger.info(f"Fetching ticker info in batch for {len(tickers)} tickers with {max_workers} workers.")
+        base_path = self.endpoints['ticker_info_api']['api']
+        # Authenticate and derive the payload ID before the fan-out; the session
+        # memoizes it, so every request in the batch reuses the same value.
+        self.session._get_payload_id(which_payload='stock-live')
+
+        def fetch(security_id: int) -> Dict[str, Any]:
+            return self.session.post(f"{base_path}/{security_id}", which_payload='stock-live').json()
+
+        return self._iter_ticker_batch(tickers, fetch, max_workers)
+
+    def get_ticker_info_batch(self, tickers: List[str], max_workers: int = 8) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, Exception]]:
+        """
+        Fetches ticker info for many symbols concurrently.
+
+        Returns:
+            Tuple[Dict[str, Dict[str, Any]], Dict[str, Exception]]:
+                Info keyed by ticker, and the error for every ticker that failed.
+        """
+        return self._collect_batch(self.iter_ticker_info(tickers, max_workers=max_workers))
+
+    def get_live_trades(self, check_market: bool = True) -> List[Dict[str, Any]]:
         """
         Fetches the live market trades if the market is open.
 
+        Args:
+            check_market (bool): Ask NEPSE whether the market is open first. Pollers that
+                                 track the market status themselves can skip this request.
+
         Returns:
             List[Dict[str, Any]]: A list of live trade data, or an empty list if the market is closed.
         """
-        if not self.is_market_open():
+        if check_market and not self.is_market_open():
             logger.warning("Attempted to get live trades while market is closed.")
             return []
             
@@ -319,9 +448,8 @@ class NepseScraper:
             "districtId": kwargs.get("district_id", 0),
             "municipalityId": kwargs.get("municipality_id", 0)
         }
-        params = {"page": "0", "size": "500"}
-        response = self.session.post(endpoint['api'], payload=payload, params=params)
-        return response.json().get('content', [])
+        pages = self.session.iter_pages('POST', endpoint['api'], payload=payload)
+        return [row for page in pages if isinstance(page, list) for row in page]
 
     def get_sectors(self) -> List[Dict[str, Any]]:
         """
@@ -402,6 +530,36 @@ class NepseScraper:
 
         return results[ticker_list[0]] if len(ticker_list) == 1 else results
 
+    def iter_ticker_contact(self, tickers: List[str], max_workers: int = 8) -> Iterator[Tuple[str, Optional[Dict[str, Any]], Optional[Exception]]]:
+        """
+        Fetches contact information for many symbols concurrently, streaming results as they complete.
+
+        Args:
+            tickers (List[str]): Ticker symbols to fetch.
+            max_workers (int): Maximum number of requests in flight. Defaults to 8.
+
+        Yields:
+            Tuple[str, Optional[Dict[str, Any]], Optional[Exception]]:
+                `(symbol, contact, None)` on success or `(symbol, None, error)` on failure.
+        """
+        logger.info(f"Fetching contact info in batch for {len(tickers)} tickers with {max_workers} workers.")
+        base_path = self.endpoints['ticker_contact_api']['api']
+
+        def fetch(security_id: int) -> Dict[str, Any]:
+            return self.session.get(f"{base_path}/{security_id}").json()
+
+        return self._iter_ticker_batch(tickers, fetch, max_workers)
+
+    def get_ticker_contact_batch(self, tickers: List[str], max_workers: int = 8) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, Exception]]:
+        """
+        Fetches contact information for many symbols concurrently.
+
+        Returns:
+            Tuple[Dict[str, Dict[str, Any]], Dict[str, Exception]]:
+                Contact info keyed by ticker, and the error for every ticker that failed.
+        """
+        return self._collect_batch(self.iter_ticker_contact(tickers, max_workers=max_workers))
+
     def get_ticker_price_history(self, ticker: str, start_date: str, end_date: str, page: int = 0, size: int = 500) -> List[Dict[str, Any]]:
         """
         Fetches the price history for a given ticker within a date range.
@@ -433,6 +591,35 @@ class NepseScraper:
         response = self.session.get(path, params=params)
         return response.json()
 
+    def iter_ticker_price_history(self, ticker: str, start_date: str, end_date: str, size: int = 500, prefetch: bool = True) -> Iterator[Dict[str, Any]]:
+        """
+        Streams the full price history for a ticker, walking every page lazily.
+
+        Only one page (plus one prefetched page) is held in memory at a time,
+        so long histories can be consumed row by row.
+
+        Args:
+            ticker (str): The ticker symbol for the security.
+            start_date (str): The start date in "YYYY-MM-DD" format.
+            end_date (str): The end date in "YYYY-MM-DD" format.
+            size (int): The number of records requested per page.
+            prefetch (bool): Request the next page while the current one is consumed. Defaults to True.
+
+        Yields:
+            Dict[str, Any]: One price history record at a time.
+        """
+        ticker_upper = ticker.upper()
+        logger.info(f"Streaming price history for ticker: {ticker_upper}")
+
+        ticker_id = self._resolve_ticker_ids([ticker_upper])[ticker_upper]
+        endpoint = self.endpoints['ticker_price_api']
+        path = f"{endpoint['api']}/{ticker_id}"
+        params = {'startDate': start_date, 'endDate': end_date}
+
+        for page in self.session.iter_pages('GET', path, params=params, size=size, prefetch=prefetch):
+            if isinstance(page, list):
+                yield from page
+
     # =========================================================================
     # NEW METHODS ADDED
     # =========================================================================
@@ -523,7 +710,8 @@ class NepseScraper:
                                            Defaults to the latest date.
 
         Returns:
-            List[Dict[str, Any]]: A list of dictionaries containing the trading average data.
+            List[Dict[str, Any]]: A list of dictionaries containing the trading average data (the rows of
+                                  every page; a response that is not paginated is returned unchanged).
             
         Raises:
             ValueError: If n_days is not between 1 and 180.
@@ -537,12 +725,15 @@ class NepseScraper:
         params = {
             "nDays": n_days,
             "businessDate": business_date,
-            "page": "0", 
-            "size": "500" # Use a large size to get all data
         }
-        
-        response = self.session.get(endpoint['api'], params=params)
-        return response.json()
+
+        rows = []
+        for page in self.session.iter_pages('GET', endpoint['api'], params=params):
+            if not isinstance(page, list):
+                # Not paginated: returned as NEPSE sent it, like response.json() was.
+                return page
+            rows.extend(page)
+        return rows
 
 
     def get_notices(self) -> List[Dict[str, Any]]:
@@ -0,0 +1,131 @@
+import base64
+import hashlib
+import json
+import logging
+import os
+from typing import Any, Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+from .session_cache import atomic_write_json, get_cache_dir
+
+logger = logging.getLogger(__name__)
+
+# Request headers that change what the server returns for the same URL; they
+# are part of the validator key so e.g. an XHR and a page load of one URL do
+# not share a body.
+VARY_HEADERS = ('Accept', 'X-Requested-With')
+
+
+class ValidatorStore:
+    """
+    On-disk store of the last `ETag` / `Last-Modified` seen for each GET
+    request, together with the response body they validate.
+    """
+
+    def __init__(self, directory: Optional[str] = None) -> None:
+        self.directory = directory or os.path.join(get_cache_dir(), 'http')
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], key + '.json')
+
+    @staticmethod
+    def key_for(request: requests.PreparedRequest) -> str:
+        vary = [request.headers.get(name, '') for name in VARY_HEADERS]
+        return hashlib.sha256(json.dumps([request.url, vary]).encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._path(key), 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+            return {**entry, 'content': base64.b64decode(entry['content'])}
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def put(self, key: str, entry: Dict[str, Any]) -> None:
+        path = self._path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            atomic_write_json(path, {**entry, 'content': base64.b64encode(entry['content']).decode('ascii')})
+        except OSError as e:
+            logger.warning(f"Could not store HTTP validators in {path}: {e}")
+
+    def clear(self) -> None:
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if name.endswith('.json'):
+                    try:
+                        os.remove(os.path.join(root, name))
+                    except OSError:
+                        pass
+
+
+def is_not_modified(response: requests.Response) -> bool:
+    """True when `response` was rebuilt from the validator store after a 304."""
+    return getattr(response, 'not_modified', False)
+
+
+class ConditionalHTTPAdapter(HTTPAdapter):
+    """
+    HTTPAdapter that turns repeated GETs into conditional requests.
+
+    Successful responses carrying an `ETag` or `Last-Modified` header are
+    stored per URL. The next GET of that URL sends `If-None-Match` /
+    `If-Modified-Since`, and a `304 Not Modified` answer is replaced by the
+    stored body with status 200, so callers see a normal response. Check
+    `is_not_modified(response)` to skip re-parsing unchanged content.
+    """
+
+    def __init__(self, *args: Any, store: Optional[ValidatorStore] = None, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.store = store if store is not None else ValidatorStore()
+
+    def send(self, request: requests.PreparedRequest, **kwargs: Any) -> requests.Response:
+        if request.method != 'GET' or kwargs.get('stream'):
+            return super().send(request, **kwargs)
+
+        key = self.store.key_for(request)
+        cached = self.store.get(key)
+        if cached is not None:
+            if cached.get('etag') and 'If-None-Match' not in request.headers:
+                request.headers['If-None-Match'] = cached['etag']
+            if cached.get('last_modified') and 'If-Modified-Since' not in request.headers:
+                request.headers['If-Modified-Since'] = cached['last_modified']
+
+        response = super().send(request, **kwargs)
+
+        if response.status_code == 304 and cached is not None:
+            logger.debug(f"{request.url} not modified; reusing the stored body.")
+            response.status_code = 200
+            response.reason = 'OK'
+            response._content = cached['content']
+            response.headers = CaseInsensitiveDict({**cached['headers'], **response.headers})
+            response.not_modified = True
+            return response
+
+        if response.status_code == 200:
+            etag = response.headers.get('ETag')
+            last_modified = response.headers.get('Last-Modified')
+            if etag or last_modified:
+                self.store.put(key, {
+                    'etag': etag,
+                    'last_modified': last_modified,
+                    'headers': {k: v for k, v in response.headers.items()
+                                if k.lower() in ('content-type', 'etag', 'last-modified')},
+                    'content': response.content,
+                })
+        return response
+
+
+def mount_conditional(session: requests.Session, store: Optional[ValidatorStore] = None, **adapter_kwargs: Any) -> ConditionalHTTPAdapter:
+    """Mount a ConditionalHTTPAdapter on `session` for http and https."""
+    adapter = ConditionalHTTPAdapter(store=store, **adapter_kwargs)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    # Record / replay / fixture-server transport when configured (NEPSE_HTTP_TRANSPORT).
+    from .replay import install_transport
+    install_transport(session)
+    return adapter
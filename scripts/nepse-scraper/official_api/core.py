@@ -1,29 +1,62 @@
 import logging
+import threading
+import time
 import warnings
-from typing import Any, Dict, Optional
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import date
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 import requests
 import certifi
 from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
 from urllib3.util.retry import Retry
 from urllib3.exceptions import InsecureRequestWarning
 
 from .auth import PayloadParser, TokenParser
+from .conditional import ConditionalHTTPAdapter, ValidatorStore
 from .endpoints import api_dict
 from .exceptions import SSLCertVerificationError, NepseScraperException
+from .rate_limit import THROTTLE_STATUSES, RateLimiter, get_rate_limiter, retry_delay
+from .replay import install_transport
+from .response_cache import ResponseCache
+from .session_cache import SessionCache
 
 logger = logging.getLogger(__name__)
 ROOT_URL = 'https://www.nepalstock.com'
 
 
+AUTH_FAILURE_STATUSES = (401, 403)
+MAX_STATUS_RETRIES = 3
+
+
+def _response_from_cache(entry: Dict[str, Any]) -> requests.Response:
+    response = requests.Response()
+    response.status_code = entry['status']
+    response.headers = CaseInsensitiveDict(entry['headers'])
+    response._content = entry['content']
+    response.url = entry['url']
+    return response
+
+
 class NepseAPISession:
-    def __init__(self, verify_ssl: bool = True):
+    def __init__(self, verify_ssl: bool = True, session_cache: Optional[SessionCache] = None,
+                 response_cache: Optional[ResponseCache] = None, validator_store: Optional[ValidatorStore] = None,
+                 rate_limiter: Optional[RateLimiter] = None):
         self._token_parser = TokenParser()
         self._payload_parser = PayloadParser()
         self.access_token: Optional[str] = None
         self.token_details: Optional[Dict[str, Any]] = None
         
         self._market_open_id: Optional[int] = None
+        self._payload_ids: Dict[Tuple, int] = {}
+        self.session_cache = session_cache
+        self.response_cache = response_cache
+        self.rate_limiter = rate_limiter if rate_limiter is not None else get_rate_limiter()
+        # Single-flight guards: concurrent callers that find the token (or the
+        # market-open ID) missing or expired share one fetch.
+        self._auth_lock = threading.Lock()
+        self._market_open_lock = threading.Lock()
         
         self.session = requests.Session()
         
@@ -36,13 +69,25 @@ class NepseAPISession:
                 InsecureRequestWarning
             )
 
+        # Only connection-level retries here: retries on 429/5xx go through
+        # _paced_request so they are paced and charged to the retry budget.
+        # status=0 and ignoring Retry-After keep urllib3 from retrying those
+        # responses (uncapped) before _paced_request sees them.
         retry_strategy = Retry(
-            total=3, backoff_factor=1, status_forcelist=[500, 502, 503, 504],
-            allowed_methods=["HEAD", "GET", "POST"]
+            total=3, status=0, backoff_factor=1, allowed_methods=["HEAD", "GET", "POST"],
+            respect_retry_after_header=False,
         )
-        adapter = HTTPAdapter(max_retries=retry_strategy)
+        # Sized for the batch helpers in NepseScraper, which share this session across threads.
+        adapter_kwargs = dict(max_retries=retry_strategy, pool_connections=10, pool_maxsize=32)
+        if validator_store is not None:
+            # GETs revalidate with ETag / Last-Modified and reuse the stored body on 304.
+            adapter = ConditionalHTTPAdapter(store=validator_store, **adapter_kwargs)
+        else:
+            adapter = HTTPAdapter(**adapter_kwargs)
         self.session.mount("https://", adapter)
         self.session.mount("http://", adapter)
+        # Record / replay / fixture-server transport when configured (NEPSE_HTTP_TRANSPORT).
+        install_transport(self.session)
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (X11; Ubuntu; Linux x86_64; rv:89.0) Gecko/20100101 Firefox/89.0',
             'Accept': 'application/json, text/plain, */*', 'Accept-Language': 'en-US,en;q=0.5',
@@ -50,83 +95,243 @@ class NepseAPISession:
         })
         logger.debug("NepseAPISession initialized.")
 
+    def _load_cached_token(self, stale_token: Optional[str] = None) -> bool:
+        if self.session_cache is None:
+            return False
+        cached = self.session_cache.load_token()
+        if cached is None or cached['access_token'] == stale_token:
+            return False
+        self.access_token = cached['access_token']
+        self.token_details = cached['token_details']
+        return True
+
     def _get_access_token(self) -> None:
         if self.access_token: return
-        logger.info("No active token found. Fetching new access token from NEPSE.")
-        auth_endpoint = api_dict['authenticate_api']
-        url = ROOT_URL + auth_endpoint['api']
-        try:
-            response = self.session.request(auth_endpoint['method'], url)
-            response.raise_for_status()
-            token_response = response.json()
-            for i in range(1, 6): token_response[f'salt{i}'] = int(token_response[f'salt{i}'])
-            self.access_token, _ = self._token_parser.parse_token_response(token_response)
-            self.token_details = token_response
-            logger.info("Successfully authenticated and stored new token.")
-        except requests.exceptions.SSLError as e:
-            logger.error(f"SSL Certificate Verification failed: {e}", exc_info=True)
-            # Returing custom exception for ssl verification.
-            raise SSLCertVerificationError(
-                "SSL certificate verification failed. This is likely due to the NEPSE server's "
-                "incomplete certificate chain or a network proxy. "
-                "Try initializing the client with: NepseScraper(verify_ssl=False)"
-            ) from e
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Failed to authenticate with NEPSE API: {e}", exc_info=True)
-            raise e
+        self._authenticate()
+
+    def _authenticate(self, stale_token: Optional[str] = None) -> None:
+        """
+        Obtain a token, replacing `stale_token` if NEPSE rejected it.
+
+        Runs under a lock so that when several threads hit an expired token at
+        once only the first one re-authenticates; the rest pick up its result.
+        """
+        with self._auth_lock:
+            if self.access_token and self.access_token != stale_token:
+                return
+
+            if stale_token is not None:
+                if self.session_cache is not None:
+                    self.session_cache.invalidate(stale_token)
+                self.access_token = None
+                self.token_details = None
+                self._market_open_id = None
+
+            if self._load_cached_token(stale_token): return
+            logger.info("No active token found. Fetching new access token from NEPSE.")
+            auth_endpoint = api_dict['authenticate_api']
+            try:
+                response = self._paced_request(auth_endpoint['method'], auth_endpoint['api'])
+                response.raise_for_status()
+                token_response = response.json()
+                for i in range(1, 6): token_response[f'salt{i}'] = int(token_response[f'salt{i}'])
+                access_token, _ = self._token_parser.parse_token_response(token_response)
+                self.token_details = token_response
+                self.access_token = access_token
+                if self.session_cache is not None:
+                    self.session_cache.save_token(self.access_token, self.token_details)
+                logger.info("Successfully authenticated and stored new token.")
+            except requests.exceptions.SSLError as e:
+                logger.error(f"SSL Certificate Verification failed: {e}", exc_info=True)
+                # Returing custom exception for ssl verification.
+                raise SSLCertVerificationError(
+                    "SSL certificate verification failed. This is likely due to the NEPSE server's "
+                    "incomplete certificate chain or a network proxy. "
+                    "Try initializing the client with: NepseScraper(verify_ssl=False)"
+                ) from e
+            except requests.exceptions.RequestException as e:
+                logger.error(f"Failed to authenticate with NEPSE API: {e}", exc_info=True)
+                raise e
 
     def _fetch_market_open_id(self) -> int:
         if self._market_open_id is not None:
             logger.debug(f"Using cached market_open_id: {self._market_open_id}")
             return self._market_open_id
 
-        self._get_access_token()
-        logger.debug("Fetching market open ID for payload calculation.")
-        endpoint = api_dict['marketopen_api']
-        url = ROOT_URL + endpoint['api']
-        headers = {'Authorization': f'Salter {self.access_token}'}
-        
-        try:
-            response = self.session.get(url, headers=headers)
-            response.raise_for_status()
-            market_data = response.json()
-            self._market_open_id = market_data["id"]
-            return self._market_open_id
-        except (requests.exceptions.RequestException, KeyError) as e:
-            logger.error(f"Failed to fetch or parse market open ID: {e}", exc_info=True)
-            raise IOError("Could not retrieve the necessary payload ID from NEPSE.") from e
+        with self._market_open_lock:
+            if self._market_open_id is not None:
+                return self._market_open_id
+
+            if self.session_cache is not None:
+                cached_id = self.session_cache.load_market_open_id()
+                if cached_id is not None:
+                    self._market_open_id = cached_id
+                    return self._market_open_id
+
+            logger.debug("Fetching market open ID for payload calculation.")
+            endpoint = api_dict['marketopen_api']
+            try:
+                market_data = self._send('GET', endpoint['api']).json()
+                self._market_open_id = market_data["id"]
+                if self.session_cache is not None:
+                    self.session_cache.save_market_open_id(self._market_open_id)
+                return self._market_open_id
+            except (requests.exceptions.RequestException, KeyError) as e:
+                logger.error(f"Failed to fetch or parse market open ID: {e}", exc_info=True)
+                raise IOError("Could not retrieve the necessary payload ID from NEPSE.") from e
 
 
     def _get_payload_id(self, which_payload: str) -> int:
         self._get_access_token()
         given_id = self._fetch_market_open_id()
-        
-        return self._payload_parser.calculate_payload_id(
-            given_id=given_id,
-            token_details=self.token_details,
-            which=which_payload
-        )
+        token_details = self.token_details
 
-    def get(self, path: str, params: Optional[Dict] = None) -> requests.Response:
-        self._get_access_token()
-        url = ROOT_URL + path
-        headers = {'Authorization': f'Salter {self.access_token}'}
-        logger.debug(f"Making GET request to: {url} with params: {params}")
-        resp = self.session.get(url, params=params, headers=headers)
-        resp.raise_for_status()
-        return resp
+        # The ID only changes with the token salts, the market-open ID and the
+        # day, so batches and page walks compute it once.
+        key = (which_payload, given_id, token_details.get('accessToken'), date.today())
+        payload_id = self._payload_ids.get(key)
+        if payload_id is None:
+            payload_id = self._payload_parser.calculate_payload_id(
+                given_id=given_id,
+                token_details=token_details,
+                which=which_payload
+            )
+            # Keep only IDs derived from the current token.
+            self._payload_ids = {k: v for k, v in self._payload_ids.items() if k[1:] == key[1:]}
+            self._payload_ids[key] = payload_id
+        return payload_id
 
-    def post(self, path: str, payload: Optional[Dict] = None, params: Optional[Dict] = None, which_payload: Optional[str] = None) -> requests.Response:
-        self._get_access_token()
+    def _paced_request(self, method: str, path: str, **kwargs: Any) -> requests.Response:
+        """
+        Send one request through the shared rate limiter. Throttling responses
+        (429/5xx) slow the endpoint group down and are retried with backoff
+        while the process-wide retry budget allows it.
+        """
         url = ROOT_URL + path
-        headers = {'Authorization': f'Salter {self.access_token}'}
-        
-        if payload is None:
-            final_payload = {'id': self._get_payload_id(which_payload=which_payload)}
-        else:
+        attempt = 0
+        while True:
+            group = self.rate_limiter.acquire(path)
+            resp = self.session.request(method, url, **kwargs)
+            self.rate_limiter.record(group, resp.status_code)
+            if (resp.status_code not in THROTTLE_STATUSES or attempt >= MAX_STATUS_RETRIES
+                    or not self.rate_limiter.allow_retry()):
+                return resp
+            delay = retry_delay(resp.headers, attempt)
+            logger.warning(f"HTTP {resp.status_code} from {path}; retrying in {delay:.1f}s.")
+            time.sleep(delay)
+            attempt += 1
+
+    def _send(
+        self,
+        method: str,
+        path: str,
+        params: Optional[Dict] = None,
+        payload: Optional[Dict] = None,
+        which_payload: Optional[str] = None,
+    ) -> requests.Response:
+        """
+        Send an authenticated request. If NEPSE rejects the token (401/403), the
+        session re-authenticates once and retries the request with the new
+        token and, for generated POST payloads, a recalculated payload ID.
+
+        Responses of endpoints with a TTL are served from `response_cache`
+        when one is configured.
+        """
+        cache_key = None
+        if self.response_cache is not None:
+            cache_key = self.response_cache.key_for(method, path, params, payload, which_payload)
+            if cache_key is not None:
+                entry = self.response_cache.get(cache_key)
+                if entry is not None:
+                    return _response_from_cache(entry)
+
+        for attempt in range(2):
+            self._get_access_token()
+            token = self.access_token
+            headers = {'Authorization': f'Salter {token}'}
+
             final_payload = payload
+            if method == 'POST' and payload is None:
+                final_payload = {'id': self._get_payload_id(which_payload=which_payload)}
+
+            logger.debug(f"Making {method} request to: {path} with payload: {final_payload} and params: {params}")
+            resp = self._paced_request(method, path, params=params, json=final_payload, headers=headers)
+            if resp.status_code in AUTH_FAILURE_STATUSES and attempt == 0:
+                logger.warning(f"NEPSE rejected the access token with HTTP {resp.status_code}; re-authenticating.")
+                self._authenticate(stale_token=token)
+                continue
+            resp.raise_for_status()
+            if cache_key is not None and resp.status_code == 200:
+                self.response_cache.put(cache_key, resp.status_code, resp.headers, resp.content, resp.url)
+            return resp
+
+    def get(self, path: str, params: Optional[Dict] = None) -> requests.Response:
+        return self._send('GET', path, params=params)
+
+    def post(self, path: str, payload: Optional[Dict] = None, params: Optional[Dict] = None, which_payload: Optional[str] = None) -> requests.Response:
+        return self._send('POST', path, params=params, payload=payload, which_payload=which_payload)
+
+    def _request_page(self, method: str, path: str, params: Dict, payload: Optional[Dict], which_payload: Optional[str], page: int, size: int) -> Any:
+        page_params = {**params, 'page': page, 'size': size}
+        return self._send(method, path, params=page_params, payload=payload, which_payload=which_payload).json()
+
+    def iter_pages(
+        self,
+        method: str,
+        path: str,
+        params: Optional[Dict] = None,
+        payload: Optional[Dict] = None,
+        which_payload: Optional[str] = None,
+        size: int = 500,
+        prefetch: bool = False,
+    ) -> Iterator[Any]:
+        """
+        Lazily yields the `content` of every page of a paginated NEPSE endpoint.
+
+        Stops on the page flagged `last` or after `totalPages`; without paging
+        metadata, on a short or empty page. An unpaginated body (a plain list, or
+        an object without `content`) is yielded once as it is.
+        With `prefetch=True` page N+1 is requested in the background while the
+        caller is still handling page N.
+        """
+        method = method.upper()
+        params = dict(params or {})
+        executor = ThreadPoolExecutor(max_workers=1) if prefetch else None
+        pending: Optional[Future] = None
+        page = 0
+        try:
+            body = self._request_page(method, path, params, payload, which_payload, page, size)
+            while True:
+                if not isinstance(body, dict) or 'content' not in body:
+                    if body:
+                        yield body
+                    return
+
+                content = body.get('content') or []
+                # Trust the server's paging metadata over the requested size, which it may cap.
+                if 'last' in body:
+                    has_next = not body['last']
+                elif body.get('totalPages') is not None:
+                    has_next = page + 1 < int(body['totalPages'])
+                else:
+                    has_next = len(content) >= size
+                has_next = has_next and bool(content)
+
+                if has_next and executor is not None:
+                    pending = executor.submit(self._request_page, method, path, params, payload, which_payload, page + 1, size)
+
+                if content:
+                    yield content
+                if not has_next:
+                    return
 
-        logger.debug(f"Making POST request to: {url} with payload: {final_payload} and params: {params}")
-        resp = self.session.post(url, json=final_payload, params=params, headers=headers)
-        resp.raise_for_status()
-        return resp
\ No newline at end of file
+                page += 1
+                if pending is not None:
+                    body, pending = pending.result(), None
+                else:
+                    body = self._request_page(method, path, params, payload, which_payload, page, size)
+        finally:
+            if pending is not None:
+                pending.cancel()
+            if executor is not None:
+                executor.shutdown(wait=False)
@@ -1,3 +1,5 @@
+# Optional "ttl": (seconds while the market is open, seconds while it is closed)
+# that a ResponseCache may keep the response for. Endpoints without it are never cached.
 api_dict = {
     "authenticate_api": {"api":"/api/authenticate/prove", "method":"GET"},
     "today_price_api": {"api":"/api/nots/nepse-data/today-price", "method":"POST"},
@@ -5,31 +7,31 @@ api_dict = {
     "refer_api":{"api":"", "method":"GET"},
     "head_indices_api":{"api":"/api/nots/index/history", "method":"GET"}, # -> should add index ID like https://www.nepalstock.com/api/nots/index/history/51
     "sectorwise_summary_api": {"api":"/api/nots/sectorwise", "method":"GET"},
-    "market_summary_history_api": {"api":"/api/nots/market-summary-history", "method":"GET"},
-    "disclosure":{"api":"/api/nots/news/companies/disclosure", "method":"GET"},
+    "market_summary_history_api": {"api":"/api/nots/market-summary-history", "method":"GET", "ttl":(300, 21600)},
+    "disclosure":{"api":"/api/nots/news/companies/disclosure", "method":"GET", "ttl":(300, 1800)},
     "top_gainer":{"api":"/api/nots/top-ten/top-gainer", "method":"GET"},
     "top_loser":{"api":"/api/nots/top-ten/top-loser", "method":"GET"},
     "top_turnover":{"api":"/api/nots/top-ten/turnover", "method":"GET"},
     "top_trade":{"api":"/api/nots/top-ten/trade", "method":"GET"},
     "top_transaction":{"api":"/api/nots/top-ten/transaction", "method":"GET"},
     "market_summary_api":{"api":"/api/nots/market-summary", "method":"GET"},
-    "security_api":{"api":"/api/nots/company/list","method":"GET"},
+    "security_api":{"api":"/api/nots/company/list","method":"GET", "ttl":(3600, 86400)},
     "marketcap_api":{"api":"/api/nots/nepse-data/marcapbydate","method":"GET"},
     "trading_average_api":{"api":"/api/nots/nepse-data/trading-average","method":"GET"},
-    "broker_api":{"api":"/api/nots/member","method":"POST"},
-    "sector_api":{"api":"/api/nots/sector", "method":"GET"},
+    "broker_api":{"api":"/api/nots/member","method":"POST", "ttl":(86400, 86400)},
+    "sector_api":{"api":"/api/nots/sector", "method":"GET", "ttl":(86400, 86400)},
     "sector_index_api":{"api":"/api/nots/index", "method":"GET"},
     "stock_live_api":{"api":"/api/nots/lives-market", "method":"GET"},
     "indices_live_api":{"api":"/api/nots/graph/index", "method":"POST"},
     "security":{"api":"/api/nots/security", "method":"GET"},
     "ticker_info_api":{"api":"/api/nots/security", "method":"POST"},
-    "ticker_contact_api":{"api":"/api/nots/security/profile", "method":"GET"},
+    "ticker_contact_api":{"api":"/api/nots/security/profile", "method":"GET", "ttl":(86400, 86400)},
     "ticker_price_api":{"api":"/api/nots/market/security/price","method":"GET"},
     "nepse_index_api": {"api": "/api/nots/nepse-index", "method": "GET"},
     "security_daily_trade_stat_api": {"api": "/api/nots/securityDailyTradeStat", "method": "GET"},
-    "securities_list_api": {"api": "/api/nots/securities", "method": "GET"},
+    "securities_list_api": {"api": "/api/nots/securities", "method": "GET", "ttl":(3600, 86400)},
     "supply_demand_api": {"api": "/api/nots/nepse-data/supplydemand", "method": "GET"},
     "top_trade_qty_api": {"api": "/api/nots/top-ten/trade-qty", "method": "GET"},
-    "notice_api": {"api": "/api/web/notice/", "method": "GET"},
-    "info_officer_api": {"api": "/api/web/info-officer", "method": "GET"},
+    "notice_api": {"api": "/api/web/notice/", "method": "GET", "ttl":(600, 3600)},
+    "info_officer_api": {"api": "/api/web/info-officer", "method": "GET", "ttl":(86400, 86400)},
 }
\ No newline at end of file
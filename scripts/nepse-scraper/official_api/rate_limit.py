@@ -0,0 +1,256 @@
+import asyncio
+import logging
+import threading
+import time
+from typing import Any, Dict, Mapping, Optional
+
+logger = logging.getLogger(__name__)
+
+# Responses that mean "slow down": the rate of the group is cut and the
+# request may be retried if the retry budget allows it.
+THROTTLE_STATUSES = (429, 500, 502, 503, 504)
+
+# Path prefix -> endpoint group. The longest matching prefix wins; anything
+# else belongs to the 'default' group.
+DEFAULT_ROUTES: Dict[str, str] = {
+    '/api/authenticate': 'auth',
+    '/api/nots/nepse-data/market-open': 'auth',
+    '/api/nots/market/security/price': 'history',
+    '/api/nots/index/history': 'history',
+    '/api/nots/market-summary-history': 'history',
+    '/api/nots/security': 'securities',
+    '/api/nots/lives-market': 'live',
+    '/api/nots/graph/index': 'live',
+    '/api/nots/nepse-data/today-price': 'live',
+}
+
+
+class GroupLimit:
+    """Pacing settings of one endpoint group, in requests per second."""
+
+    def __init__(
+        self,
+        rate: float = 10.0,
+        burst: int = 20,
+        min_rate: float = 0.5,
+        max_rate: Optional[float] = None,
+        increase: float = 0.5,
+        decrease: float = 0.5,
+    ) -> None:
+        self.rate = rate
+        self.burst = burst
+        self.min_rate = min_rate
+        self.max_rate = max_rate if max_rate is not None else rate
+        self.increase = increase
+        self.decrease = decrease
+
+
+DEFAULT_LIMITS: Dict[str, GroupLimit] = {
+    'default': GroupLimit(rate=10.0, burst=20),
+    'auth': GroupLimit(rate=2.0, burst=4, min_rate=0.2),
+    'securities': GroupLimit(rate=10.0, burst=32),
+    'history': GroupLimit(rate=5.0, burst=10),
+    'live': GroupLimit(rate=5.0, burst=10),
+}
+
+
+class TokenBucket:
+    """
+    Token bucket whose refill rate follows AIMD: every success adds
+    `increase` req/s up to `max_rate`, every throttling response multiplies
+    the rate by `decrease` (at most once per second, so one burst of errors
+    does not collapse the rate) down to `min_rate`.
+
+    `reserve()` takes a token and returns how long the caller has to wait
+    for it; the bucket goes into debt instead of blocking, which lets
+    threads and coroutines share it.
+    """
+
+    def __init__(self, limit: GroupLimit) -> None:
+        self.limit = limit
+        self.rate = limit.rate
+        self.tokens = float(limit.burst)
+        self.waiting = 0
+        self.requests = 0
+        self.throttled = 0
+        self._updated = time.monotonic()
+        self._last_decrease = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(float(self.limit.burst), self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self) -> float:
+        with self._lock:
+            self._refill(time.monotonic())
+            self.tokens -= 1
+            self.requests += 1
+            return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    def on_success(self) -> None:
+        with self._lock:
+            self.rate = min(self.limit.max_rate, self.rate + self.limit.increase)
+
+    def on_throttle(self) -> None:
+        with self._lock:
+            self.throttled += 1
+            now = time.monotonic()
+            if now - self._last_decrease < 1.0:
+                return
+            self._refill(now)
+            self.rate = max(self.limit.min_rate, self.rate * self.limit.decrease)
+            self._last_decrease = now
+            logger.warning(f"NEPSE is throttling; reduced request rate to {self.rate:.2f}/s.")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            self._refill(time.monotonic())
+            return {
+                'rate': round(self.rate, 3),
+                'tokens': round(self.tokens, 3),
+                'queue_depth': self.waiting,
+                'requests': self.requests,
+                'throttled': self.throttled,
+            }
+
+
+class RetryBudget:
+    """
+    Process-wide allowance for retries: every request deposits `ratio`
+    tokens (capped at `max_tokens`) and every retry spends one, so retries
+    stay a bounded fraction of traffic instead of multiplying during an
+    outage. `reserve` tokens are available from the start.
+    """
+
+    def __init__(self, ratio: float = 0.2, reserve: float = 10.0, max_tokens: float = 50.0) -> None:
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self.tokens = reserve
+        self.retries = 0
+        self.denied = 0
+        self._lock = threading.Lock()
+
+    def deposit(self) -> None:
+        with self._lock:
+            self.tokens = min(self.max_tokens, self.tokens + self.ratio)
+
+    def try_spend(self) -> bool:
+        with self._lock:
+            if self.tokens >= 1:
+                self.tokens -= 1
+                self.retries += 1
+                return True
+            self.denied += 1
+            return False
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {'available': round(self.tokens, 3), 'retries': self.retries, 'denied': self.denied}
+
+
+class RateLimiter:
+    """
+    Paces NEPSE requests per endpoint group and owns the retry budget.
+
+    One instance is shared by every session in the process (see
+    `get_rate_limiter`), so parallel stages and batch helpers together stay
+    under the configured rates.
+    """
+
+    def __init__(
+        self,
+        limits: Optional[Mapping[str, GroupLimit]] = None,
+        routes: Optional[Mapping[str, str]] = None,
+        retry_budget: Optional[RetryBudget] = None,
+    ) -> None:
+        limits = dict(DEFAULT_LIMITS if limits is None else limits)
+        limits.setdefault('default', DEFAULT_LIMITS['default'])
+        self.buckets: Dict[str, TokenBucket] = {name: TokenBucket(limit) for name, limit in limits.items()}
+        self.routes: Dict[str, str] = dict(DEFAULT_ROUTES if routes is None else routes)
+        self.retry_budget = retry_budget if retry_budget is not None else RetryBudget()
+
+    def group_for(self, path: str) -> str:
+        candidate = path.split('?', 1)[0].rstrip('/')
+        while candidate:
+            group = self.routes.get(candidate)
+            if group is not None and group in self.buckets:
+                return group
+            if '/' not in candidate:
+                break
+            candidate = candidate.rsplit('/', 1)[0]
+        return 'default'
+
+    def acquire(self, path: str) -> str:
+        """Block until a request to `path` may be sent. Returns its group."""
+        group = self.group_for(path)
+        bucket = self.buckets[group]
+        self.retry_budget.deposit()
+        delay = bucket.reserve()
+        if delay > 0:
+            with bucket._lock:
+                bucket.waiting += 1
+            try:
+                time.sleep(delay)
+            finally:
+                with bucket._lock:
+                    bucket.waiting -= 1
+        return group
+
+    async def acquire_async(self, path: str) -> str:
+        """Coroutine counterpart of `acquire`."""
+        group = self.group_for(path)
+        bucket = self.buckets[group]
+        self.retry_budget.deposit()
+        delay = bucket.reserve()
+        if delay > 0:
+            with bucket._lock:
+                bucket.waiting += 1
+            try:
+                await asyncio.sleep(delay)
+            finally:
+                with bucket._lock:
+                    bucket.waiting -= 1
+        return group
+
+    def record(self, group: str, status_code: int) -> None:
+        """Feed a response status back into the group's AIMD rate."""
+        if status_code in THROTTLE_STATUSES:
+            self.buckets[group].on_throttle()
+        elif status_code < 400:
+            self.buckets[group].on_success()
+
+    def allow_retry(self) -> bool:
+        return self.retry_budget.try_spend()
+
+    def stats(self) -> Dict[str, Any]:
+        """Current rate, queue depth and counters per group, plus the retry budget."""
+        return {
+            'groups': {name: bucket.stats() for name, bucket in self.buckets.items()},
+            'retry_budget': self.retry_budget.stats(),
+        }
+
+
+def retry_delay(headers: Mapping[str, str], attempt: int, backoff_factor: float = 1.0) -> float:
+    """Seconds to wait before retry number `attempt` (0-based): Retry-After if given, else exponential."""
+    retry_after = headers.get('Retry-After')
+    if retry_after:
+        try:
+            return min(float(retry_after), 60.0)
+        except ValueError:
+            pass
+    return backoff_factor * (2 ** attempt)
+
+
+_default_limiter: Optional[RateLimiter] = None
+_default_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> RateLimiter:
+    """The process-wide RateLimiter used by sessions that are not given one."""
+    global _default_limiter
+    if _default_limiter is None:
+        with _default_limiter_lock:
+            if _default_limiter is None:
+                _default_limiter = RateLimiter()
+    return _default_limiter
@@ -0,0 +1,317 @@
+import base64
+import hashlib
+import json
+import logging
+import os
+import random
+import threading
+import time
+import urllib.parse
+from typing import Any, Dict, List, Mapping, Optional
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from .conditional import VARY_HEADERS
+from .session_cache import atomic_write_json
+
+logger = logging.getLogger(__name__)
+
+# How sessions talk to the outside world:
+#   'live'   - the real sites (default)
+#   'record' - the real sites, saving every response into the fixture directory
+#   'replay' - responses come from the fixture directory; nothing leaves the process
+#   'server' - requests go over HTTP to a local fixture_server.py serving the fixtures
+TRANSPORTS = ('live', 'record', 'replay', 'server')
+
+DEFAULT_TRANSPORT = os.environ.get('NEPSE_HTTP_TRANSPORT', 'live')
+DEFAULT_FIXTURE_DIR = os.environ.get('NEPSE_HTTP_FIXTURES', '')
+DEFAULT_SERVER_URL = os.environ.get('NEPSE_HTTP_SERVER', 'http://127.0.0.1:8765')
+# Injected in 'replay' mode: seconds added to every response, and the share of
+# responses replaced by ERROR_STATUS.
+DEFAULT_LATENCY = float(os.environ.get('NEPSE_HTTP_LATENCY', '0') or 0)
+DEFAULT_ERROR_RATE = float(os.environ.get('NEPSE_HTTP_ERROR_RATE', '0') or 0)
+ERROR_STATUS = 503
+
+# Response headers worth keeping in a fixture.
+KEPT_HEADERS = ('Content-Type', 'ETag', 'Last-Modified', 'Retry-After')
+_KEPT_LOWER = {name.lower() for name in KEPT_HEADERS}
+
+
+def configure(
+    transport: Optional[str] = None,
+    fixtures: Optional[str] = None,
+    server_url: Optional[str] = None,
+    latency: Optional[float] = None,
+    error_rate: Optional[float] = None,
+) -> None:
+    """Change the process-wide defaults used by `install_transport`."""
+    global DEFAULT_TRANSPORT, DEFAULT_FIXTURE_DIR, DEFAULT_SERVER_URL, DEFAULT_LATENCY, DEFAULT_ERROR_RATE
+    if transport is not None:
+        if transport not in TRANSPORTS:
+            raise ValueError(f"Unknown HTTP transport '{transport}'. Use one of {TRANSPORTS}.")
+        DEFAULT_TRANSPORT = transport
+    if fixtures is not None:
+        DEFAULT_FIXTURE_DIR = fixtures
+    if server_url is not None:
+        DEFAULT_SERVER_URL = server_url
+    if latency is not None:
+        DEFAULT_LATENCY = latency
+    if error_rate is not None:
+        DEFAULT_ERROR_RATE = error_rate
+
+
+def prepared_url(method: str, url: str, params: Optional[Mapping[str, Any]] = None) -> str:
+    """The URL requests sends for `url` with `params` (same encoding and ordering)."""
+    return requests.Request(method, url, params=params).prepare().url
+
+
+class FixtureStore:
+    """
+    Recorded HTTP responses, one JSON file per method and URL under
+    `<directory>/<host>/`.
+
+    Request bodies are not part of the key: NEPSE POST payloads carry an ID
+    derived from the token and the day, so a recording would never match
+    again. A URL can hold several responses; they are told apart by the
+    VARY_HEADERS of the request (a page load and an XHR of one URL) and
+    otherwise replayed in recorded order, the last one repeating; `rewind`
+    starts the order over.
+    Text bodies are stored as text so fixtures stay readable and diffable.
+    """
+
+    def __init__(self, directory: str) -> None:
+        self.directory = directory
+        self._lock = threading.Lock()
+        self._cache: Dict[str, Dict[str, Any]] = {}
+        self._served: Dict[str, int] = {}
+
+    @staticmethod
+    def key_for(method: str, url: str) -> str:
+        """Fixture key of a request; query parameter order does not matter."""
+        parts = urllib.parse.urlsplit(url)
+        query = urllib.parse.urlencode(sorted(urllib.parse.parse_qsl(parts.query, keep_blank_values=True)))
+        canonical = urllib.parse.urlunsplit((parts.scheme, parts.netloc, parts.path, query, ''))
+        return hashlib.sha256(f'{method.upper()} {canonical}'.encode('utf-8')).hexdigest()[:24]
+
+    def _path(self, method: str, url: str) -> str:
+        host = urllib.parse.urlsplit(url).netloc or 'local'
+        return os.path.join(self.directory, host.replace(':', '_'), self.key_for(method, url) + '.json')
+
+    def _load(self, method: str, url: str) -> Dict[str, Any]:
+        path = self._path(method, url)
+        entry = self._cache.get(path)
+        if entry is None:
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    entry = json.load(f)
+            except (OSError, ValueError):
+                entry = {'method': method.upper(), 'url': url, 'responses': []}
+            self._cache[path] = entry
+        return entry
+
+    def add(
+        self,
+        method: str,
+        url: str,
+        status: int,
+        content: bytes,
+        headers: Optional[Mapping[str, str]] = None,
+        vary: Optional[Mapping[str, str]] = None,
+    ) -> None:
+        """Append one response for `method` `url` (already including its query string)."""
+        stored: Dict[str, Any] = {
+            'status': status,
+            'headers': {k: v for k, v in (headers or {}).items() if k.lower() in _KEPT_LOWER},
+            'vary': {name: value for name, value in (vary or {}).items() if value},
+        }
+        try:
+            stored['text'] = content.decode('utf-8')
+        except UnicodeDecodeError:
+            stored['base64'] = base64.b64encode(content).decode('ascii')
+        with self._lock:
+            entry = self._load(method, url)
+            entry['responses'].append(stored)
+            path = self._path(method, url)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            atomic_write_json(path, entry)
+
+    def add_json(self, method: str, url: str, data: Any, status: int = 200, **kwargs: Any) -> None:
+        body = json.dumps(data, ensure_ascii=False).encode('utf-8')
+        headers = {'Content-Type': 'application/json; charset=utf-8', **kwargs.pop('headers', {})}
+        self.add(method, url, status, body, headers=headers, **kwargs)
+
+    def add_html(self, method: str, url: str, html: str, status: int = 200, **kwargs: Any) -> None:
+        headers = {'Content-Type': 'text/html; charset=utf-8', **kwargs.pop('headers', {})}
+        self.add(method, url, status, html.encode('utf-8'), headers=headers, **kwargs)
+
+    def rewind(self) -> None:
+        with self._lock:
+            self._served.clear()
+
+    def match(self, method: str, url: str, request_headers: Optional[Mapping[str, str]] = None) -> Optional[Dict[str, Any]]:
+        """
+        Next recorded response for a request, as {'status', 'headers', 'content'},
+        or None if nothing was recorded for its method and URL.
+        """
+        request_headers = CaseInsensitiveDict(request_headers or {})
+        with self._lock:
+            entry = self._load(method, url)
+            responses: List[Dict[str, Any]] = entry['responses']
+            if not responses:
+                return None
+            vary = {name: request_headers.get(name) for name in VARY_HEADERS if request_headers.get(name)}
+            candidates = [r for r in responses if r.get('vary', {}) == vary] or responses
+            counter = f"{self._path(method, url)}|{json.dumps(vary, sort_keys=True)}"
+            served = self._served.get(counter, 0)
+            self._served[counter] = served + 1
+            chosen = candidates[min(served, len(candidates) - 1)]
+        if 'base64' in chosen:
+            content = base64.b64decode(chosen['base64'])
+        else:
+            content = chosen.get('text', '').encode('utf-8')
+        return {'status': chosen['status'], 'headers': dict(chosen.get('headers', {})), 'content': content}
+
+
+def build_response(request: requests.PreparedRequest, status: int, headers: Mapping[str, str], content: bytes) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status
+    response.reason = 'OK' if status == 200 else 'Replayed'
+    response.headers = CaseInsensitiveDict(headers)
+    response._content = content
+    response.encoding = get_encoding_from_headers(response.headers)
+    response.url = request.url
+    response.request = request
+    return response
+
+
+class RecordingAdapter(BaseAdapter):
+    """Sends through the adapter it wraps and saves every response into a FixtureStore."""
+
+    def __init__(self, inner: BaseAdapter, store: FixtureStore) -> None:
+        super().__init__()
+        self.inner = inner
+        self.store = store
+
+    def send(self, request: requests.PreparedRequest, **kwargs: Any) -> requests.Response:
+        response = self.inner.send(request, **kwargs)
+        vary = {name: request.headers.get(name) for name in VARY_HEADERS}
+        self.store.add(request.method, request.url, response.status_code, response.content,
+                       headers=response.headers, vary=vary)
+        return response
+
+    def close(self) -> None:
+        self.inner.close()
+
+
+class ReplayAdapter(BaseAdapter):
+    """
+    Answers every request from a FixtureStore, optionally after `latency`
+    seconds and with `error_rate` of the responses replaced by ERROR_STATUS.
+    Requests that were never recorded raise ConnectionError.
+    """
+
+    def __init__(self, store: FixtureStore, latency: float = 0.0, error_rate: float = 0.0, seed: Optional[int] = None) -> None:
+        super().__init__()
+        self.store = store
+        self.latency = latency
+        self.error_rate = error_rate
+        self._random = random.Random(seed)
+
+    def send(self, request: requests.PreparedRequest, **kwargs: Any) -> requests.Response:
+        if self.latency:
+            time.sleep(self.latency)
+        if self.error_rate and self._random.random() < self.error_rate:
+            return build_response(request, ERROR_STATUS, {'Retry-After': '0'}, b'')
+        recorded = self.store.match(request.method, request.url, request.headers)
+        if recorded is None:
+            raise requests.ConnectionError(f"No recorded response for {request.method} {request.url}", request=request)
+        return build_response(request, recorded['status'], recorded['headers'], recorded['content'])
+
+    def close(self) -> None:
+        pass
+
+
+def server_url_for(base_url: str, url: str) -> str:
+    """`url` as served by fixture_server.py at `base_url`: /<scheme>/<host>/<path>?<query>."""
+    parts = urllib.parse.urlsplit(url)
+    path = f"{base_url.rstrip('/')}/{parts.scheme}/{parts.netloc}{parts.path or '/'}"
+    return f'{path}?{parts.query}' if parts.query else path
+
+
+def original_url(path: str) -> Optional[str]:
+    """Inverse of `server_url_for` for the path (and query) a fixture server received."""
+    parts = urllib.parse.urlsplit(path)
+    segments = parts.path.lstrip('/').split('/', 2)
+    if len(segments) < 2 or segments[0] not in ('http', 'https'):
+        return None
+    url = f"{segments[0]}://{segments[1]}/{segments[2] if len(segments) > 2 else ''}"
+    return f'{url}?{parts.query}' if parts.query else url
+
+
+class ServerAdapter(BaseAdapter):
+    """
+    Rewrites every request to a local fixture server and sends it through
+    the adapter it wraps, so retries, pooling and conditional GETs run as
+    they do against the real sites.
+    """
+
+    def __init__(self, inner: BaseAdapter, base_url: str) -> None:
+        super().__init__()
+        self.inner = inner
+        self.base_url = base_url
+
+    def send(self, request: requests.PreparedRequest, **kwargs: Any) -> requests.Response:
+        original = request.url
+        request.url = server_url_for(self.base_url, original)
+        try:
+            response = self.inner.send(request, **kwargs)
+        finally:
+            request.url = original
+        response.url = original
+        return response
+
+    def close(self) -> None:
+        self.inner.close()
+
+
+def install_transport(session: requests.Session, transport: Optional[str] = None) -> None:
+    """
+    Route `session` through the configured transport (see TRANSPORTS,
+    `configure` and the NEPSE_HTTP_* environment variables). A no-op for
+    'live', which is the default.
+    """
+    transport = transport or DEFAULT_TRANSPORT
+    if transport == 'live':
+        return
+    if transport not in TRANSPORTS:
+        raise ValueError(f"Unknown HTTP transport '{transport}'. Use one of {TRANSPORTS}.")
+    if transport in ('record', 'replay') and not DEFAULT_FIXTURE_DIR:
+        raise ValueError(f"The '{transport}' transport needs a fixture directory (NEPSE_HTTP_FIXTURES).")
+
+    for prefix in ('https://', 'http://'):
+        inner = session.adapters.get(prefix) or HTTPAdapter()
+        if transport == 'record':
+            adapter: BaseAdapter = RecordingAdapter(inner, fixture_store(DEFAULT_FIXTURE_DIR))
+        elif transport == 'replay':
+            adapter = ReplayAdapter(fixture_store(DEFAULT_FIXTURE_DIR), latency=DEFAULT_LATENCY,
+                                    error_rate=DEFAULT_ERROR_RATE)
+        else:
+            adapter = ServerAdapter(inner, DEFAULT_SERVER_URL)
+        session.mount(prefix, adapter)
+
+
+_stores: Dict[str, FixtureStore] = {}
+_stores_lock = threading.Lock()
+
+
+def fixture_store(directory: str) -> FixtureStore:
+    """Process-wide FixtureStore of `directory`, so replay order is shared by all sessions."""
+    key = os.path.abspath(directory)
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            store = _stores[key] = FixtureStore(directory)
+        return store
@@ -0,0 +1,271 @@
+import base64
+import contextlib
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+from .endpoints import api_dict
+from .session_cache import atomic_write_json, get_cache_dir
+
+logger = logging.getLogger(__name__)
+
+NEPAL_TZ = timezone(timedelta(hours=5, minutes=45))
+# NEPSE trades Sunday to Thursday; the pre-open session starts at 10:30 and
+# continuous trading ends at 15:00 Nepal time. Public holidays are not known
+# here, so they are treated like trading days (shorter TTLs, never staler data).
+TRADING_WEEKDAYS = (6, 0, 1, 2, 3)
+MARKET_OPEN_TIME = (10, 30)
+MARKET_CLOSE_TIME = (15, 0)
+
+# (endpoint name, request digest)
+CacheKey = Tuple[str, str]
+
+
+def _nepal_now(now: Optional[datetime] = None) -> datetime:
+    if now is None:
+        return datetime.now(NEPAL_TZ)
+    if now.tzinfo is None:
+        now = now.replace(tzinfo=timezone.utc)
+    return now.astimezone(NEPAL_TZ)
+
+
+def is_market_hours(now: Optional[datetime] = None) -> bool:
+    """True between the pre-open and the close of a NEPSE trading day."""
+    local = _nepal_now(now)
+    if local.weekday() not in TRADING_WEEKDAYS:
+        return False
+    return MARKET_OPEN_TIME <= (local.hour, local.minute) < MARKET_CLOSE_TIME
+
+
+def seconds_until_market_open(now: Optional[datetime] = None) -> float:
+    """Seconds until the next pre-open, or 0 while the market is open."""
+    local = _nepal_now(now)
+    if is_market_hours(local):
+        return 0.0
+    candidate = local.replace(hour=MARKET_OPEN_TIME[0], minute=MARKET_OPEN_TIME[1], second=0, microsecond=0)
+    if candidate <= local:
+        candidate += timedelta(days=1)
+    while candidate.weekday() not in TRADING_WEEKDAYS:
+        candidate += timedelta(days=1)
+    return (candidate - local).total_seconds()
+
+
+class MemoryCache:
+    """Thread-safe in-process LRU cache of response entries."""
+
+    def __init__(self, max_entries: int = 512) -> None:
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                return None
+            expires_at, entry = item
+            if time.time() >= expires_at:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: str, entry: Dict[str, Any], ttl: float) -> None:
+        with self._lock:
+            self._entries[key] = (time.time() + ttl, entry)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class DiskCache:
+    """
+    Response entries stored as one JSON file per request under the cache
+    directory, so they survive across processes. Expired files are removed
+    when read or by `prune()`.
+    """
+
+    def __init__(self, directory: Optional[str] = None) -> None:
+        self.directory = directory or os.path.join(get_cache_dir(), 'responses')
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], key + '.json')
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                stored = json.load(f)
+            if time.time() >= stored['expires_at']:
+                with contextlib.suppress(OSError):
+                    os.remove(path)
+                return None
+            entry = stored['entry']
+            return {**entry, 'content': base64.b64decode(entry['content'])}
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def set(self, key: str, entry: Dict[str, Any], ttl: float) -> None:
+        path = self._path(key)
+        stored = {
+            'expires_at': time.time() + ttl,
+            'entry': {**entry, 'content': base64.b64encode(entry['content']).decode('ascii')},
+        }
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            atomic_write_json(path, stored)
+        except OSError as e:
+            logger.warning(f"Could not write response cache entry {path}: {e}")
+
+    def prune(self) -> int:
+        """Delete expired entries. Returns the number of files removed."""
+        removed = 0
+        now = time.time()
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if not name.endswith('.json'):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    with open(path, 'r', encoding='utf-8') as f:
+                        expired = now >= json.load(f)['expires_at']
+                except (OSError, ValueError, KeyError, TypeError):
+                    expired = True
+                if expired:
+                    with contextlib.suppress(OSError):
+                        os.remove(path)
+                        removed += 1
+        return removed
+
+    def clear(self) -> None:
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if name.endswith('.json'):
+                    with contextlib.suppress(OSError):
+                        os.remove(os.path.join(root, name))
+
+
+class ResponseCache:
+    """
+    Cache of successful NEPSE responses, consulted by the API sessions before
+    they hit the network.
+
+    Only endpoints with a `ttl` in `api_dict` (or registered via `set_ttl`)
+    are cached. A TTL is a `(seconds while the market is open, seconds while
+    it is closed)` pair; entries stored while the market is closed never
+    outlive the next pre-open. Generated POST payloads are keyed by their
+    payload type rather than the daily payload ID.
+    """
+
+    def __init__(self, backend: Any = None, endpoints: Optional[Mapping[str, Dict[str, Any]]] = None) -> None:
+        self.backend = backend if backend is not None else MemoryCache()
+        self._routes: Dict[Tuple[str, str], str] = {}
+        self._ttls: Dict[str, Tuple[float, float]] = {}
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, int]] = {}
+        for name, endpoint in (endpoints if endpoints is not None else api_dict).items():
+            if endpoint.get('ttl'):
+                self.set_ttl(name, endpoint['api'], endpoint['method'], endpoint['ttl'])
+
+    def set_ttl(self, name: str, path: str, method: str, ttl: Optional[Tuple[float, float]]) -> None:
+        """Cache `method path` (and sub-paths such as `/{id}`) for `ttl`; `None` disables it."""
+        route = (method.upper(), path.rstrip('/'))
+        if ttl is None:
+            self._routes.pop(route, None)
+            self._ttls.pop(name, None)
+        else:
+            self._routes[route] = name
+            self._ttls[name] = (float(ttl[0]), float(ttl[1]))
+
+    def _match(self, method: str, path: str) -> Optional[str]:
+        # Longest registered prefix wins, so `/api/nots/security/profile/12`
+        # maps to `ticker_contact_api` rather than `security`.
+        candidate = path.split('?', 1)[0].rstrip('/')
+        while candidate:
+            name = self._routes.get((method, candidate))
+            if name is not None:
+                return name
+            if '/' not in candidate:
+                break
+            candidate = candidate.rsplit('/', 1)[0]
+        return None
+
+    def key_for(
+        self,
+        method: str,
+        path: str,
+        params: Optional[Dict] = None,
+        payload: Optional[Dict] = None,
+        which_payload: Optional[str] = None,
+    ) -> Optional[CacheKey]:
+        """Return the cache key for a request, or None if its endpoint is not cached."""
+        method = method.upper()
+        name = self._match(method, path)
+        if name is None:
+            return None
+        clean_params = {k: v for k, v in (params or {}).items() if v is not None}
+        request = [method, path, clean_params, payload, which_payload if payload is None else None]
+        digest = hashlib.sha256(json.dumps(request, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+        return name, digest
+
+    def ttl_for(self, name: str, now: Optional[datetime] = None) -> float:
+        open_ttl, closed_ttl = self._ttls.get(name, (0.0, 0.0))
+        if is_market_hours(now):
+            return open_ttl
+        return min(closed_ttl, max(seconds_until_market_open(now), open_ttl))
+
+    def _count(self, name: str, field: str) -> None:
+        with self._lock:
+            counters = self._stats.setdefault(name, {'hits': 0, 'misses': 0, 'stores': 0})
+            counters[field] += 1
+
+    def get(self, key: CacheKey) -> Optional[Dict[str, Any]]:
+        """Return the cached entry (`status`, `headers`, `content`, `url`) or None."""
+        name, digest = key
+        entry = self.backend.get(digest)
+        self._count(name, 'hits' if entry is not None else 'misses')
+        if entry is not None:
+            logger.debug(f"Response cache hit for '{name}'.")
+        return entry
+
+    def put(self, key: CacheKey, status: int, headers: Mapping[str, str], content: bytes, url: str) -> None:
+        name, digest = key
+        entry = {
+            'status': status,
+            'headers': {k: v for k, v in headers.items() if k.lower() in ('content-type', 'etag', 'last-modified', 'date')},
+            'content': content,
+            'url': url,
+        }
+        ttl = self.ttl_for(name)
+        if ttl <= 0:
+            return
+        self.backend.set(digest, entry, ttl)
+        self._count(name, 'stores')
+
+    def clear(self) -> None:
+        self.backend.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss/store counters, in total and per endpoint."""
+        with self._lock:
+            by_endpoint = {name: dict(counters) for name, counters in self._stats.items()}
+        hits = sum(c['hits'] for c in by_endpoint.values())
+        misses = sum(c['misses'] for c in by_endpoint.values())
+        return {
+            'hits': hits,
+            'misses': misses,
+            'stores': sum(c['stores'] for c in by_endpoint.values()),
+            'hit_rate': hits / (hits + misses) if hits + misses else 0.0,
+            'by_endpoint': by_endpoint,
+        }
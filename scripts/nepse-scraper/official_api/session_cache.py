@@ -0,0 +1,172 @@
+import base64
+import contextlib
+import json
+import logging
+import os
+import tempfile
+import time
+from datetime import date
+from typing import Any, Dict, Iterator, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to atomic replace without an inter-process lock.
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# NEPSE does not document token lifetimes; tokens have been observed to stay
+# valid for roughly a minute. Used only when the token carries no JWT `exp`.
+# 45 s leaves room for clock skew and the requests of a stage that picks the
+# token up near its end; a longer TTL mostly buys a 401 and a re-authentication.
+# Overridable with NEPSE_TOKEN_TTL (seconds).
+DEFAULT_TOKEN_TTL = float(os.environ.get('NEPSE_TOKEN_TTL', '45') or 45)
+CACHE_FILE = 'session.json'
+
+
+def get_cache_dir() -> str:
+    """Directory for on-disk caches, overridable with NEPSE_CACHE_DIR."""
+    cache_dir = os.environ.get('NEPSE_CACHE_DIR')
+    if not cache_dir:
+        base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+        cache_dir = os.path.join(base, 'nepse-scraper')
+    os.makedirs(cache_dir, exist_ok=True)
+    return cache_dir
+
+
+def atomic_write_json(path: str, data: Any) -> None:
+    """Write JSON to a sibling temp file and rename it over `path`."""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix='.' + os.path.basename(path) + '.', suffix='.tmp', dir=directory)
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.remove(tmp_path)
+        raise
+
+
+def _jwt_expiry(token: str) -> Optional[float]:
+    """Return the `exp` claim of a JWT, or None when the token is not a JWT."""
+    parts = token.split('.')
+    if len(parts) != 3:
+        return None
+    try:
+        padded = parts[1] + '=' * (-len(parts[1]) % 4)
+        claims = json.loads(base64.urlsafe_b64decode(padded))
+        return float(claims['exp'])
+    except (ValueError, KeyError, TypeError):
+        return None
+
+
+class SessionCache:
+    """
+    On-disk cache of the NEPSE access token, token details and market-open ID.
+
+    Lets processes reuse another one's authentication instead of calling
+    `/api/authenticate/prove` and `market-open` again. The market-open ID is
+    kept for the day, so every run after the first skips that call. The
+    token only outlives its process by `token_ttl` (about a minute on
+    NEPSE's side), so only runs that overlap on one machine share it; it
+    does not survive the ~30 minute gap between scheduled runs.
+    Writes go through an atomic rename under an advisory lock, and a process
+    never replaces a newer token written by another one.
+    """
+
+    def __init__(self, path: Optional[str] = None, token_ttl: float = DEFAULT_TOKEN_TTL) -> None:
+        self.path = path or os.path.join(get_cache_dir(), CACHE_FILE)
+        self.token_ttl = token_ttl
+
+    @contextlib.contextmanager
+    def _locked(self) -> Iterator[None]:
+        if fcntl is None:
+            yield
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with open(self.path + '.lock', 'a') as lock_file:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+    def _read(self) -> Dict[str, Any]:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    def load_token(self) -> Optional[Dict[str, Any]]:
+        """Return `{'access_token', 'token_details'}` if a still-valid token is cached."""
+        data = self._read()
+        token = data.get('access_token')
+        if not token or not isinstance(data.get('token_details'), dict):
+            return None
+        if time.time() >= data.get('expires_at', 0):
+            logger.debug("Cached NEPSE token has expired.")
+            return None
+        logger.debug("Using NEPSE token from the session cache.")
+        return {'access_token': token, 'token_details': data['token_details']}
+
+    def load_market_open_id(self) -> Optional[int]:
+        """Return today's cached market-open ID, if any."""
+        data = self._read()
+        if data.get('market_open_date') != date.today().isoformat():
+            return None
+        return data.get('market_open_id')
+
+    def save_token(self, access_token: str, token_details: Dict[str, Any]) -> None:
+        obtained_at = time.time()
+        expires_at = _jwt_expiry(access_token) or obtained_at + self.token_ttl
+        try:
+            with self._locked():
+                data = self._read()
+                if data.get('obtained_at', 0) > obtained_at:
+                    # Another process stored a fresher token in the meantime.
+                    return
+                data.update({
+                    'access_token': access_token,
+                    'token_details': token_details,
+                    'obtained_at': obtained_at,
+                    'expires_at': expires_at,
+                })
+                atomic_write_json(self.path, data)
+        except OSError as e:
+            logger.warning(f"Could not write NEPSE session cache {self.path}: {e}")
+
+    def save_market_open_id(self, market_open_id: int) -> None:
+        try:
+            with self._locked():
+                data = self._read()
+                data.update({
+                    'market_open_id': market_open_id,
+                    'market_open_date': date.today().isoformat(),
+                })
+                atomic_write_json(self.path, data)
+        except OSError as e:
+            logger.warning(f"Could not write NEPSE session cache {self.path}: {e}")
+
+    def invalidate(self, access_token: Optional[str] = None) -> None:
+        """
+        Drop the cached token and market-open ID. When `access_token` is given,
+        only drop them if it is still the cached token, so a token refreshed by
+        another process survives.
+        """
+        try:
+            with self._locked():
+                data = self._read()
+                if access_token is not None and data.get('access_token') != access_token:
+                    return
+                for key in ('access_token', 'token_details', 'obtained_at', 'expires_at',
+                            'market_open_id', 'market_open_date'):
+                    data.pop(key, None)
+                atomic_write_json(self.path, data)
+                logger.info("Invalidated cached NEPSE token.")
+        except OSError as e:
+            logger.warning(f"Could not update NEPSE session cache {self.path}: {e}")
@@ -4,16 +4,31 @@ import json
 import argparse
 import subprocess
 from datetime import datetime, timedelta
-import urllib.parse
-import re
 import requests
-from bs4 import BeautifulSoup
 
 # Add the current directory to path to find official_api
 sys.path.append(os.path.dirname(__file__))
 
-from official_api import NepseScraper
+from official_api import NepseScraper, SessionCache, ValidatorStore
+from official_api.conditional import is_not_modified, mount_conditional
+from columnar import write_columnar
+import json_writer
+from json_writer import write_json_atomic
 from open_ended_mutual_fund_scraper import scrape_and_save_open_ended_navs
+from enrichment import (
+    COMPANY_DISCLOSURE_PIPELINE,
+    EXCHANGE_MESSAGE_PIPELINE,
+    EnrichmentPipeline,
+    document_file_urls,
+    record_file_url,
+    symbol_from,
+)
+from output_manifest import OutputManifest
+from price_transform import map_omf_rows, map_today_prices
+from sectors import parse_sector_codes
+from segment_store import SegmentStore
+from stage_runner import StageRunner
+from text_utils import normalize_text
 
 def get_file_last_commit_date(filepath):
     """Get the datetime of the last git commit for a specific file."""
@@ -62,47 +77,7 @@ def build_omf_rows_for_nepse_data(data_dir, omf_items=None):
     if not omf_items:
         return []
 
-    mapped = []
-    for item in omf_items:
-        if not isinstance(item, dict):
-            continue
-
-        symbol = item.get('symbol')
-        name = item.get('fund_name')
-        if not symbol or not name:
-            continue
-
-        ltp = item.get('daily_nav')
-        previous_close = item.get('weekly_nav')
-        change = (
-            round(ltp - previous_close, 2)
-            if isinstance(ltp, (int, float)) and isinstance(previous_close, (int, float))
-            else 0
-        )
-        percent_change = (
-            round((change / previous_close) * 100, 2)
-            if isinstance(previous_close, (int, float)) and previous_close != 0
-            else 0
-        )
-
-        mapped.append({
-            "symbol": symbol,
-            "name": name,
-            "ltp": ltp,
-            "previous_close": previous_close,
-            "change": change,
-            "percent_change": percent_change,
-            "high": None,
-            "low": None,
-            "volume": None,
-            "turnover": None,
-            "trades": None,
-            "last_updated": item.get('daily_nav_date') or item.get('scraped_at'),
-            "market_cap": item.get('fund_size'),
-            "asset_type": "open_ended_mutual_fund"
-        })
-
-    return mapped
+    return map_omf_rows(omf_items)
 
 def refresh_omf_data(data_dir):
     """
@@ -119,11 +94,11 @@ def refresh_omf_data(data_dir):
 
 def write_json_if_changed(filepath, data):
     """Write JSON only if content differs or file does not exist."""
-    existing = load_json_object(filepath)
-    if existing == data:
+    manifest = OutputManifest.for_directory(os.path.dirname(filepath))
+    if manifest.is_unchanged(filepath, data):
         return False
-    with open(filepath, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=4)
+    write_json_atomic(filepath, data)
+    manifest.record(filepath, data)
     return True
 
 def merge_records_by_id(existing_records, incoming_records):
@@ -161,50 +136,13 @@ def merge_records_by_id(existing_records, incoming_records):
 
     return [merged_by_id[key] for key in order]
 
-def _normalize_text(value):
-    """Normalize text for safe duplicate comparisons."""
-    return ' '.join(str(value or '').split()).strip().lower()
-
-def build_file_url(file_path):
-    """Construct the full, valid download URL for a NEPSE attachment path."""
-    if not file_path:
-        return None
-    file_path = str(file_path)
-    if file_path.startswith('http://') or file_path.startswith('https://'):
-        return file_path
-    base_url = "https://www.nepalstock.com.np/api/nots/security/fetchFiles?fileLocation="
-    encoded_path = urllib.parse.quote(file_path, safe="/%")
-    return base_url + encoded_path
-
 def add_file_urls_to_company_disclosures(records):
     """Attach fileUrl to each document entry in company disclosures."""
-    if not isinstance(records, list):
-        return records
-    for record in records:
-        if not isinstance(record, dict):
-            continue
-        documents = record.get('applicationDocumentDetailsList')
-        if not isinstance(documents, list):
-            continue
-        for doc in documents:
-            if not isinstance(doc, dict):
-                continue
-            file_url = build_file_url(doc.get('filePath'))
-            if file_url:
-                doc['fileUrl'] = file_url
-    return records
+    return EnrichmentPipeline(document_file_urls)(records)
 
 def add_file_urls_to_exchange_messages(records):
     """Attach fileUrl to each exchange message when filePath is present."""
-    if not isinstance(records, list):
-        return records
-    for record in records:
-        if not isinstance(record, dict):
-            continue
-        file_url = build_file_url(record.get('filePath'))
-        if file_url:
-            record['fileUrl'] = file_url
-    return records
+    return EnrichmentPipeline(record_file_url)(records)
 
 def _parse_datetime(value):
     """Parse a date/time string to a datetime; fallback to datetime.min."""
@@ -215,19 +153,24 @@ def _parse_datetime(value):
     except Exception:
         return datetime.min
 
+COMPANY_DISCLOSURE_DATE_KEYS = ('addedDate', 'modifiedDate', 'approvedDate')
+EXCHANGE_MESSAGE_DATE_KEYS = ('addedDate', 'modifiedDate', 'approvedDate', 'expiryDate')
+
+def disclosure_date(item, date_keys):
+    """Date of a disclosure: the first of `date_keys` that is set, else datetime.min."""
+    if not isinstance(item, dict):
+        return datetime.min
+    for key in date_keys:
+        value = item.get(key)
+        if value:
+            return _parse_datetime(value)
+    return datetime.min
+
 def sort_disclosures_latest_first(records, date_keys):
     """Sort disclosures so newest entries appear first."""
     if not isinstance(records, list):
         return records
-    def sort_key(item):
-        if not isinstance(item, dict):
-            return datetime.min
-        for key in date_keys:
-            value = item.get(key)
-            if value:
-                return _parse_datetime(value)
-        return datetime.min
-    records.sort(key=sort_key, reverse=True)
+    records.sort(key=lambda item: disclosure_date(item, date_keys), reverse=True)
     return records
 
 def sort_notices_latest_first(records):
@@ -249,65 +192,24 @@ def sort_notices_latest_first(records):
     records.sort(key=sort_key, reverse=True)
     return records
 
-def _collect_record_ids(records):
-    """Collect numeric/string IDs from a list of records."""
-    if not isinstance(records, list):
-        return set()
-    return {
-        str(item.get('id'))
-        for item in records
-        if isinstance(item, dict) and item.get('id') is not None
-    }
+def record_id_key(record):
+    """Manifest key of a record: its `id` as a string, or None when it has none."""
+    if isinstance(record, dict) and record.get('id') is not None:
+        return str(record.get('id'))
+    return None
 
-def filter_new_records(existing_records, incoming_records):
-    """Return only incoming records whose IDs are not in existing records."""
-    existing_ids = _collect_record_ids(existing_records)
-    if not isinstance(incoming_records, list):
-        return []
-    return [
-        item for item in incoming_records
-        if isinstance(item, dict)
-        and item.get('id') is not None
-        and str(item.get('id')) not in existing_ids
-    ]
-
-def extract_symbol_from_title(title):
-    """Extract ticker symbol from a title like '[SYMBOL]' or '(SYMBOL)'."""
-    if not title:
-        return ""
-    match = re.search(r'\[([A-Za-z0-9]+)\]', str(title))
-    if match:
-        return match.group(1).upper()
-    match = re.search(r'\(([A-Za-z0-9]+)\)', str(title))
-    if match:
-        return match.group(1).upper()
-    return ""
+def general_notices_of(notices_file):
+    """The record list inside notices.json."""
+    general = notices_file.get('general') if isinstance(notices_file, dict) else None
+    return general if isinstance(general, list) else []
 
 def add_symbols_to_company_disclosures(records):
     """Add `symbol` field to company disclosures for easier filtering."""
-    if not isinstance(records, list):
-        return records
-    for record in records:
-        if not isinstance(record, dict):
-            continue
-        title = record.get('newsHeadline') or record.get('messageTitle') or ""
-        symbol = extract_symbol_from_title(title)
-        if symbol:
-            record['symbol'] = symbol
-    return records
+    return EnrichmentPipeline(symbol_from('newsHeadline', 'messageTitle'))(records)
 
 def add_symbols_to_exchange_messages(records):
     """Add `symbol` field to exchange messages for easier filtering."""
-    if not isinstance(records, list):
-        return records
-    for record in records:
-        if not isinstance(record, dict):
-            continue
-        title = record.get('messageTitle') or record.get('newsHeadline') or ""
-        symbol = extract_symbol_from_title(title)
-        if symbol:
-            record['symbol'] = symbol
-    return records
+    return EnrichmentPipeline(symbol_from('messageTitle', 'newsHeadline'))(records)
 
 def filter_general_notices(general_notices, exchange_messages):
     """
@@ -326,8 +228,8 @@ def filter_general_notices(general_notices, exchange_messages):
     }
     exchange_title_body = {
         (
-            _normalize_text(item.get('messageTitle')),
-            _normalize_text(item.get('messageBody'))
+            normalize_text(item.get('messageTitle')),
+            normalize_text(item.get('messageBody'))
         )
         for item in exchanges
         if isinstance(item, dict)
@@ -342,8 +244,8 @@ def filter_general_notices(general_notices, exchange_messages):
 
         notice_id = notice.get('id')
         notice_key = (
-            _normalize_text(notice.get('noticeHeading')),
-            _normalize_text(notice.get('noticeBody'))
+            normalize_text(notice.get('noticeHeading')),
+            normalize_text(notice.get('noticeBody'))
         )
 
         is_exchange_duplicate = (
@@ -361,316 +263,336 @@ def filter_general_notices(general_notices, exchange_messages):
         print(f"Filtered out {removed_count} exchange-derived records from notices.")
     return filtered
 
-def get_sector_wise_codes():
-    """Scrape sector-wise company codes from MeroLagani."""
+def get_sector_wise_codes(output_path=None):
+    """
+    Scrape sector-wise company codes from MeroLagani. Returns None when the
+    company list is unchanged since the last run and `output_path` exists.
+    """
     url = "https://merolagani.com/CompanyList.aspx"
     try:
-        response = requests.get(url, headers={'User-Agent': 'Mozilla/5.0'}, timeout=30)
+        session = requests.Session()
+        # Revalidates with ETag / Last-Modified instead of re-downloading the page.
+        mount_conditional(session)
+        response = session.get(url, headers={'User-Agent': 'Mozilla/5.0'}, timeout=30)
         response.raise_for_status()
 
-        soup = BeautifulSoup(response.content, 'html.parser')
+        if is_not_modified(response) and output_path and os.path.exists(output_path):
+            print("Company list unchanged since the last run; keeping the saved sector codes.")
+            return None
 
-        sectors = {}
-        accordion_toggles = soup.find_all('a', href=re.compile(r'#collapse_\d+'))
+        return parse_sector_codes(response.content)
 
-        for toggle in accordion_toggles:
-            sector_name = toggle.get_text(strip=True)
-            target_id = toggle['href'].replace('#', '')
-            content_div = soup.find(id=target_id)
+    except Exception as e:
+        print(f"Error fetching sector-wise codes: {e}")
+        return None
 
-            if not content_div:
+def write_json(data_dir, filename, data):
+    """Write a JSON output file into the data directory."""
+    write_json_atomic(os.path.join(data_dir, filename), data)
+
+def stage_market_status(scraper, data_dir):
+    """Authenticate the shared session and record whether the market is open."""
+    print("Checking market status...")
+    is_open = scraper.is_market_open()
+    write_json(data_dir, 'market_status.json', {
+        "is_open": is_open,
+        "last_checked": datetime.now().isoformat()
+    })
+    return is_open
+
+def stage_nepse_data(data_dir, raw_prices, omf_snapshot):
+    """Combine NEPSE prices with OMF rows and write nepse_data.json."""
+    mapped_prices = map_today_prices(raw_prices)
+
+    # Include open-ended mutual funds collected from Sharesansar OMF.json.
+    # Use fresh in-memory snapshot when available.
+    omf_rows = build_omf_rows_for_nepse_data(data_dir, omf_items=omf_snapshot)
+    if omf_rows:
+        seen_symbols = {row.get('symbol') for row in mapped_prices if isinstance(row, dict)}
+        appended = 0
+        for row in omf_rows:
+            symbol = row.get('symbol')
+            if symbol in seen_symbols:
                 continue
+            mapped_prices.append(row)
+            seen_symbols.add(symbol)
+            appended += 1
+        print(f"Added {appended} open-ended mutual fund rows to nepse_data.json.")
+    else:
+        print("No OMF rows found. nepse_data.json will include only NEPSE official price rows.")
+
+    mapped_prices.sort(key=lambda x: str(x.get('symbol', '')))
+    write_json(data_dir, 'nepse_data.json', mapped_prices)
+    # Same rows, one array per field, for consumers that load it into NumPy.
+    write_columnar(os.path.join(data_dir, 'nepse_data.columns.json'), mapped_prices)
+    return len(mapped_prices)
+
+def stage_sector_codes(data_dir):
+    """Refresh nepse_sector_wise_codes.json from MeroLagani when it changed."""
+    print("Fetching sector-wise company codes...")
+    sector_codes_path = os.path.join(data_dir, 'nepse_sector_wise_codes.json')
+    sector_wise_codes = get_sector_wise_codes(output_path=sector_codes_path)
+    if isinstance(sector_wise_codes, dict) and sector_wise_codes:
+        if write_json_if_changed(sector_codes_path, sector_wise_codes):
+            print("Updated sector-wise codes.")
+        else:
+            print("Sector-wise codes unchanged. Keeping existing file.")
+    else:
+        print("No new sector-wise data (unchanged or error). Keeping existing file unchanged.")
 
-            table = content_div.find('table')
-            companies = []
-
-            if table:
-                rows = table.find_all('tr')
-                for row in rows:
-                    cols = row.find_all('td')
-                    if len(cols) >= 2:
-                        symbol_link = cols[0].find('a')
-                        symbol = symbol_link.get_text(strip=True) if symbol_link else cols[0].get_text(strip=True)
-
-                        name = cols[1].get_text(strip=True)
-                        name = " ".join(name.split())
-
-                        if symbol and name:
-                            companies.append({
-                                "symbol": symbol,
-                                "name": name
-                            })
-            else:
-                company_links = content_div.find_all('a', href=re.compile(r'CompanyDetail\.aspx\?symbol='))
-                for link in company_links:
-                    href = link.get('href', '')
-                    match = re.search(r'symbol=([a-zA-Z0-9.]+)', href, re.IGNORECASE)
-                    if match:
-                        symbol = match.group(1)
-                        companies.append({
-                            "symbol": symbol,
-                            "name": symbol
-                        })
-
-            if companies:
-                sectors[sector_name] = companies
-
-        return sectors
+def stage_top_stock(scraper, category):
+    """Fetch one top-stock category, defaulting to an empty list on failure."""
+    try:
+        return scraper.get_top_stocks(category, show_all=True)
+    except Exception:
+        return []
 
-    except Exception as e:
-        print(f"Error fetching sector-wise codes: {e}")
-        return None
+def open_disclosure_store(data_dir, name, date_keys, enrich):
+    """
+    Segment store of data/segments/<name>/. On first use it is seeded from
+    the existing data/<name>.json history.
+    """
+    store = SegmentStore(
+        os.path.join(data_dir, 'segments', name),
+        record_id_key,
+        lambda item: disclosure_date(item, date_keys)
+    )
+    if store.is_empty():
+        history = load_json_list(os.path.join(data_dir, f'{name}.json'))
+        if history:
+            store.upsert(history, prepare=enrich)
+            print(f"Seeded segment store '{name}' with {len(history)} records.")
+    return store
+
+def has_new_records(store, records):
+    """True if any of `records` has an id the store does not hold yet."""
+    for record in records:
+        key = record_id_key(record)
+        if key is not None and key not in store:
+            return True
+    return False
+
+def stage_disclosures(data_dir, disclosure_data):
+    """
+    Append fetched disclosures to the segmented history under data/segments/.
+    Only new or updated records are enriched and only the monthly segments
+    they fall into are rewritten; disclosures.json and exchange_messages.json
+    are then spliced together from the segments of the stores that gained
+    records. Returns the exchange message store for stage_notices, which
+    reads it only if it has new notices to filter.
+    """
+    company_disclosures = disclosure_data.get('companyNews', [])
+    exchange_messages = disclosure_data.get('exchangeMessages', [])
+
+    incoming_company_disclosures = company_disclosures if isinstance(company_disclosures, list) else []
+    incoming_exchange_messages = exchange_messages if isinstance(exchange_messages, list) else []
+
+    company_store = open_disclosure_store(
+        data_dir, 'disclosures', COMPANY_DISCLOSURE_DATE_KEYS, COMPANY_DISCLOSURE_PIPELINE
+    )
+    exchange_store = open_disclosure_store(
+        data_dir, 'exchange_messages', EXCHANGE_MESSAGE_DATE_KEYS, EXCHANGE_MESSAGE_PIPELINE
+    )
+
+    new_company_disclosures = update_disclosure_view(
+        company_store, incoming_company_disclosures, COMPANY_DISCLOSURE_PIPELINE,
+        os.path.join(data_dir, 'disclosures.json')
+    )
+    new_exchange_messages = update_disclosure_view(
+        exchange_store, incoming_exchange_messages, EXCHANGE_MESSAGE_PIPELINE,
+        os.path.join(data_dir, 'exchange_messages.json')
+    )
+
+    if new_company_disclosures or new_exchange_messages:
+        print(
+            "New disclosures found: "
+            f"{len(new_company_disclosures)} company disclosures, "
+            f"{len(new_exchange_messages)} exchange messages."
+        )
+    else:
+        print("No new disclosures found. Keeping existing disclosure files unchanged.")
+    return exchange_store
+
+def update_disclosure_view(store, incoming, enrich, view_path):
+    """
+    Upsert `incoming` into `store` if it holds records the store has not
+    seen, and rewrite the view at `view_path` from the segments when records
+    were added (or the view is missing). Returns the new records.
+    """
+    new_records = store.upsert(incoming, prepare=enrich) if has_new_records(store, incoming) else []
+    if new_records or not os.path.exists(view_path):
+        # Segments are already sorted newest first, so the view is a plain concatenation.
+        store.write_view(view_path)
+    return new_records
+
+def stage_notices(data_dir, general_notices, exchange_store):
+    """
+    Merge general notices (minus exchange messages) into notices.json.
+    The exchange messages are read from `exchange_store` (the SegmentStore
+    returned by stage_disclosures), or from exchange_messages.json when it is
+    None, and only if there are new notices to filter.
+    """
+    notices_path = os.path.join(data_dir, 'notices.json')
+    manifest = OutputManifest.for_directory(data_dir)
+
+    incoming = general_notices if isinstance(general_notices, list) else []
+    candidates = manifest.new_records(notices_path, incoming, record_id_key, records_of=general_notices_of)
+    new_general_notices = []
+    incoming_general_notices = []
+    if candidates:
+        # Filtered once; the new notices are the candidates that survive it.
+        if exchange_store is not None:
+            exchange_messages = exchange_store.records()
+        else:
+            exchange_messages = load_json_list(os.path.join(data_dir, 'exchange_messages.json'))
+        incoming_general_notices = filter_general_notices(incoming, exchange_messages)
+        candidate_keys = {record_id_key(notice) for notice in candidates}
+        new_general_notices = [
+            notice for notice in incoming_general_notices if record_id_key(notice) in candidate_keys
+        ]
+
+    if new_general_notices:
+        existing_general_notices = general_notices_of(load_json_object(notices_path))
+        merged_general_notices = merge_records_by_id(existing_general_notices, incoming_general_notices)
+        merged_general_notices = sort_notices_latest_first(merged_general_notices)
+
+        # Keep notices file dedicated to general notices only.
+        notices = {
+            "general": merged_general_notices,
+            "last_updated": datetime.now().isoformat()
+        }
+        write_json(data_dir, 'notices.json', notices)
+        manifest.record(notices_path, notices, record_id_key, records_of=general_notices_of)
+        print(f"New notices found: {len(new_general_notices)}.")
+    else:
+        print("No new notices found. Keeping existing notices file unchanged.")
+
+def stage_brokers(scraper, data_dir):
+    """Refresh brokers.json when the broker list changed."""
+    print("Fetching broker list...")
+    brokers = scraper.get_brokers()
+    brokers_path = os.path.join(data_dir, 'brokers.json')
+    if isinstance(brokers, list) and brokers:
+        if write_json_if_changed(brokers_path, brokers):
+            print("Updated broker list.")
+        else:
+            print("Broker list unchanged. Keeping existing file.")
+    else:
+        print("No broker data found or error. Keeping existing file unchanged.")
 
-def scrape_all_official_data(include_brokers=False):
+def stage_live_trades(scraper, data_dir, is_open):
+    """Write live_trades.json while the market is open."""
+    if not is_open:
+        return
+    print("Fetching live trades...")
+    write_json(data_dir, 'live_trades.json', scraper.get_live_trades())
+
+TOP_STOCK_CATEGORIES = ['top_gainer', 'top_loser', 'top_turnover', 'top_trade', 'top_transaction']
+
+def build_official_stages(scraper, data_dir, include_brokers=False, max_workers=8):
+    """
+    Describe the official scrape as a stage graph.
+
+    Every NEPSE call depends on `market_status`, which authenticates the shared
+    session once before the fan-out. Everything else only waits for the data
+    it actually consumes.
+    """
+    runner = StageRunner(max_workers=max_workers)
+
+    runner.add('market_status', lambda r: stage_market_status(scraper, data_dir))
+    # Sharesansar and MeroLagani do not touch the NEPSE session at all.
+    runner.add('omf', lambda r: refresh_omf_data(data_dir))
+    runner.add('sector_codes', lambda r: stage_sector_codes(data_dir))
+
+    runner.add('today_price', lambda r: scraper.get_today_price(), deps=['market_status'])
+    runner.add(
+        'nepse_data',
+        lambda r: stage_nepse_data(data_dir, r['today_price'], r['omf']),
+        deps=['today_price', 'omf']
+    )
+
+    runner.add(
+        'indices',
+        lambda r: write_json(data_dir, 'indices.json', scraper.get_nepse_index()),
+        deps=['market_status']
+    )
+    runner.add(
+        'sector_indices',
+        lambda r: write_json(data_dir, 'sector_indices.json', scraper.get_sector_indices()),
+        deps=['market_status']
+    )
+
+    for category in TOP_STOCK_CATEGORIES:
+        runner.add(category, lambda r, c=category: stage_top_stock(scraper, c), deps=['market_status'])
+    runner.add(
+        'top_stocks',
+        lambda r: write_json(data_dir, 'top_stocks.json', {cat: r[cat] for cat in TOP_STOCK_CATEGORIES}),
+        deps=TOP_STOCK_CATEGORIES
+    )
+
+    runner.add(
+        'market_summary',
+        lambda r: write_json(data_dir, 'market_summary.json', scraper.get_market_summary()),
+        deps=['market_status']
+    )
+    runner.add(
+        'market_summary_history',
+        lambda r: write_json(data_dir, 'market_summary_history.json', scraper.get_market_summary_history()),
+        deps=['market_status']
+    )
+
+    runner.add('disclosure_data', lambda r: scraper.get_company_disclosures(), deps=['market_status'])
+    runner.add(
+        'disclosures',
+        lambda r: stage_disclosures(data_dir, r['disclosure_data']),
+        deps=['disclosure_data']
+    )
+    runner.add('general_notices', lambda r: scraper.get_notices(), deps=['market_status'])
+    runner.add(
+        'notices',
+        lambda r: stage_notices(data_dir, r['general_notices'], r['disclosures']),
+        deps=['general_notices', 'disclosures']
+    )
+
+    if include_brokers:
+        runner.add('brokers', lambda r: stage_brokers(scraper, data_dir), deps=['market_status'])
+    else:
+        print("Skipping broker list (not requested or recently updated).")
+
+    runner.add(
+        'supply_demand',
+        lambda r: write_json(data_dir, 'supply_demand.json', scraper.get_supply_demand(show_all=True)),
+        deps=['market_status']
+    )
+    runner.add(
+        'live_trades',
+        lambda r: stage_live_trades(scraper, data_dir, r['market_status']),
+        deps=['market_status']
+    )
+
+    return runner
+
+def scrape_all_official_data(include_brokers=False, max_workers=8):
     print(f"Starting Comprehensive Official NEPSE Scraper at {datetime.now().isoformat()}...")
     
     try:
-        # 1. Initialize Scraper
-        scraper = NepseScraper(verify_ssl=False)
+        # Reuse a still-valid token and today's market-open ID from the previous run.
+        scraper = NepseScraper(verify_ssl=False, session_cache=SessionCache(), validator_store=ValidatorStore())
         
-        # Data directory
         # Use absolute path of this file to find the data directory
         base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
         data_dir = os.path.join(base_dir, 'data')
         os.makedirs(data_dir, exist_ok=True)
-        
-        # 2. Market Status
-        print("Checking market status...")
-        is_open = scraper.is_market_open()
-        market_status = {
-            "is_open": is_open,
-            "last_checked": datetime.now().isoformat()
-        }
-        with open(os.path.join(data_dir, 'market_status.json'), 'w') as f:
-            json.dump(market_status, f, indent=4)
-        
-        # 3. Refresh open-ended mutual funds (OMF.json)
-        print("Refreshing open-ended mutual fund data...")
-        omf_snapshot = refresh_omf_data(data_dir)
-
-        # 4. Today's Prices
-        print("Fetching today's prices...")
-        raw_prices = scraper.get_today_price()
-        
-        mapped_prices = []
-        for item in raw_prices:
-            symbol = item.get('symbol')
-            ltp = item.get('lastUpdatedPrice', 0)
-            prev_close = item.get('previousDayClosePrice', 0)
-            change = round(ltp - prev_close, 2) if ltp and prev_close else 0
-            p_change = round((change / prev_close) * 100, 2) if prev_close != 0 else 0
-            
-            mapped_prices.append({
-                "symbol": symbol,
-                "name": item.get('securityName'),
-                "ltp": ltp,
-                "previous_close": prev_close,
-                "change": change,
-                "percent_change": p_change,
-                "high": item.get('highPrice'),
-                "low": item.get('lowPrice'),
-                "volume": item.get('totalTradedQuantity'),
-                "turnover": item.get('totalTradedValue'),
-                "trades": item.get('totalTrades'),
-                "last_updated": item.get('lastUpdatedTime'),
-                "market_cap": item.get('marketCapitalization')
-            })
-
-        # Include open-ended mutual funds collected from Sharesansar OMF.json.
-        # Use fresh in-memory snapshot when available.
-        omf_rows = build_omf_rows_for_nepse_data(data_dir, omf_items=omf_snapshot)
-        if omf_rows:
-            seen_symbols = {row.get('symbol') for row in mapped_prices if isinstance(row, dict)}
-            appended = 0
-            for row in omf_rows:
-                symbol = row.get('symbol')
-                if symbol in seen_symbols:
-                    continue
-                mapped_prices.append(row)
-                seen_symbols.add(symbol)
-                appended += 1
-            print(f"Added {appended} open-ended mutual fund rows to nepse_data.json.")
-        else:
-            print("No OMF rows found. nepse_data.json will include only NEPSE official price rows.")
-
-        mapped_prices.sort(key=lambda x: str(x.get('symbol', '')))
-
-        with open(os.path.join(data_dir, 'nepse_data.json'), 'w') as f:
-            json.dump(mapped_prices, f, indent=4)
-        
-        # 4. Indices (Live & All Sectoral)
-        print("Fetching indices...")
-        indices = scraper.get_nepse_index()
-        sector_indices = scraper.get_sector_indices()
-        with open(os.path.join(data_dir, 'indices.json'), 'w') as f:
-            json.dump(indices, f, indent=4)
-        with open(os.path.join(data_dir, 'sector_indices.json'), 'w') as f:
-            json.dump(sector_indices, f, indent=4)
-
-        # 4b. Sector-wise Company Codes
-        print("Fetching sector-wise company codes...")
-        sector_wise_codes = get_sector_wise_codes()
-        sector_codes_path = os.path.join(data_dir, 'nepse_sector_wise_codes.json')
-        if isinstance(sector_wise_codes, dict) and sector_wise_codes:
-            if write_json_if_changed(sector_codes_path, sector_wise_codes):
-                print("Updated sector-wise codes.")
-            else:
-                print("Sector-wise codes unchanged. Keeping existing file.")
-        else:
-            print("No sector-wise data found or error. Keeping existing file unchanged.")
-
-        # 5. Top Stocks (Full Categories)
-        print("Fetching top gainers, losers, turnover, trades, and transactions...")
-        categories = ['top_gainer', 'top_loser', 'top_turnover', 'top_trade', 'top_transaction']
-        top_stocks = {}
-        for cat in categories:
-            try:
-                top_stocks[cat] = scraper.get_top_stocks(cat, show_all=True)
-            except:
-                top_stocks[cat] = []
-        with open(os.path.join(data_dir, 'top_stocks.json'), 'w') as f:
-            json.dump(top_stocks, f, indent=4)
-
-        # 6. Market Summary & History
-        print("Fetching market summaries...")
-        summary = scraper.get_market_summary()
-        summary_history = scraper.get_market_summary_history()
-        with open(os.path.join(data_dir, 'market_summary.json'), 'w') as f:
-            json.dump(summary, f, indent=4)
-        with open(os.path.join(data_dir, 'market_summary_history.json'), 'w') as f:
-            json.dump(summary_history, f, indent=4)
-
-        # 7. Notices & News (Restored Disclosures)
-        print("Fetching company disclosures...")
-        disclosure_data = scraper.get_company_disclosures()
-        company_disclosures = disclosure_data.get('companyNews', [])
-        exchange_messages = disclosure_data.get('exchangeMessages', [])
-
-        disclosures_path = os.path.join(data_dir, 'disclosures.json')
-        exchange_messages_path = os.path.join(data_dir, 'exchange_messages.json')
-
-        existing_company_disclosures = load_json_list(disclosures_path)
-        existing_exchange_messages = load_json_list(exchange_messages_path)
-
-        incoming_company_disclosures = company_disclosures if isinstance(company_disclosures, list) else []
-        incoming_exchange_messages = exchange_messages if isinstance(exchange_messages, list) else []
-
-        new_company_disclosures = filter_new_records(
-            existing_company_disclosures,
-            incoming_company_disclosures
-        )
-        new_exchange_messages = filter_new_records(
-            existing_exchange_messages,
-            incoming_exchange_messages
-        )
-
-        if new_company_disclosures or new_exchange_messages:
-            merged_company_disclosures = merge_records_by_id(
-                existing_company_disclosures,
-                incoming_company_disclosures
-            )
-            merged_exchange_messages = merge_records_by_id(
-                existing_exchange_messages,
-                incoming_exchange_messages
-            )
-
-            merged_company_disclosures = add_file_urls_to_company_disclosures(merged_company_disclosures)
-            merged_exchange_messages = add_file_urls_to_exchange_messages(merged_exchange_messages)
-
-            merged_company_disclosures = add_symbols_to_company_disclosures(merged_company_disclosures)
-            merged_exchange_messages = add_symbols_to_exchange_messages(merged_exchange_messages)
-
-            merged_company_disclosures = sort_disclosures_latest_first(
-                merged_company_disclosures,
-                date_keys=('addedDate', 'modifiedDate', 'approvedDate')
-            )
-            merged_exchange_messages = sort_disclosures_latest_first(
-                merged_exchange_messages,
-                date_keys=('addedDate', 'modifiedDate', 'approvedDate', 'expiryDate')
-            )
-            
-            with open(disclosures_path, 'w', encoding='utf-8') as f:
-                json.dump(merged_company_disclosures, f, indent=4)
-            
-            with open(exchange_messages_path, 'w', encoding='utf-8') as f:
-                json.dump(merged_exchange_messages, f, indent=4)
-
-            print(
-                "New disclosures found: "
-                f"{len(new_company_disclosures)} company disclosures, "
-                f"{len(new_exchange_messages)} exchange messages."
-            )
-        else:
-            merged_company_disclosures = existing_company_disclosures
-            merged_exchange_messages = existing_exchange_messages
-            print("No new disclosures found. Keeping existing disclosure files unchanged.")
-
-        print("Fetching notices...")
-        general_notices = scraper.get_notices()
-        filtered_general_notices = filter_general_notices(general_notices, merged_exchange_messages)
-        notices_path = os.path.join(data_dir, 'notices.json')
-
-        existing_notices = {}
-        if os.path.exists(notices_path):
-            try:
-                with open(notices_path, 'r', encoding='utf-8') as f:
-                    loaded_notices = json.load(f)
-                if isinstance(loaded_notices, dict):
-                    existing_notices = loaded_notices
-            except Exception:
-                existing_notices = {}
-
-        existing_general_notices = existing_notices.get('general', [])
-        incoming_general_notices = filtered_general_notices if isinstance(filtered_general_notices, list) else []
-        new_general_notices = filter_new_records(
-            existing_general_notices if isinstance(existing_general_notices, list) else [],
-            incoming_general_notices
-        )
-
-        if new_general_notices:
-            merged_general_notices = merge_records_by_id(
-                existing_general_notices if isinstance(existing_general_notices, list) else [],
-                incoming_general_notices
-            )
-            merged_general_notices = sort_notices_latest_first(merged_general_notices)
-
-            with open(os.path.join(data_dir, 'notices.json'), 'w') as f:
-                # Keep notices file dedicated to general notices only.
-                json.dump({
-                    "general": merged_general_notices,
-                    "last_updated": datetime.now().isoformat()
-                }, f, indent=4)
-            print(f"New notices found: {len(new_general_notices)}.")
-        else:
-            print("No new notices found. Keeping existing notices file unchanged.")
-
-        # 8. Brokers
-        if include_brokers:
-            print("Fetching broker list...")
-            brokers = scraper.get_brokers()
-            brokers_path = os.path.join(data_dir, 'brokers.json')
-            if isinstance(brokers, list) and brokers:
-                if write_json_if_changed(brokers_path, brokers):
-                    print("Updated broker list.")
-                else:
-                    print("Broker list unchanged. Keeping existing file.")
-            else:
-                print("No broker data found or error. Keeping existing file unchanged.")
-        else:
-            print("Skipping broker list (not requested or recently updated).")
 
-        # 9. Supply & Demand (Disabled)
-        print("Fetching supply and demand...")
-        supply_demand = scraper.get_supply_demand(show_all=True)
-        with open(os.path.join(data_dir, 'supply_demand.json'), 'w') as f:
-            json.dump(supply_demand, f, indent=4)
+        runner = build_official_stages(scraper, data_dir, include_brokers=include_brokers, max_workers=max_workers)
+        ok = runner.run()
+        print("Stage timings:")
+        print(runner.timing_report())
 
-        # 10. Live Trades (Only if market open)
-        if is_open:
-            print("Fetching live trades...")
-            live_trades = scraper.get_live_trades()
-            with open(os.path.join(data_dir, 'live_trades.json'), 'w') as f:
-                json.dump(live_trades, f, indent=4)
+        if not ok:
+            failed = sorted(runner.errors) + sorted(runner.skipped)
+            print(f"Comprehensive official scraping finished with failed stages: {failed}")
+            return False
 
         print(f"Successfully completed comprehensive official scraping.")
         return True
@@ -684,7 +606,13 @@ def scrape_all_official_data(include_brokers=False):
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description='NEPSE Official Data Scraper')
     parser.add_argument('--brokers', action='store_true', help='Force update broker list')
+    parser.add_argument('--workers', type=int, default=8, help='Maximum number of stages to run concurrently')
+    parser.add_argument('--json-format', choices=json_writer.FORMATS, default=None,
+                        help='Layout of the data/*.json outputs (default: lines, one record per line)')
+    parser.add_argument('--compress', nargs='*', choices=('gz', 'br'), default=None,
+                        help='Also write pre-compressed .gz / .br siblings of every output')
     args = parser.parse_args()
+    json_writer.configure(format=args.json_format, compress=args.compress)
     
     # Use absolute path of this file to find the data directory
     base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -712,4 +640,4 @@ if __name__ == "__main__":
 
     include_brokers = should_update('brokers.json', args.brokers)
             
-    scrape_all_official_data(include_brokers=include_brokers)
+    scrape_all_official_data(include_brokers=include_brokers, max_workers=args.workers)
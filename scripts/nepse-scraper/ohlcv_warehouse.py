@@ -0,0 +1,302 @@
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+# Add the current directory to path to find official_api
+sys.path.append(os.path.dirname(__file__))
+
+from official_api.response_cache import MARKET_CLOSE_TIME, NEPAL_TZ
+from text_utils import load_known_symbols
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DEFAULT_DB_PATH = os.path.join(BASE_DIR, 'data', 'warehouse', 'ohlcv.sqlite3')
+DEFAULT_START = '2015-01-01'
+CHUNK_DAYS = 365
+
+# warehouse column -> candidate fields of a NEPSE price-history record.
+FIELD_SOURCES: Tuple[Tuple[str, Tuple[str, ...]], ...] = (
+    ('open', ('openPrice',)),
+    ('high', ('highPrice',)),
+    ('low', ('lowPrice',)),
+    ('close', ('closePrice', 'lastUpdatedPrice')),
+    ('prev_close', ('previousDayClosePrice',)),
+    ('volume', ('totalTradedQuantity',)),
+    ('turnover', ('totalTradedValue',)),
+    ('trades', ('totalTrades',)),
+)
+COLUMNS = ('symbol', 'date') + tuple(column for column, _ in FIELD_SOURCES)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS prices (
+    symbol TEXT NOT NULL,
+    date TEXT NOT NULL,
+    open REAL, high REAL, low REAL, close REAL, prev_close REAL,
+    volume REAL, turnover REAL, trades INTEGER,
+    PRIMARY KEY (symbol, date)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS coverage (
+    symbol TEXT PRIMARY KEY,
+    start_date TEXT NOT NULL,
+    end_date TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+"""
+
+
+def _day(value: Any) -> date:
+    return value if isinstance(value, date) else date.fromisoformat(str(value)[:10])
+
+
+def last_complete_day(now: Optional[datetime] = None) -> date:
+    """Latest business day whose prices are final: today after the close (NPT), else yesterday."""
+    local = (now or datetime.now(NEPAL_TZ)).astimezone(NEPAL_TZ)
+    if (local.hour, local.minute) >= MARKET_CLOSE_TIME:
+        return local.date()
+    return local.date() - timedelta(days=1)
+
+
+def price_row(symbol: str, record: Dict[str, Any]) -> Optional[Tuple[Any, ...]]:
+    """Warehouse row of a NEPSE price-history record, or None without a business date."""
+    business_date = record.get('businessDate')
+    if not business_date:
+        return None
+    values: List[Any] = [symbol, str(business_date)[:10]]
+    for _, sources in FIELD_SOURCES:
+        values.append(next((record[key] for key in sources if record.get(key) is not None), None))
+    return tuple(values)
+
+
+def date_chunks(start: date, end: date, days: int = CHUNK_DAYS, backwards: bool = False) -> Iterator[Tuple[date, date]]:
+    """Split [start, end] into ranges of at most `days` days, oldest first unless `backwards`."""
+    step = timedelta(days=days - 1)
+    if backwards:
+        while end >= start:
+            chunk_start = max(start, end - step)
+            yield chunk_start, end
+            end = chunk_start - timedelta(days=1)
+    else:
+        while start <= end:
+            chunk_end = min(end, start + step)
+            yield start, chunk_end
+            start = chunk_end + timedelta(days=1)
+
+
+class OHLCVWarehouse:
+    """
+    SQLite store of daily prices keyed by (symbol, date).
+
+    Next to the prices, `coverage` records for each symbol the one
+    contiguous date range that has been fetched completely (days without
+    trading simply have no row). Backfills only request what lies outside
+    that range and extend it chunk by chunk, so an interrupted run resumes
+    where it stopped and the daily update only asks for the days since the
+    last run.
+    """
+
+    def __init__(self, path: str = DEFAULT_DB_PATH) -> None:
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.executescript(SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self) -> 'OHLCVWarehouse':
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def coverage(self, symbol: str) -> Optional[Tuple[date, date]]:
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT start_date, end_date FROM coverage WHERE symbol = ?', (symbol,)
+            ).fetchone()
+        return (_day(row[0]), _day(row[1])) if row else None
+
+    def symbols(self) -> List[str]:
+        with self._lock:
+            return [row[0] for row in self._conn.execute('SELECT symbol FROM coverage ORDER BY symbol')]
+
+    def missing_ranges(self, symbol: str, start: Any, end: Any) -> List[Tuple[date, date, bool]]:
+        """
+        Ranges of [start, end] not covered yet for `symbol`, as
+        (start, end, backwards). The range before the covered one is walked
+        backwards so coverage stays contiguous while it is filled.
+        """
+        start, end = _day(start), _day(end)
+        covered = self.coverage(symbol)
+        if covered is None:
+            return [(start, end, False)] if start <= end else []
+        ranges = []
+        if start < covered[0]:
+            ranges.append((start, min(end, covered[0] - timedelta(days=1)), True))
+        if end > covered[1]:
+            ranges.append((max(start, covered[1] + timedelta(days=1)), end, False))
+        return ranges
+
+    def store_chunk(self, symbol: str, records: Iterable[Dict[str, Any]], start: date, end: date) -> int:
+        """Insert the records of a fully fetched [start, end] chunk and extend coverage."""
+        rows = [row for row in (price_row(symbol, record) for record in records) if row is not None]
+        placeholders = ', '.join('?' * len(COLUMNS))
+        with self._lock, self._conn:
+            self._conn.executemany(
+                f'INSERT OR REPLACE INTO prices ({", ".join(COLUMNS)}) VALUES ({placeholders})', rows
+            )
+            self._conn.execute(
+                """
+                INSERT INTO coverage (symbol, start_date, end_date, updated_at) VALUES (?, ?, ?, ?)
+                ON CONFLICT(symbol) DO UPDATE SET
+                    start_date = MIN(start_date, excluded.start_date),
+                    end_date = MAX(end_date, excluded.end_date),
+                    updated_at = excluded.updated_at
+                """,
+                (symbol, start.isoformat(), end.isoformat(), datetime.now().isoformat(timespec='seconds')),
+            )
+        return len(rows)
+
+    def query(self, symbol: str, start: Any = None, end: Any = None) -> List[Dict[str, Any]]:
+        """Daily rows of `symbol` between `start` and `end` (inclusive), oldest first."""
+        sql = f'SELECT {", ".join(COLUMNS)} FROM prices WHERE symbol = ?'
+        params: List[Any] = [symbol.upper()]
+        if start is not None:
+            sql += ' AND date >= ?'
+            params.append(_day(start).isoformat())
+        if end is not None:
+            sql += ' AND date <= ?'
+            params.append(_day(end).isoformat())
+        with self._lock:
+            rows = self._conn.execute(sql + ' ORDER BY date', params).fetchall()
+        return [dict(zip(COLUMNS, row)) for row in rows]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            rows, symbols, first, last = self._conn.execute(
+                'SELECT COUNT(*), COUNT(DISTINCT symbol), MIN(date), MAX(date) FROM prices'
+            ).fetchone()
+        return {'rows': rows, 'symbols': symbols, 'first_date': first, 'last_date': last}
+
+
+def _fill_symbol(warehouse: OHLCVWarehouse, scraper: Any, symbol: str, start: date, end: date, chunk_days: int) -> int:
+    stored = 0
+    for range_start, range_end, backwards in warehouse.missing_ranges(symbol, start, end):
+        for chunk_start, chunk_end in date_chunks(range_start, range_end, chunk_days, backwards=backwards):
+            records = scraper.iter_ticker_price_history(symbol, chunk_start.isoformat(), chunk_end.isoformat())
+            stored += warehouse.store_chunk(symbol, list(records), chunk_start, chunk_end)
+    return stored
+
+
+def backfill(
+    warehouse: OHLCVWarehouse,
+    scraper: Any,
+    symbols: Sequence[str],
+    start: Any = DEFAULT_START,
+    end: Any = None,
+    max_workers: int = 8,
+    chunk_days: int = CHUNK_DAYS,
+) -> Tuple[Dict[str, int], Dict[str, Exception]]:
+    """
+    Fetch every not yet covered day of [start, end] for `symbols`, several
+    symbols in parallel (paced by the scraper's shared rate limiter). A
+    failed symbol keeps the chunks it completed and is retried from there on
+    the next run. Returns rows stored per symbol and the failures.
+    """
+    start, end = _day(start), _day(end or last_complete_day())
+    stored: Dict[str, int] = {}
+    failures: Dict[str, Exception] = {}
+    symbols = list(dict.fromkeys(symbol.upper() for symbol in symbols))
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(symbols) or 1))) as executor:
+        futures = {
+            executor.submit(_fill_symbol, warehouse, scraper, symbol, start, end, chunk_days): symbol
+            for symbol in symbols
+        }
+        for done, future in enumerate(as_completed(futures), start=1):
+            symbol = futures[future]
+            try:
+                stored[symbol] = future.result()
+            except Exception as e:
+                failures[symbol] = e
+                print(f"[{done}/{len(symbols)}] {symbol}: failed ({e}); will resume on the next run.")
+                continue
+            print(f"[{done}/{len(symbols)}] {symbol}: {stored[symbol]} rows")
+    return stored, failures
+
+
+def update(warehouse: OHLCVWarehouse, scraper: Any, end: Any = None, max_workers: int = 8) -> Tuple[Dict[str, int], Dict[str, Exception]]:
+    """Fetch the days after each stored symbol's coverage, up to `end` (default: last complete day)."""
+    end = _day(end or last_complete_day())
+    stored: Dict[str, int] = {}
+    failures: Dict[str, Exception] = {}
+    by_start: Dict[date, List[str]] = {}
+    for symbol in warehouse.symbols():
+        covered = warehouse.coverage(symbol)
+        if covered and covered[1] < end:
+            by_start.setdefault(covered[0], []).append(symbol)
+    for start, symbols in by_start.items():
+        done, failed = backfill(warehouse, scraper, symbols, start=start, end=end, max_workers=max_workers)
+        stored.update(done)
+        failures.update(failed)
+    return stored, failures
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Local OHLCV warehouse built from NEPSE price history')
+    parser.add_argument('--db', default=DEFAULT_DB_PATH, help='SQLite file (default: data/warehouse/ohlcv.sqlite3)')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    backfill_parser = commands.add_parser('backfill', help='Fetch history for many symbols; resumes where it stopped')
+    backfill_parser.add_argument('symbols', nargs='*', help='Symbols (default: all of data/all_securities.json)')
+    backfill_parser.add_argument('--start', default=DEFAULT_START)
+    backfill_parser.add_argument('--end', default=None, help='Last day (default: the last day with final prices)')
+    backfill_parser.add_argument('--workers', type=int, default=8)
+    backfill_parser.add_argument('--chunk-days', type=int, default=CHUNK_DAYS)
+
+    update_parser = commands.add_parser('update', help='Fetch the days missing since the last run')
+    update_parser.add_argument('--end', default=None, help='Last day (default: the last day with final prices)')
+    update_parser.add_argument('--workers', type=int, default=8)
+
+    query_parser = commands.add_parser('query', help='Print stored rows as JSON lines')
+    query_parser.add_argument('symbol')
+    query_parser.add_argument('--start', default=None)
+    query_parser.add_argument('--end', default=None)
+
+    commands.add_parser('stats', help='Row and symbol counts')
+    args = parser.parse_args()
+
+    with OHLCVWarehouse(args.db) as warehouse:
+        if args.command == 'query':
+            for row in warehouse.query(args.symbol, args.start, args.end):
+                print(json.dumps(row))
+            return 0
+        if args.command == 'stats':
+            print(json.dumps(warehouse.stats(), indent=2))
+            return 0
+
+        from official_api import NepseScraper, SessionCache
+
+        scraper = NepseScraper(verify_ssl=False, session_cache=SessionCache())
+        if args.command == 'backfill':
+            symbols = args.symbols or sorted(load_known_symbols())
+            _, failures = backfill(
+                warehouse, scraper, symbols, start=args.start, end=args.end,
+                max_workers=args.workers, chunk_days=args.chunk_days,
+            )
+        else:
+            _, failures = update(warehouse, scraper, end=args.end, max_workers=args.workers)
+        print(f"Warehouse: {warehouse.stats()}")
+        return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
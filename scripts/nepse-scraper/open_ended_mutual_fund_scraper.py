@@ -1,13 +1,14 @@
-import json
 import os
 import sys
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
 import requests
-from requests.adapters import HTTPAdapter
 from urllib3.util import Retry
 
+from json_writer import write_json_atomic
+from official_api.conditional import mount_conditional
+
 
 BASE_URL = "https://www.sharesansar.com/mutual-fund-navs"
 OUTPUT_FILE = "OMF.json"
@@ -35,9 +36,8 @@ def create_session() -> requests.Session:
         allowed_methods=frozenset(["GET"]),
         raise_on_status=False,
     )
-    adapter = HTTPAdapter(max_retries=retry)
-    session.mount("https://", adapter)
-    session.mount("http://", adapter)
+    # Unchanged pages are revalidated with ETag / Last-Modified instead of re-downloaded.
+    mount_conditional(session, max_retries=retry)
     return session
 
 
@@ -179,8 +179,7 @@ def normalize_rows(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
 
 
 def save_json(path: str, data: List[Dict[str, Any]]) -> None:
-    with open(path, "w", encoding="utf-8") as file:
-        json.dump(data, file, indent=2, ensure_ascii=False)
+    write_json_atomic(path, data)
 
 
 def scrape_and_save_open_ended_navs(output_path: Optional[str] = None) -> List[Dict[str, Any]]:
@@ -0,0 +1,179 @@
+import hashlib
+import json
+import os
+import threading
+from typing import AbstractSet, Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from json_writer import write_json_atomic
+
+MANIFEST_FILE = '.manifest.json'
+
+KeyFn = Callable[[Any], Optional[str]]
+RecordsOf = Callable[[Any], List[Any]]
+
+_manifests: Dict[str, 'OutputManifest'] = {}
+_manifests_lock = threading.Lock()
+
+
+def content_hash(data: Any) -> str:
+    """Hash of the canonical JSON encoding of `data`, independent of the file layout."""
+    canonical = json.dumps(data, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+def _as_records(data: Any) -> List[Any]:
+    return data if isinstance(data, list) else []
+
+
+def _file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class OutputManifest:
+    """
+    Sidecar manifest (`.manifest.json`) for the JSON outputs of one directory.
+
+    For every output it keeps the file's size and byte hash, the canonical
+    content hash of its data and, for record lists, a short hash per record
+    key (`records_of` picks the list out of a wrapper object). "Did this
+    output change?" and "which incoming records are new?" are then answered
+    from the manifest without parsing the output.
+    An entry is only trusted while the file on disk still matches it (same
+    size and byte hash); otherwise the file is parsed once and the entry
+    rebuilt. The manifest is committed next to the data, so it holds nothing
+    checkout-specific: mtimes are only remembered in memory, to skip
+    re-hashing a file this process already checked or wrote.
+
+    So a new process (every cron run on a fresh checkout) still reads and
+    sha256-hashes each output it asks about once: the check stays
+    O(output size) per run. What the manifest saves is parsing the existing
+    output, diffing its records and rewriting an unchanged file.
+    """
+
+    def __init__(self, directory: str) -> None:
+        self.directory = directory
+        self.path = os.path.join(directory, MANIFEST_FILE)
+        self._lock = threading.Lock()
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                loaded = json.load(f)
+            self.files: Dict[str, Dict[str, Any]] = loaded.get('files', {}) if isinstance(loaded, dict) else {}
+        except (OSError, ValueError):
+            self.files = {}
+        for entry in self.files.values():
+            # Written by older versions; never valid on another checkout.
+            entry.pop('mtime_ns', None)
+        # name -> (size, mtime_ns) of files verified against their entry in this process.
+        self._verified: Dict[str, Tuple[int, int]] = {}
+
+    @classmethod
+    def for_directory(cls, directory: str) -> 'OutputManifest':
+        """Process-wide manifest of `directory`, shared by concurrent stages."""
+        key = os.path.abspath(directory)
+        with _manifests_lock:
+            manifest = _manifests.get(key)
+            if manifest is None:
+                manifest = _manifests[key] = cls(directory)
+            return manifest
+
+    def _valid_entry(self, path: str) -> Optional[Dict[str, Any]]:
+        name = os.path.basename(path)
+        entry = self.files.get(name)
+        if entry is None:
+            return None
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        if entry.get('size') != stat.st_size:
+            return None
+        if self._verified.get(name) == (stat.st_size, stat.st_mtime_ns):
+            return entry
+        # First look at this file in this process: a full read to hash it.
+        if entry.get('sha256') == _file_sha256(path):
+            self._verified[name] = (stat.st_size, stat.st_mtime_ns)
+            return entry
+        return None
+
+    def _load_and_record(self, path: str, key_fn: Optional[KeyFn], records_of: RecordsOf) -> Optional[Dict[str, Any]]:
+        try:
+            with open(path, 'r', encoding='utf-8-sig') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return self._record(path, data, key_fn, records_of)
+
+    def _record(self, path: str, data: Any, key_fn: Optional[KeyFn], records_of: RecordsOf) -> Dict[str, Any]:
+        stat = os.stat(path)
+        name = os.path.basename(path)
+        self._verified[name] = (stat.st_size, stat.st_mtime_ns)
+        entry: Dict[str, Any] = {
+            'size': stat.st_size,
+            'sha256': _file_sha256(path),
+            'content': content_hash(data),
+        }
+        if key_fn is not None:
+            records = {}
+            for item in records_of(data):
+                key = key_fn(item)
+                if key is not None:
+                    records[key] = content_hash(item)[:16]
+            entry['records'] = records
+        self.files[name] = entry
+        return entry
+
+    def _save(self) -> None:
+        write_json_atomic(self.path, {'files': self.files}, format='lines', compress=())
+
+    def is_unchanged(self, path: str, data: Any) -> bool:
+        """True if `path` already holds exactly `data`."""
+        if not os.path.exists(path):
+            return False
+        with self._lock:
+            entry = self._valid_entry(path)
+            if entry is None:
+                entry = self._load_and_record(path, None, _as_records)
+                if entry is None:
+                    return False
+                self._save()
+            return entry['content'] == content_hash(data)
+
+    def known_keys(self, path: str, key_fn: KeyFn, records_of: RecordsOf = _as_records) -> AbstractSet[str]:
+        """Record keys present in the list stored at `path` (empty if it does not exist)."""
+        if not os.path.exists(path):
+            return set()
+        with self._lock:
+            entry = self._valid_entry(path)
+            if entry is None or 'records' not in entry:
+                entry = self._load_and_record(path, key_fn, records_of)
+                if entry is not None:
+                    self._save()
+            return entry['records'].keys() if entry is not None else set()
+
+    def new_records(self, path: str, incoming: Iterable[Any], key_fn: KeyFn, records_of: RecordsOf = _as_records) -> List[Any]:
+        """Incoming records whose key is not yet stored in `path`."""
+        known = self.known_keys(path, key_fn, records_of)
+        new = []
+        for item in incoming:
+            key = key_fn(item)
+            if key is not None and key not in known:
+                new.append(item)
+        return new
+
+    def record(self, path: str, data: Any, key_fn: Optional[KeyFn] = None, records_of: RecordsOf = _as_records) -> None:
+        """Update the entry of `path` after `data` was written to it."""
+        with self._lock:
+            self._record(path, data, key_fn, records_of)
+            self._save()
+
+    def forget(self, path: str) -> None:
+        """Drop the entry of `path`, e.g. once it is tracked elsewhere."""
+        with self._lock:
+            name = os.path.basename(path)
+            self._verified.pop(name, None)
+            if self.files.pop(name, None) is not None:
+                self._save()
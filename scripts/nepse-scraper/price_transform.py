@@ -0,0 +1,205 @@
+import os
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # Optional: the pure-Python backend is used without it.
+    np = None
+
+BACKENDS = ('auto', 'numpy', 'python')
+DEFAULT_BACKEND = os.environ.get('NEPSE_PRICE_BACKEND', 'auto')
+
+# `change` is only computed when ltp and previous close are...
+#   'truthy'  - both non-zero (NEPSE today-price rows)
+#   'numeric' - both numbers (OMF rows, where NAVs may be missing)
+# otherwise it is 0. `percent_change` is round(change / previous * 100, 2)
+# when the previous close is non-zero (and, for 'numeric', a number), else 0.
+CHANGE_RULES = ('truthy', 'numeric')
+
+# nepse_data.json field -> NEPSE today-price field.
+TODAY_PRICE_FIELDS: Tuple[Tuple[str, str], ...] = (
+    ('symbol', 'symbol'),
+    ('name', 'securityName'),
+    ('high', 'highPrice'),
+    ('low', 'lowPrice'),
+    ('volume', 'totalTradedQuantity'),
+    ('turnover', 'totalTradedValue'),
+    ('trades', 'totalTrades'),
+    ('last_updated', 'lastUpdatedTime'),
+    ('market_cap', 'marketCapitalization'),
+)
+
+def _resolve_backend(backend: Optional[str]) -> str:
+    backend = backend or DEFAULT_BACKEND
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown price backend '{backend}'. Use one of {BACKENDS}.")
+    if backend == 'numpy' and np is None:
+        raise ImportError("The numpy price backend requires numpy.")
+    if backend == 'auto':
+        return 'numpy' if np is not None else 'python'
+    return backend
+
+
+def _python_changes(ltps: Sequence[Any], prevs: Sequence[Any], rule: str) -> Tuple[List[Any], List[Any]]:
+    changes, percents = [], []
+    for ltp, prev in zip(ltps, prevs):
+        if rule == 'truthy':
+            change = round(ltp - prev, 2) if ltp and prev else 0
+            percent = round((change / prev) * 100, 2) if prev != 0 else 0
+        else:
+            numeric_prev = isinstance(prev, (int, float))
+            change = round(ltp - prev, 2) if isinstance(ltp, (int, float)) and numeric_prev else 0
+            percent = round((change / prev) * 100, 2) if numeric_prev and prev != 0 else 0
+        changes.append(change)
+        percents.append(percent)
+    return changes, percents
+
+
+def _numeric_column(values: Sequence[Any], allow_none: bool) -> Optional[Tuple[Any, bool]]:
+    """(float64 array, contains ints) for `values`, or None if they are not plain numbers."""
+    types = set(map(type, values))
+    allowed = {int, float, type(None)} if allow_none else {int, float}
+    if not types <= allowed:
+        return None
+    return np.array(values, dtype=np.float64), int in types  # None -> NaN
+
+
+def _round2(values: Any) -> Any:
+    """np.round(values, 2), corrected to Python's round() where the two may differ."""
+    rounded = np.round(values, 2)
+    scaled = values * 100
+    distance = np.abs(scaled - np.floor(scaled) - 0.5)
+    # np.round scales by 100 first, which can flip results that sit (almost)
+    # exactly on a half; those few are redone with round().
+    for i in np.flatnonzero(distance <= np.maximum(np.abs(scaled), 1.0) * 1e-12):
+        rounded[i] = round(float(values[i]), 2)
+    return rounded
+
+
+def _with_int_positions(values: Any, int_positions: Any) -> List[Any]:
+    result = values.tolist()
+    for i in np.flatnonzero(int_positions):
+        result[i] = int(result[i])
+    return result
+
+
+def _numpy_changes(ltps: Sequence[Any], prevs: Sequence[Any], rule: str) -> Optional[Tuple[List[Any], List[Any]]]:
+    ltp_column = _numeric_column(ltps, allow_none=rule == 'numeric')
+    prev_column = _numeric_column(prevs, allow_none=rule == 'numeric')
+    if ltp_column is None or prev_column is None:
+        return None
+    ltp, ltp_has_ints = ltp_column
+    prev, prev_has_ints = prev_column
+
+    if rule == 'truthy':
+        has_change = (ltp != 0) & (prev != 0)
+        has_percent = prev != 0
+    else:
+        prev_present = ~np.isnan(prev)
+        has_change = ~np.isnan(ltp) & prev_present
+        has_percent = prev_present & (prev != 0)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        change = np.where(has_change, _round2(np.where(has_change, ltp - prev, 0.0)), 0.0)
+        percent = np.where(has_percent, _round2(np.where(has_percent, (change / prev) * 100, 0.0)), 0.0)
+
+    # round() keeps ints as ints, and the fallback value is the int 0. Only
+    # rows where both inputs are whole numbers can be int - int.
+    change_is_int = ~has_change
+    if ltp_has_ints and prev_has_ints:
+        whole = has_change & (ltp == np.floor(ltp)) & (prev == np.floor(prev))
+        for i in np.flatnonzero(whole):
+            if type(ltps[i]) is int and type(prevs[i]) is int:
+                change_is_int[i] = True
+    return _with_int_positions(change, change_is_int), _with_int_positions(percent, ~has_percent)
+
+
+def price_changes(
+    ltps: Sequence[Any],
+    prevs: Sequence[Any],
+    rule: str = 'truthy',
+    backend: Optional[str] = None,
+) -> Tuple[List[Any], List[Any]]:
+    """
+    `change` and `percent_change` columns for parallel lists of last traded
+    prices and previous closes (see CHANGE_RULES). The numpy backend gives
+    exactly the same values and int/float types as the row-by-row Python
+    code; columns it cannot represent (strings, booleans, ...) are handed to
+    the Python backend.
+    """
+    if rule not in CHANGE_RULES:
+        raise ValueError(f"Unknown change rule '{rule}'. Use one of {CHANGE_RULES}.")
+    if _resolve_backend(backend) == 'numpy':
+        result = _numpy_changes(ltps, prevs, rule)
+        if result is not None:
+            return result
+    return _python_changes(ltps, prevs, rule)
+
+
+def today_price_columns(raw_prices: Sequence[Dict[str, Any]], backend: Optional[str] = None) -> Dict[str, List[Any]]:
+    """
+    NEPSE today-price rows as nepse_data.json columns, for backfills that
+    keep whole days column-wise (see columnar.py) instead of as row dicts.
+    """
+    columns = {field: [item.get(source) for item in raw_prices] for field, source in TODAY_PRICE_FIELDS}
+    columns['ltp'] = [item.get('lastUpdatedPrice', 0) for item in raw_prices]
+    columns['previous_close'] = [item.get('previousDayClosePrice', 0) for item in raw_prices]
+    columns['change'], columns['percent_change'] = price_changes(
+        columns['ltp'], columns['previous_close'], rule='truthy', backend=backend
+    )
+    return columns
+
+
+def map_today_prices(raw_prices: Sequence[Dict[str, Any]], backend: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Map NEPSE today-price rows into the nepse_data.json schema."""
+    ltps = [item.get('lastUpdatedPrice', 0) for item in raw_prices]
+    prevs = [item.get('previousDayClosePrice', 0) for item in raw_prices]
+    changes, percents = price_changes(ltps, prevs, rule='truthy', backend=backend)
+    return [
+        {
+            "symbol": item.get('symbol'),
+            "name": item.get('securityName'),
+            "ltp": ltp,
+            "previous_close": prev_close,
+            "change": change,
+            "percent_change": percent_change,
+            "high": item.get('highPrice'),
+            "low": item.get('lowPrice'),
+            "volume": item.get('totalTradedQuantity'),
+            "turnover": item.get('totalTradedValue'),
+            "trades": item.get('totalTrades'),
+            "last_updated": item.get('lastUpdatedTime'),
+            "market_cap": item.get('marketCapitalization'),
+        }
+        for item, ltp, prev_close, change, percent_change in zip(raw_prices, ltps, prevs, changes, percents)
+    ]
+
+
+def map_omf_rows(omf_items: Sequence[Any], backend: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Map OMF.json funds with a symbol and name into the nepse_data.json schema."""
+    items = [
+        item for item in omf_items
+        if isinstance(item, dict) and item.get('symbol') and item.get('fund_name')
+    ]
+    ltps = [item.get('daily_nav') for item in items]
+    prevs = [item.get('weekly_nav') for item in items]
+    changes, percents = price_changes(ltps, prevs, rule='numeric', backend=backend)
+    return [
+        {
+            "symbol": item.get('symbol'),
+            "name": item.get('fund_name'),
+            "ltp": ltp,
+            "previous_close": previous_close,
+            "change": change,
+            "percent_change": percent_change,
+            "high": None,
+            "low": None,
+            "volume": None,
+            "turnover": None,
+            "trades": None,
+            "last_updated": item.get('daily_nav_date') or item.get('scraped_at'),
+            "market_cap": item.get('fund_size'),
+            "asset_type": "open_ended_mutual_fund",
+        }
+        for item, ltp, previous_close, change, percent_change in zip(items, ltps, prevs, changes, percents)
+    ]
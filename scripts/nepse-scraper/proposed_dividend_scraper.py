@@ -1,22 +1,43 @@
 import argparse
 import json
 import os
+import re
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, List, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple
 
 import requests
-from bs4 import BeautifulSoup
-from requests.adapters import HTTPAdapter
+from bs4 import BeautifulSoup, SoupStrainer
 from urllib3.util import Retry
 
+from html_parsing import parse_html
+from json_writer import write_json_atomic
+from official_api.conditional import mount_conditional
+from official_api.rate_limit import GroupLimit, RateLimiter
+from output_manifest import OutputManifest
+from segment_store import SegmentStore
+
 
 BASE_URL = "https://www.sharesansar.com/proposed-dividend"
 LATEST_FILE = "latest_1y.json"
 HISTORY_FILE = "history_all_years.json"
+# Segmented store behind HISTORY_FILE (monthly files + key index).
+HISTORY_DIR = "history"
 # Stable dedupe identity for proposed-dividend rows.
 # If this tuple changes, uniqueness behavior for history/latest changes too.
 DEDUPE_FIELDS = ("id", "symbol", "fiscal_year", "announcement_date", "total_dividend")
+# Concurrency and pacing of the all-years backfill.
+DEFAULT_WORKERS = 6
+DEFAULT_RATE = 4.0
+
+# The regular `<a href="...">text</a>` cells Sharesansar returns. Anything
+# else (nested tags, entities, extra markup) is left to BeautifulSoup.
+_ANCHOR_RE = re.compile(r'\s*<a\b([^<>&]*)>([^<>&]*)</a>\s*\Z', re.IGNORECASE)
+_ATTR_RE = re.compile(r"""\s+([^\s"'<>/=]+)(?:\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s"'=<>`]+)))?""")
+
+# The fiscal-year <select> is all get_year_options needs from the page.
+YEAR_SELECT = SoupStrainer("select", id="year")
 
 HEADERS = {
     "User-Agent": (
@@ -35,7 +56,7 @@ def get_data_dir() -> str:
     return data_dir
 
 
-def create_session() -> requests.Session:
+def create_session(pool_size: int = 10) -> requests.Session:
     session = requests.Session()
     session.headers.update(HEADERS)
     retry = Retry(
@@ -47,9 +68,8 @@ def create_session() -> requests.Session:
         allowed_methods=frozenset(["GET"]),
         raise_on_status=False,
     )
-    adapter = HTTPAdapter(max_retries=retry)
-    session.mount("https://", adapter)
-    session.mount("http://", adapter)
+    # Unchanged pages are revalidated with ETag / Last-Modified instead of re-downloaded.
+    mount_conditional(session, max_retries=retry, pool_maxsize=max(10, pool_size))
     return session
 
 
@@ -65,13 +85,32 @@ def load_json_list(path: str) -> List[Dict]:
 
 
 def save_json_list(path: str, data: List[Dict]) -> None:
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    write_json_atomic(path, data)
+
+
+def _anchor_attributes(markup: str) -> Optional[Dict[str, str]]:
+    """Attributes of a plain `<a ...>` tag, or None if they are not simple enough to read with a regex."""
+    attrs: Dict[str, str] = {}
+    end = 0
+    for match in _ATTR_RE.finditer(markup):
+        name = match.group(1).lower()
+        if match.start() != end or name in attrs:
+            return None
+        attrs[name] = next((value for value in match.group(2, 3, 4) if value is not None), "")
+        end = match.end()
+    return attrs if not markup[end:].strip() else None
 
 
 def clean_html_anchor(value: str) -> Tuple[str, str]:
     if value is None:
         return "", ""
+    if isinstance(value, str):
+        if "<" not in value and "&" not in value:
+            return value.strip(), ""
+        match = _ANCHOR_RE.match(value)
+        attrs = _anchor_attributes(match.group(1)) if match else None
+        if attrs is not None:
+            return match.group(2).strip(), attrs.get("href", "")
     soup = BeautifulSoup(value, "html.parser")
     anchor = soup.find("a")
     if anchor:
@@ -102,6 +141,10 @@ def normalize_record(row: Dict) -> Dict:
     }
 
 
+def normalize_records(rows: Iterable[Dict]) -> List[Dict]:
+    return [normalize_record(row) for row in rows]
+
+
 def parse_date(value: str) -> datetime:
     if not value:
         return datetime.min
@@ -111,12 +154,12 @@ def parse_date(value: str) -> datetime:
         return datetime.min
 
 
+def announcement_order(item: Dict) -> Tuple[datetime, int]:
+    return parse_date(item.get("announcement_date")), item.get("id") or 0
+
+
 def sort_newest_first(records: List[Dict]) -> List[Dict]:
-    return sorted(
-        records,
-        key=lambda x: (parse_date(x.get("announcement_date")), x.get("id") or 0),
-        reverse=True,
-    )
+    return sorted(records, key=announcement_order, reverse=True)
 
 
 def record_key(item: Dict) -> str:
@@ -143,7 +186,11 @@ def get_year_options(session: requests.Session) -> List[Dict]:
     # Ensure this request is treated as a normal HTML page fetch, not AJAX.
     res = session.get(BASE_URL, headers={**html_headers, "X-Requested-With": ""}, timeout=20)
     res.raise_for_status()
-    soup = BeautifulSoup(res.text, "html.parser")
+    return parse_year_options(res.text)
+
+
+def parse_year_options(html: str) -> List[Dict]:
+    soup = parse_html(html, only=YEAR_SELECT)
     year_select = soup.find("select", {"id": "year"})
     if not year_select:
         raise RuntimeError("Year selector not found on proposed-dividend page.")
@@ -157,33 +204,67 @@ def get_year_options(session: requests.Session) -> List[Dict]:
     return years
 
 
-def fetch_paged(session: requests.Session, params: Dict, page_size: int = 50) -> List[Dict]:
-    all_rows = []
-    start = 0
-    draw = 1
-    total = None
-
-    while True:
-        q = dict(params)
-        q.update({"draw": draw, "start": start, "length": page_size})
-        res = session.get(BASE_URL, params=q, timeout=25)
-        res.raise_for_status()
-        payload = res.json()
-        rows = payload.get("data", [])
-        if total is None:
-            total = int(payload.get("recordsFiltered", 0))
+def create_rate_limiter(rate: float = DEFAULT_RATE) -> RateLimiter:
+    """One pacing group for every Sharesansar request of this run."""
+    return RateLimiter(limits={"default": GroupLimit(rate=rate, burst=max(1, int(rate)))}, routes={})
+
+
+def fetch_page(session: requests.Session, params: Dict, start: int, draw: int, page_size: int,
+               limiter: Optional[RateLimiter] = None) -> Dict:
+    q = dict(params)
+    q.update({"draw": draw, "start": start, "length": page_size})
+    group = limiter.acquire(BASE_URL) if limiter is not None else None
+    res = session.get(BASE_URL, params=q, timeout=25)
+    if limiter is not None:
+        limiter.record(group, res.status_code)
+    res.raise_for_status()
+    return res.json()
+
+
+def page_starts(total: int, page_size: int) -> List[int]:
+    """Offsets of the pages after the first one."""
+    return list(range(page_size, total, page_size))
+
+
+def join_pages(pages: List[List[Dict]], total: int) -> List[Dict]:
+    """Concatenate pages in order, stopping where fetch_paged would have stopped."""
+    all_rows: List[Dict] = []
+    for rows in pages:
         all_rows.extend(rows)
         if not rows or len(all_rows) >= total:
             break
-        start += page_size
-        draw += 1
-
     return all_rows
 
 
+def fetch_paged(session: requests.Session, params: Dict, page_size: int = 50,
+                executor: Optional[ThreadPoolExecutor] = None,
+                limiter: Optional[RateLimiter] = None) -> List[Dict]:
+    """
+    All rows of a paged DataTables query. The first page gives
+    `recordsFiltered`; with an `executor` the remaining pages are then
+    requested concurrently. Rows come back in page order either way.
+    """
+    first = fetch_page(session, params, 0, 1, page_size, limiter)
+    total = int(first.get("recordsFiltered", 0))
+    starts = page_starts(total, page_size)
+    if executor is None:
+        pages = [first.get("data", [])]
+        for draw, start in enumerate(starts, start=2):
+            if not pages[-1] or sum(len(rows) for rows in pages) >= total:
+                break
+            pages.append(fetch_page(session, params, start, draw, page_size, limiter).get("data", []))
+    else:
+        futures = [
+            executor.submit(fetch_page, session, params, start, draw, page_size, limiter)
+            for draw, start in enumerate(starts, start=2)
+        ]
+        pages = [first.get("data", [])] + [future.result().get("data", []) for future in futures]
+    return join_pages(pages, total)
+
+
 def fetch_latest_1y(session: requests.Session) -> List[Dict]:
     rows = fetch_paged(session, params={"type": "LATEST", "duration": "1_YEAR"})
-    normalized = [normalize_record(r) for r in rows]
+    normalized = normalize_records(rows)
     return sort_newest_first(dedupe_records(normalized))
 
 
@@ -209,51 +290,97 @@ def run_smoke_gate(session: requests.Session) -> List[Dict]:
     return latest_rows
 
 
-def fetch_all_years(session: requests.Session) -> List[Dict]:
+def fetch_all_years(session: requests.Session, max_workers: int = DEFAULT_WORKERS,
+                    limiter: Optional[RateLimiter] = None, page_size: int = 50) -> List[Dict]:
+    """
+    Fetch every fiscal year's rows. The first page of all years is requested
+    concurrently, then every remaining page of every year; `limiter` paces
+    all of it. Rows are reassembled in year and page order, so the result
+    does not depend on which request finished first.
+    """
     years = get_year_options(session)
-    merged = []
-    for y in years:
-        rows = fetch_paged(
-            session,
-            params={"type": "YEARWISE", "year": y["id"], "sector": "0"},
-        )
-        normalized = [normalize_record(r) for r in rows]
-        merged.extend(normalized)
-        print(f"Fetched year {y['label']} ({y['id']}): {len(rows)} rows")
+    limiter = limiter if limiter is not None else create_rate_limiter()
+    year_params = [{"type": "YEARWISE", "year": y["id"], "sector": "0"} for y in years]
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        first_pages = [
+            executor.submit(fetch_page, session, params, 0, 1, page_size, limiter)
+            for params in year_params
+        ]
+        first_pages = [future.result() for future in first_pages]
+        totals = [int(first.get("recordsFiltered", 0)) for first in first_pages]
+        rest = [
+            [
+                executor.submit(fetch_page, session, params, start, draw, page_size, limiter)
+                for draw, start in enumerate(page_starts(total, page_size), start=2)
+            ]
+            for params, total in zip(year_params, totals)
+        ]
+
+        merged = []
+        for y, first, total, futures in zip(years, first_pages, totals, rest):
+            pages = [first.get("data", [])] + [future.result().get("data", []) for future in futures]
+            rows = join_pages(pages, total)
+            merged.extend(normalize_records(rows))
+            print(f"Fetched year {y['label']} ({y['id']}): {len(rows)} rows")
     return sort_newest_first(dedupe_records(merged))
 
 
-def merge_into_history(out_dir: str, incoming: List[Dict], incremental: bool = True) -> int:
-    history_path = os.path.join(out_dir, HISTORY_FILE)
-    history = load_json_list(history_path)
+def open_history_store(out_dir: str) -> Tuple[SegmentStore, bool]:
+    """
+    The history store under `out_dir`/history and whether it was just seeded.
 
+    Its index.json maps every record_key to a segment, so "is this row new?"
+    is a set lookup that never parses the history. An empty store is seeded
+    once from the existing history file (or the legacy backfill file).
+    """
+    store = SegmentStore(
+        os.path.join(out_dir, HISTORY_DIR),
+        key_fn=record_key,
+        sort_key=lambda x: parse_date(x.get("announcement_date")),
+        order_key=announcement_order,
+    )
+    if not store.is_empty():
+        return store, False
+    history = load_json_list(os.path.join(out_dir, HISTORY_FILE))
     # one-time migration from legacy file name
     legacy_backfill = os.path.join(out_dir, "all_years_backfill.json")
     if not history and os.path.exists(legacy_backfill):
         history = load_json_list(legacy_backfill)
+    if not history:
+        return store, False
+    store.upsert(dedupe_records(history))
+    return store, True
+
+
+def merge_into_history(out_dir: str, incoming: List[Dict]) -> int:
+    """
+    Add the incoming rows that are not in the history yet and return how many
+    there were. Only the monthly segments they land in are rewritten (new
+    rows merged into the already ordered segment), then HISTORY_FILE is
+    re-spliced from the segments; nothing is re-sorted or re-deduplicated.
+    """
+    history_path = os.path.join(out_dir, HISTORY_FILE)
+    store, seeded = open_history_store(out_dir)
 
-    seen = {record_key(item) for item in history}
-    to_add = [item for item in incoming if record_key(item) not in seen]
+    to_add = dedupe_records([item for item in incoming if record_key(item) not in store])
     if to_add:
-        if incremental:
-            # Incremental update: keep existing history untouched, prepend only new rows.
-            new_rows = sort_newest_first(dedupe_records(to_add))
-            updated_history = new_rows + history
-            save_json_list(history_path, updated_history)
-        else:
-            # Full merge for backfill to preserve global newest-first ordering.
-            updated_history = sort_newest_first(dedupe_records(history + to_add))
-            save_json_list(history_path, updated_history)
-    elif not os.path.exists(history_path):
-        history = sort_newest_first(dedupe_records(history))
-        save_json_list(history_path, history)
+        store.upsert(to_add)
+    if to_add or seeded or not os.path.exists(history_path):
+        store.write_view(history_path)
+        # The store's index replaces the manifest's per-record hashes of the history.
+        OutputManifest.for_directory(out_dir).forget(history_path)
 
     return len(to_add)
 
 
 def write_latest(out_dir: str, latest_rows: List[Dict]) -> None:
     latest_path = os.path.join(out_dir, LATEST_FILE)
+    manifest = OutputManifest.for_directory(out_dir)
+    if manifest.is_unchanged(latest_path, latest_rows):
+        return
     save_json_list(latest_path, latest_rows)
+    manifest.record(latest_path, latest_rows)
 
 
 def cleanup_legacy_files(out_dir: str) -> None:
@@ -293,14 +420,12 @@ def write_meta(out_dir: str, mode: str, latest_count: int, history_count: int, s
         "history_count": history_count,
         "smoke_passed": smoke_passed,
     }
-    with open(meta_path, "w", encoding="utf-8") as f:
-        json.dump(meta, f, indent=2, ensure_ascii=False)
+    write_json_atomic(meta_path, meta)
 
 
 def is_history_empty(out_dir: str) -> bool:
-    history_path = os.path.join(out_dir, HISTORY_FILE)
-    history = load_json_list(history_path)
-    return len(history) == 0
+    store, _ = open_history_store(out_dir)
+    return store.is_empty()
 
 
 def main() -> None:
@@ -313,6 +438,18 @@ def main() -> None:
         default="both",
         help="backfill: fetch all years into history, latest: refresh 1-year latest + merge to history, both: do both",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_WORKERS,
+        help="Concurrent requests during the all-years fetch.",
+    )
+    parser.add_argument(
+        "--rate",
+        type=float,
+        default=DEFAULT_RATE,
+        help="Maximum Sharesansar requests per second during the all-years fetch.",
+    )
     parser.add_argument(
         "--skip-smoke",
         action="store_true",
@@ -321,7 +458,8 @@ def main() -> None:
     args = parser.parse_args()
 
     out_dir = get_data_dir()
-    session = create_session()
+    session = create_session(pool_size=args.workers)
+    limiter = create_rate_limiter(args.rate)
     did_full_backfill = False
 
     smoke_passed = False
@@ -336,16 +474,16 @@ def main() -> None:
             smoke_passed = True
 
     if args.mode in ("backfill", "both"):
-        all_year_rows = fetch_all_years(session)
-        added = merge_into_history(out_dir, all_year_rows, incremental=False)
+        all_year_rows = fetch_all_years(session, max_workers=args.workers, limiter=limiter)
+        added = merge_into_history(out_dir, all_year_rows)
         print(f"History merged from all years. New added: {added}")
         did_full_backfill = True
 
     if args.mode in ("latest", "both"):
         if not did_full_backfill and is_history_empty(out_dir):
             print("History file is empty. Running full all-years fetch before latest merge...")
-            all_year_rows = fetch_all_years(session)
-            added_backfill = merge_into_history(out_dir, all_year_rows, incremental=False)
+            all_year_rows = fetch_all_years(session, max_workers=args.workers, limiter=limiter)
+            added_backfill = merge_into_history(out_dir, all_year_rows)
             print(f"History bootstrap from all years complete. New added: {added_backfill}")
         write_latest(out_dir, cached_latest_rows)
         added = merge_into_history(out_dir, cached_latest_rows)
@@ -354,7 +492,7 @@ def main() -> None:
 
     cleanup_legacy_files(out_dir)
     latest_count = len(cached_latest_rows)
-    history_count = len(load_json_list(os.path.join(out_dir, HISTORY_FILE)))
+    history_count = len(open_history_store(out_dir)[0])
     write_meta(
         out_dir=out_dir,
         mode=args.mode,
@@ -1,25 +1,13 @@
 import sys
 import os
-import json
 import urllib.parse
-import re
 
 # Add the current directory to path to find official_api
 sys.path.append(os.path.dirname(__file__))
 
+from json_writer import write_json_atomic
 from official_api import NepseScraper
-
-def clean_html(raw_html):
-    """Remove HTML tags and extra whitespace."""
-    if not raw_html:
-        return ""
-    # Remove HTML tags
-    cleanr = re.compile('<.*?>')
-    cleantext = re.sub(cleanr, '', raw_html)
-    # Replace common HTML entities
-    cleantext = cleantext.replace('&nbsp;', ' ').replace('&quot;', '"').replace('&amp;', '&')
-    # Remove extra spaces
-    return ' '.join(cleantext.split())
+from text_utils import clean_html, extract_symbol
 
 def get_attachment_url(file_path):
     """Constructs the full, valid download URL for a given attachment file path."""
@@ -31,20 +19,6 @@ def get_attachment_url(file_path):
     encoded_path = urllib.parse.quote(file_path)
     return base_url + encoded_path
 
-def extract_symbol(title):
-    """Attempt to extract the company symbol from the title text."""
-    if not title:
-        return ""
-    # Matches [SYMBOL] (Company news format)
-    match = re.search(r'\[([A-Za-z0-9]+)\]', title)
-    if match:
-        return match.group(1).upper()
-    # Matches (SYMBOL) (Exchange message format)
-    match = re.search(r'\(([A-Za-z0-9]+)\)', title)
-    if match:
-        return match.group(1).upper()
-    return ""
-
 def scrape_and_format_disclosures():
     print("Initializing NEPSE Scraper...")
     scraper = NepseScraper(verify_ssl=False)
@@ -111,8 +85,7 @@ def scrape_and_format_disclosures():
     output_path = os.path.join(data_dir, "corporate_disclosures_cleaned.json")
     
     # Save the formatted payload
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(clean_disclosures, f, indent=4, ensure_ascii=False)
+    write_json_atomic(output_path, clean_disclosures)
         
     print(f"Successfully formatted and saved {len(clean_disclosures)} disclosures to:")
     print(f"-> {output_path}")
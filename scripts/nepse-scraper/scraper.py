@@ -1,9 +1,65 @@
 import requests
-from bs4 import BeautifulSoup
-import json
+from bs4 import SoupStrainer
 import os
 from datetime import datetime
 
+from html_parsing import any_of, css_class, parse_html
+from json_writer import write_json_atomic
+from official_api.conditional import mount_conditional
+
+# Only the price table is parsed: #headFixed, or any .dataTable as a fallback.
+LIVE_TRADING_TABLE = any_of(
+    SoupStrainer('table', id='headFixed'),
+    SoupStrainer('table', class_=css_class('dataTable')),
+)
+
+def parse_live_trading(html):
+    """Price rows from the Sharesansar live-trading page, or None if its table is missing."""
+    soup = parse_html(html, only=LIVE_TRADING_TABLE)
+    # Based on inspection, the table ID is 'headFixed'
+    table = soup.find('table', {'id': 'headFixed'})
+
+    if not table:
+        # Fallback if ID changed but it's the only dataTable
+        table = soup.find('table', {'class': 'dataTable'})
+
+    if not table:
+        print("Table not found!")
+        return None
+
+    rows = table.find('tbody').find_all('tr') if table.find('tbody') else table.find_all('tr')[1:]
+    data = []
+
+    for row in rows:
+        cols = row.find_all('td')
+        if len(cols) >= 10:
+            symbol = cols[1].text.strip()
+            ltp = cols[2].text.strip().replace(',', '')
+            prev_close = cols[9].text.strip().replace(',', '')
+            change = cols[3].text.strip().replace(',', '')
+            p_change = cols[4].text.strip().replace(',', '').replace('%', '')
+            high = cols[6].text.strip().replace(',', '')
+            low = cols[7].text.strip().replace(',', '')
+            volume = cols[8].text.strip().replace(',', '')
+
+            try:
+                data.append({
+                    "symbol": symbol,
+                    "ltp": float(ltp) if ltp and ltp != '-' else 0.0,
+                    "previous_close": float(prev_close) if prev_close and prev_close != '-' else 0.0,
+                    "change": float(change) if change and change != '-' else 0.0,
+                    "percent_change": float(p_change) if p_change and p_change != '-' else 0.0,
+                    "high": float(high) if high and high != '-' else 0.0,
+                    "low": float(low) if low and low != '-' else 0.0,
+                    "volume": float(volume) if volume and volume != '-' else 0.0,
+                    "last_updated": datetime.now().isoformat()
+                })
+            except ValueError as e:
+                print(f"Skipping row for {symbol} due to parsing error: {e}")
+                continue
+
+    return data
+
 def scrape_nepse():
     # Using live-trading URL as it's active and contains the same data
     url = "https://www.sharesansar.com/live-trading"
@@ -12,53 +68,12 @@ def scrape_nepse():
     }
     
     try:
-        response = requests.get(url, headers=headers, timeout=15)
+        session = requests.Session()
+        mount_conditional(session)
+        response = session.get(url, headers=headers, timeout=15)
         response.raise_for_status()
         
-        soup = BeautifulSoup(response.text, 'html.parser')
-        # Based on inspection, the table ID is 'headFixed'
-        table = soup.find('table', {'id': 'headFixed'})
-        
-        if not table:
-            # Fallback if ID changed but it's the only dataTable
-            table = soup.find('table', {'class': 'dataTable'})
-            
-        if not table:
-            print("Table not found!")
-            return None
-            
-        rows = table.find('tbody').find_all('tr') if table.find('tbody') else table.find_all('tr')[1:]
-        data = []
-        
-        for row in rows:
-            cols = row.find_all('td')
-            if len(cols) >= 10:
-                symbol = cols[1].text.strip()
-                ltp = cols[2].text.strip().replace(',', '')
-                prev_close = cols[9].text.strip().replace(',', '')
-                change = cols[3].text.strip().replace(',', '')
-                p_change = cols[4].text.strip().replace(',', '').replace('%', '')
-                high = cols[6].text.strip().replace(',', '')
-                low = cols[7].text.strip().replace(',', '')
-                volume = cols[8].text.strip().replace(',', '')
-                
-                try:
-                    data.append({
-                        "symbol": symbol,
-                        "ltp": float(ltp) if ltp and ltp != '-' else 0.0,
-                        "previous_close": float(prev_close) if prev_close and prev_close != '-' else 0.0,
-                        "change": float(change) if change and change != '-' else 0.0,
-                        "percent_change": float(p_change) if p_change and p_change != '-' else 0.0,
-                        "high": float(high) if high and high != '-' else 0.0,
-                        "low": float(low) if low and low != '-' else 0.0,
-                        "volume": float(volume) if volume and volume != '-' else 0.0,
-                        "last_updated": datetime.now().isoformat()
-                    })
-                except ValueError as e:
-                    print(f"Skipping row for {symbol} due to parsing error: {e}")
-                    continue
-        
-        return data
+        return parse_live_trading(response.text)
 
     except Exception as e:
         print(f"Error occurred: {e}")
@@ -66,8 +81,7 @@ def scrape_nepse():
 
 def save_data(data):
     if data:
-        with open('data/nepse_data.json', 'w') as f:
-            json.dump(data, f, indent=4)
+        write_json_atomic('data/nepse_data.json', data)
         print(f"Successfully saved {len(data)} items to data/nepse_data.json")
     else:
         print("No data to save")
@@ -1,77 +1,97 @@
 
 import requests
-from bs4 import BeautifulSoup
+from bs4 import SoupStrainer
 import re
-import json
+
+from html_parsing import any_of, index_ids, parse_html
+from json_writer import write_json_atomic
+from official_api.conditional import is_not_modified, mount_conditional
+
+# Only the accordion toggles (#collapse_N links) and the panels they open are parsed.
+SECTOR_ACCORDION = any_of(
+    SoupStrainer('a', href=re.compile(r'#collapse_\d+')),
+    SoupStrainer(id=re.compile(r'collapse_\d+')),
+)
+
+def parse_sector_codes(content):
+    """Sector name -> [{symbol, name}] from the MeroLagani company list page."""
+    soup = parse_html(content, only=SECTOR_ACCORDION)
+    panels = index_ids(soup)
+
+    # The structure is likely an accordion.
+    # Based on markdown view: links to #collapse_X are headers.
+    # The content is in the element with id collapse_X.
+
+    sectors = {}
+
+    # Find all elements that link to a collapse section
+    # Trying a generic approach: look for 'a' tags with href starting with #collapse or matching pattern
+    accordion_toggles = soup.find_all('a', href=re.compile(r'#collapse_\d+'))
+
+    print(f"Found {len(accordion_toggles)} sector groupings.")
+
+    for toggle in accordion_toggles:
+        sector_name = toggle.get_text(strip=True)
+        target_id = toggle['href'].replace('#', '')
+
+        # Find the content div
+        content_div = panels.get(target_id)
+
+        if content_div:
+            # Find the table in the content div
+            table = content_div.find('table')
+            companies = []
+
+            if table:
+                rows = table.find_all('tr')
+                for row in rows:
+                    cols = row.find_all('td')
+                    if len(cols) >= 2:
+                        symbol_link = cols[0].find('a')
+                        symbol = symbol_link.get_text(strip=True) if symbol_link else cols[0].get_text(strip=True)
+
+                        # Company Name is usually in the second column
+                        name = cols[1].get_text(strip=True)
+                        # Clean up name (remove extra whitespace/newlines)
+                        name = " ".join(name.split())
+
+                        if symbol and name:
+                            companies.append({
+                                "symbol": symbol,
+                                "name": name
+                            })
+            else:
+                # Fallback to the old method if table is missing for some reason
+                company_links = content_div.find_all('a', href=re.compile(r'CompanyDetail\.aspx\?symbol='))
+                for link in company_links:
+                    href = link['href']
+                    match = re.search(r'symbol=([a-zA-Z0-9.]+)', href, re.IGNORECASE)
+                    if match:
+                        symbol = match.group(1)
+                        companies.append({
+                            "symbol": symbol,
+                            "name": symbol # Fallback name to symbol
+                        })
+
+            if companies:
+                sectors[sector_name] = companies
+                print(f"Sector: {sector_name}, Count: {len(companies)}")
+
+    return sectors
 
 def get_sector_wise_codes():
     url = "https://merolagani.com/CompanyList.aspx"
     try:
-        response = requests.get(url, headers={'User-Agent': 'Mozilla/5.0'})
+        session = requests.Session()
+        mount_conditional(session)
+        response = session.get(url, headers={'User-Agent': 'Mozilla/5.0'})
         response.raise_for_status()
-        
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        # The structure is likely an accordion.
-        # Based on markdown view: links to #collapse_X are headers.
-        # The content is in the element with id collapse_X.
-        
-        sectors = {}
-        
-        # Find all elements that link to a collapse section
-        # Trying a generic approach: look for 'a' tags with href starting with #collapse or matching pattern
-        accordion_toggles = soup.find_all('a', href=re.compile(r'#collapse_\d+'))
-        
-        print(f"Found {len(accordion_toggles)} sector groupings.")
-        
-        for toggle in accordion_toggles:
-            sector_name = toggle.get_text(strip=True)
-            target_id = toggle['href'].replace('#', '')
-            
-            # Find the content div
-            content_div = soup.find(id=target_id)
-            
-            if content_div:
-                # Find the table in the content div
-                table = content_div.find('table')
-                companies = []
-                
-                if table:
-                    rows = table.find_all('tr')
-                    for row in rows:
-                        cols = row.find_all('td')
-                        if len(cols) >= 2:
-                            symbol_link = cols[0].find('a')
-                            symbol = symbol_link.get_text(strip=True) if symbol_link else cols[0].get_text(strip=True)
-                            
-                            # Company Name is usually in the second column
-                            name = cols[1].get_text(strip=True)
-                            # Clean up name (remove extra whitespace/newlines)
-                            name = " ".join(name.split())
-                            
-                            if symbol and name:
-                                companies.append({
-                                    "symbol": symbol,
-                                    "name": name
-                                })
-                else:
-                    # Fallback to the old method if table is missing for some reason
-                    company_links = content_div.find_all('a', href=re.compile(r'CompanyDetail\.aspx\?symbol='))
-                    for link in company_links:
-                        href = link['href']
-                        match = re.search(r'symbol=([a-zA-Z0-9.]+)', href, re.IGNORECASE)
-                        if match:
-                            symbol = match.group(1)
-                            companies.append({
-                                "symbol": symbol,
-                                "name": symbol # Fallback name to symbol
-                            })
 
-                if companies:
-                    sectors[sector_name] = companies
-                    print(f"Sector: {sector_name}, Count: {len(companies)}")
-                
-        return sectors
+        if is_not_modified(response) and os.path.exists(get_output_file()):
+            print("Company list unchanged since the last run; keeping the saved sector codes.")
+            return None
+        
+        return parse_sector_codes(response.content)
 
     except Exception as e:
         print(f"Error fetching data: {e}")
@@ -79,17 +99,17 @@ def get_sector_wise_codes():
 
 import os
 
+def get_output_file():
+    # Use absolute path relative to the script to find the project root's data directory
+    # scripts/nepse-scraper/sectors.py -> scripts/nepse-scraper -> scripts -> root
+    base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    return os.path.join(base_dir, 'data', "nepse_sector_wise_codes.json")
+
 if __name__ == "__main__":
     data = get_sector_wise_codes()
     if data:
-        # Use absolute path relative to the script to find the project root's data directory
-        # scripts/nepse-scraper/sectors.py -> scripts/nepse-scraper -> scripts -> root
-        base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-        data_dir = os.path.join(base_dir, 'data')
-        os.makedirs(data_dir, exist_ok=True)
-        
-        output_file = os.path.join(data_dir, "nepse_sector_wise_codes.json")
+        output_file = get_output_file()
+        os.makedirs(os.path.dirname(output_file), exist_ok=True)
         
-        with open(output_file, "w") as f:
-            json.dump(data, f, indent=4)
+        write_json_atomic(output_file, data)
         print(f"Successfully saved sector-wise codes to {output_file}")
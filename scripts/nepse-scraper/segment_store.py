@@ -0,0 +1,187 @@
+import heapq
+import json
+import os
+import threading
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+from json_writer import write_json_atomic, write_text_atomic
+
+INDEX_FILE = 'index.json'
+UNDATED_SEGMENT = 'undated'
+
+
+class SegmentStore:
+    """
+    Append-only record history split into monthly segment files.
+
+    `<root>/YYYY-MM.json` holds the records of one month, newest first, and
+    `<root>/index.json` maps every record key to its segment. Adding records
+    only reads and rewrites the segments they land in (normally the current
+    month), so the cost of an update does not grow with the history, and the
+    commit diff only touches those files. Records whose date cannot be parsed
+    go to the `undated` segment, which sorts last.
+
+    `sort_key` returns the datetime a record is partitioned by (`datetime.min`
+    when unknown); `order_key`, if given, orders records within a segment
+    (e.g. the date plus a tie-breaker) and defaults to `sort_key`.
+    """
+
+    def __init__(
+        self,
+        root: str,
+        key_fn: Callable[[Any], Optional[str]],
+        sort_key: Callable[[Any], datetime],
+        order_key: Optional[Callable[[Any], Any]] = None,
+    ) -> None:
+        self.root = root
+        self.key_fn = key_fn
+        self.sort_key = sort_key
+        self.order_key = order_key or sort_key
+        self.index_path = os.path.join(root, INDEX_FILE)
+        self._lock = threading.Lock()
+        self._index: Optional[Dict[str, Any]] = None
+
+    def _load_index(self) -> Dict[str, Any]:
+        if self._index is None:
+            try:
+                with open(self.index_path, 'r', encoding='utf-8') as f:
+                    index = json.load(f)
+                if not isinstance(index, dict):
+                    raise ValueError("index is not an object")
+            except (OSError, ValueError):
+                index = {}
+            index.setdefault('segments', {})
+            index.setdefault('keys', {})
+            self._index = index
+        return self._index
+
+    def _segment_of(self, record: Any) -> str:
+        when = self.sort_key(record)
+        return UNDATED_SEGMENT if when == datetime.min else when.strftime('%Y-%m')
+
+    def _segment_path(self, segment: str) -> str:
+        return os.path.join(self.root, f'{segment}.json')
+
+    def load_segment(self, segment: str) -> List[Any]:
+        try:
+            with open(self._segment_path(segment), 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            return data if isinstance(data, list) else []
+        except (OSError, ValueError):
+            return []
+
+    def is_empty(self) -> bool:
+        return not self._load_index()['keys']
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._load_index()['keys']
+
+    def __len__(self) -> int:
+        return len(self._load_index()['keys'])
+
+    def segments(self) -> List[str]:
+        """Segment names, newest first."""
+        names = self._load_index()['segments']
+        dated = sorted((name for name in names if name != UNDATED_SEGMENT), reverse=True)
+        return dated + ([UNDATED_SEGMENT] if UNDATED_SEGMENT in names else [])
+
+    def upsert(self, records: Iterable[Any], prepare: Optional[Callable[[List[Any]], Any]] = None) -> List[Any]:
+        """
+        Add new records and merge updates (`{**stored, **incoming}`) into
+        existing ones. `prepare` is called with the resulting new/updated
+        records only, before they are stored, to enrich them in place.
+        Records without a key are ignored. Returns the records that were new.
+        """
+        with self._lock:
+            index = self._load_index()
+            keys = index['keys']
+
+            # Incoming records keyed once; a key seen twice keeps its last version.
+            incoming: Dict[str, Any] = {}
+            for record in records:
+                key = self.key_fn(record)
+                if key is None:
+                    continue
+                incoming[key] = {**incoming[key], **record} if key in incoming else record
+
+            if not incoming:
+                return []
+
+            loaded: Dict[str, List[Any]] = {}
+
+            def segment(name: str) -> List[Any]:
+                if name not in loaded:
+                    loaded[name] = self.load_segment(name) if name in index['segments'] else []
+                return loaded[name]
+
+            changed: List[Any] = []
+            new: List[Any] = []
+            for key, record in incoming.items():
+                old_segment = keys.get(key)
+                if old_segment is not None:
+                    rows = segment(old_segment)
+                    position = next((i for i, row in enumerate(rows) if self.key_fn(row) == key), None)
+                    if position is not None:
+                        record = {**rows.pop(position), **record}
+                else:
+                    new.append(record)
+                changed.append(record)
+
+            if prepare is not None:
+                prepare(changed)
+
+            additions: Dict[str, List[Any]] = {}
+            for record in changed:
+                name = self._segment_of(record)
+                segment(name)
+                additions.setdefault(name, []).append(record)
+                keys[self.key_fn(record)] = name
+
+            os.makedirs(self.root, exist_ok=True)
+            for name in list(loaded):
+                # Stored segments are already in order, so only the additions
+                # are sorted and then merged in one linear pass.
+                added = sorted(additions.get(name, []), key=self.order_key, reverse=True)
+                rows = loaded[name] = list(heapq.merge(loaded[name], added, key=self.order_key, reverse=True))
+                if rows:
+                    write_json_atomic(self._segment_path(name), rows)
+                    index['segments'][name] = len(rows)
+                else:
+                    index['segments'].pop(name, None)
+                    try:
+                        os.remove(self._segment_path(name))
+                    except OSError:
+                        pass
+            write_json_atomic(self.index_path, index)
+            return new
+
+    def iter_records(self) -> Iterator[Any]:
+        """All records, newest first, read one segment at a time."""
+        for name in self.segments():
+            yield from self.load_segment(name)
+
+    def records(self) -> List[Any]:
+        return list(self.iter_records())
+
+    def write_view(self, path: str) -> int:
+        """
+        Write all records, newest first, as one JSON list at `path`.
+
+        The segment files are spliced together as text instead of being
+        parsed and re-encoded; with the default 'lines' layout the result is
+        byte-identical to `write_json_atomic(path, self.records())`. Returns
+        the size of the view in bytes.
+        """
+        parts = []
+        for name in self.segments():
+            try:
+                with open(self._segment_path(name), 'r', encoding='utf-8') as f:
+                    text = f.read().strip()
+            except OSError:
+                continue
+            inner = text[1:-1].strip('\n') if text.startswith('[') and text.endswith(']') else ''
+            if inner.strip():
+                parts.append(inner)
+        body = ('[\n' + ',\n'.join(parts) + '\n]\n') if parts else '[]\n'
+        return write_text_atomic(path, body)
@@ -0,0 +1,108 @@
+import time
+import traceback
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+
+class Stage:
+    """A named unit of work with the names of the stages it depends on."""
+
+    def __init__(self, name: str, func: Callable[[Dict[str, Any]], Any], deps: Iterable[str] = ()) -> None:
+        self.name = name
+        self.func = func
+        self.deps: Tuple[str, ...] = tuple(deps)
+
+
+class StageRunner:
+    """
+    Run a graph of stages on a bounded thread pool.
+
+    A stage starts as soon as every stage it depends on has finished, and is
+    called with a dict of results from the stages that already completed.
+    When a stage fails, its dependents are skipped while unrelated stages keep
+    running.
+    """
+
+    def __init__(self, max_workers: int = 8) -> None:
+        self.max_workers = max_workers
+        self.stages: Dict[str, Stage] = {}
+        self.results: Dict[str, Any] = {}
+        self.errors: Dict[str, BaseException] = {}
+        self.skipped: List[str] = []
+        self.timings: Dict[str, float] = {}
+
+    def add(self, name: str, func: Callable[[Dict[str, Any]], Any], deps: Iterable[str] = ()) -> None:
+        if name in self.stages:
+            raise ValueError(f"Stage '{name}' is already registered.")
+        self.stages[name] = Stage(name, func, deps)
+
+    def _validate(self) -> None:
+        for stage in self.stages.values():
+            missing = [dep for dep in stage.deps if dep not in self.stages]
+            if missing:
+                raise ValueError(f"Stage '{stage.name}' depends on unknown stage(s): {missing}")
+
+        # Kahn's algorithm: anything left over sits on a cycle.
+        remaining = {name: set(stage.deps) for name, stage in self.stages.items()}
+        while True:
+            ready = [name for name, deps in remaining.items() if not deps]
+            if not ready:
+                break
+            for name in ready:
+                del remaining[name]
+            for deps in remaining.values():
+                deps.difference_update(ready)
+        if remaining:
+            raise ValueError(f"Stage dependency cycle detected: {sorted(remaining)}")
+
+    def _run_stage(self, stage: Stage) -> Any:
+        started = time.perf_counter()
+        try:
+            return stage.func(self.results)
+        finally:
+            self.timings[stage.name] = time.perf_counter() - started
+
+    def run(self) -> bool:
+        """Run every stage. Returns True when all stages succeeded."""
+        self._validate()
+        pending = dict(self.stages)
+        running = {}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while pending or running:
+                for name, stage in list(pending.items()):
+                    if any(dep in self.errors or dep in self.skipped for dep in stage.deps):
+                        print(f"Skipping stage '{name}' because a dependency failed.")
+                        self.skipped.append(name)
+                        del pending[name]
+                    elif all(dep in self.results for dep in stage.deps):
+                        running[executor.submit(self._run_stage, stage)] = name
+                        del pending[name]
+
+                if not running:
+                    # Only reachable when every pending stage waits on a skipped one.
+                    continue
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    exc = future.exception()
+                    if exc is None:
+                        self.results[name] = future.result()
+                    else:
+                        self.errors[name] = exc
+                        print(f"Stage '{name}' failed: {exc}")
+                        traceback.print_exception(type(exc), exc, exc.__traceback__)
+
+        return not self.errors and not self.skipped
+
+    def timing_report(self) -> str:
+        """Human-readable per-stage wall-clock timings, slowest first."""
+        lines = [
+            f"  {name:<24} {seconds:7.2f}s"
+            for name, seconds in sorted(self.timings.items(), key=lambda item: item[1], reverse=True)
+        ]
+        return "\n".join(lines)
+
+    def result(self, name: str, default: Optional[Any] = None) -> Any:
+        return self.results.get(name, default)
@@ -0,0 +1,93 @@
+import json
+import os
+import re
+import threading
+from typing import AbstractSet, Any, Optional
+
+DEFAULT_SECURITIES_FILE = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'data', 'all_securities.json'
+)
+
+_TAG_RE = re.compile(r'<.*?>', re.DOTALL)
+# One pass finds both '[SYMBOL]' (company news) and '(SYMBOL)' (exchange messages).
+_SYMBOL_RE = re.compile(r'\[([A-Za-z0-9]+)\]|\(([A-Za-z0-9]+)\)')
+
+# Upper-case tokens that show up in brackets in titles but are never tickers.
+# Only consulted for candidates missing from the securities list, which lags
+# behind new listings.
+NON_SYMBOL_TOKENS = frozenset({
+    'NPR', 'NRS', 'RS', 'USD', 'INR', 'IPO', 'FPO', 'AGM', 'SGM', 'BOD', 'CEO',
+    'NEPSE', 'SEBON', 'CDSC', 'NRB', 'MOF', 'QII', 'QIIS', 'NAV', 'EPS', 'DP',
+})
+
+_known_symbols: Optional[AbstractSet[str]] = None
+_known_symbols_lock = threading.Lock()
+
+
+def normalize_text(value: Any) -> str:
+    """Normalize text for safe duplicate comparisons."""
+    return ' '.join(str(value or '').split()).strip().lower()
+
+
+def clean_html(raw_html: Any) -> str:
+    """Remove HTML tags and extra whitespace."""
+    if not raw_html:
+        return ""
+    cleantext = _TAG_RE.sub('', str(raw_html))
+    # Replace common HTML entities
+    cleantext = cleantext.replace('&nbsp;', ' ').replace('&quot;', '"').replace('&amp;', '&')
+    return ' '.join(cleantext.split())
+
+
+def load_known_symbols(path: str = DEFAULT_SECURITIES_FILE) -> AbstractSet[str]:
+    """Ticker symbols listed in all_securities.json (empty if it cannot be read)."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            securities = json.load(f)
+    except (OSError, ValueError):
+        return frozenset()
+    if not isinstance(securities, list):
+        return frozenset()
+    return frozenset(
+        str(item['symbol']).upper() for item in securities
+        if isinstance(item, dict) and item.get('symbol')
+    )
+
+
+def known_symbols() -> AbstractSet[str]:
+    """Process-wide symbol set, loaded from data/all_securities.json on first use."""
+    global _known_symbols
+    if _known_symbols is None:
+        with _known_symbols_lock:
+            if _known_symbols is None:
+                _known_symbols = load_known_symbols()
+    return _known_symbols
+
+
+def _plausible(candidate: str, known: AbstractSet[str]) -> bool:
+    if candidate.upper() in known:
+        return True
+    return candidate.isupper() and candidate not in NON_SYMBOL_TOKENS
+
+
+def extract_symbol(title: Any, known: Optional[AbstractSet[str]] = None) -> str:
+    """
+    Ticker symbol referenced in a title like '... [SYMBOL]' or '... (SYMBOL)'.
+
+    Bracketed candidates win over parenthesized ones. A candidate is accepted
+    if it is a listed symbol (`known`, default: `known_symbols()`), or else
+    if it is written in upper case and is not a common non-ticker acronym
+    such as "(NPR)", so newly listed companies are still picked up.
+    """
+    if not title:
+        return ""
+    if known is None:
+        known = known_symbols()
+    fallback = ""
+    for bracketed, parenthesized in _SYMBOL_RE.findall(str(title)):
+        if bracketed:
+            if _plausible(bracketed, known):
+                return bracketed.upper()
+        elif not fallback and _plausible(parenthesized, known):
+            fallback = parenthesized.upper()
+    return fallback
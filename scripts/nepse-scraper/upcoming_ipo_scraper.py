@@ -1,9 +1,16 @@
 ﻿import requests
-from bs4 import BeautifulSoup
+from bs4 import SoupStrainer
 import json
 import re
 from datetime import datetime
 
+from html_parsing import css_class, parse_html
+from json_writer import write_json_atomic
+from official_api.conditional import mount_conditional
+
+# Only the announcement list is parsed, not the rest of the page.
+ANNOUNCEMENT_LIST = SoupStrainer('div', class_=css_class('announcement-list'))
+
 def detect_reserved_categories(full_text):
     text = (full_text or "").lower()
     categories = []
@@ -131,6 +138,81 @@ def backfill_reserved_from_text(item):
     item["reserved_for"] = ", ".join(reserved_categories)
     return item
 
+def parse_upcoming_ipo(content):
+    """IPO announcements from the MeroLagani upcoming-IPO page."""
+    soup = parse_html(content, only=ANNOUNCEMENT_LIST)
+
+    announcements_div = soup.find('div', class_='announcement-list')
+    if not announcements_div:
+        print("No announcement list found.")
+        return []
+
+    items = announcements_div.find_all('div', class_='media')
+    print(f"Found {len(items)} announcements.")
+
+    data = []
+
+    for item in items:
+        try:
+            # Extract Announcement Date
+            date_elem = item.find('small', class_='text-muted')
+            announcement_date = date_elem.get_text(strip=True) if date_elem else ""
+
+            # Extract Body Text and Link
+            body_div = item.find('div', class_='media-body')
+            if not body_div:
+                continue
+
+            link_elem = body_div.find('a')
+            if not link_elem:
+                continue
+
+            full_text = link_elem.get_text(strip=True)
+            link = link_elem.get('href')
+            if not link:
+                continue
+            if not link.startswith('http'):
+                link = "https://merolagani.com" + link
+            reserved_categories = detect_reserved_categories(full_text)
+
+            # Parse text
+            company, units, date_range = parse_ipo_text(full_text)
+
+            entry = {
+                "company": company,
+                "units": units,
+                "date_range": date_range,
+                "announcement_date": announcement_date,
+                "full_text": full_text,
+                "url": link,
+                "is_reserved_share": len(reserved_categories) > 0,
+                "reserved_for": ", ".join(reserved_categories),
+                "scraped_at": datetime.now().isoformat()
+            }
+            data.append(entry)
+
+        except Exception as e:
+            fallback_text = item.get_text(" ", strip=True)
+            fallback_date_elem = item.find('small', class_='text-muted')
+            fallback_date = fallback_date_elem.get_text(strip=True) if fallback_date_elem else ""
+            fallback_company = extract_company_from_text(fallback_text) or fallback_text
+            fallback_reserved_categories = detect_reserved_categories(fallback_text)
+            data.append({
+                "company": fallback_company,
+                "units": "",
+                "date_range": "",
+                "announcement_date": fallback_date,
+                "full_text": fallback_text,
+                "url": "",
+                "is_reserved_share": len(fallback_reserved_categories) > 0,
+                "reserved_for": ", ".join(fallback_reserved_categories),
+                "scraped_at": datetime.now().isoformat(),
+                "parse_error": str(e),
+            })
+            print(f"Error parsing item: {e}")
+
+    return data
+
 def scrape_upcoming_ipo():
     url = "https://merolagani.com/Ipo.aspx?type=upcoming"
     headers = {
@@ -139,81 +221,12 @@ def scrape_upcoming_ipo():
     
     try:
         print(f"Fetching {url}...")
-        response = requests.get(url, headers=headers, timeout=(10, 30))
+        session = requests.Session()
+        mount_conditional(session)
+        response = session.get(url, headers=headers, timeout=(10, 30))
         response.raise_for_status()
         
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        announcements_div = soup.find('div', class_='announcement-list')
-        if not announcements_div:
-            print("No announcement list found.")
-            return []
-            
-        items = announcements_div.find_all('div', class_='media')
-        print(f"Found {len(items)} announcements.")
-        
-        data = []
-        
-        for item in items:
-            try:
-                # Extract Announcement Date
-                date_elem = item.find('small', class_='text-muted')
-                announcement_date = date_elem.get_text(strip=True) if date_elem else ""
-                
-                # Extract Body Text and Link
-                body_div = item.find('div', class_='media-body')
-                if not body_div:
-                    continue
-                    
-                link_elem = body_div.find('a')
-                if not link_elem:
-                    continue
-                    
-                full_text = link_elem.get_text(strip=True)
-                link = link_elem.get('href')
-                if not link:
-                    continue
-                if not link.startswith('http'):
-                    link = "https://merolagani.com" + link
-                reserved_categories = detect_reserved_categories(full_text)
-                
-                # Parse text
-                company, units, date_range = parse_ipo_text(full_text)
-
-                entry = {
-                    "company": company,
-                    "units": units,
-                    "date_range": date_range,
-                    "announcement_date": announcement_date,
-                    "full_text": full_text,
-                    "url": link,
-                    "is_reserved_share": len(reserved_categories) > 0,
-                    "reserved_for": ", ".join(reserved_categories),
-                    "scraped_at": datetime.now().isoformat()
-                }
-                data.append(entry)
-                
-            except Exception as e:
-                fallback_text = item.get_text(" ", strip=True)
-                fallback_date_elem = item.find('small', class_='text-muted')
-                fallback_date = fallback_date_elem.get_text(strip=True) if fallback_date_elem else ""
-                fallback_company = extract_company_from_text(fallback_text) or fallback_text
-                fallback_reserved_categories = detect_reserved_categories(fallback_text)
-                data.append({
-                    "company": fallback_company,
-                    "units": "",
-                    "date_range": "",
-                    "announcement_date": fallback_date,
-                    "full_text": fallback_text,
-                    "url": "",
-                    "is_reserved_share": len(fallback_reserved_categories) > 0,
-                    "reserved_for": ", ".join(fallback_reserved_categories),
-                    "scraped_at": datetime.now().isoformat(),
-                    "parse_error": str(e),
-                })
-                print(f"Error parsing item: {e}")
-                
-        return data
+        return parse_upcoming_ipo(response.content)
 
     except Exception as e:
         print(f"Error occurred: {e}")
@@ -301,12 +314,10 @@ if __name__ == "__main__":
         # Sort by scraped_at descending so newest are first
         final_data.sort(key=lambda x: x.get('scraped_at', ''), reverse=True)
         
-        with open(output_file, "w", encoding='utf-8') as f:
-            json.dump(final_data, f, indent=4, ensure_ascii=False)
+        write_json_atomic(output_file, final_data)
         print(f"Successfully processed {len(final_data)} upcoming items (New: {len(new_data) if new_data else 0}). Saved to {output_file}")
     else:
         print("No data to save.")
 
-    with open(history_file, "w", encoding='utf-8') as f:
-        json.dump(history_list, f, indent=4, ensure_ascii=False)
+    write_json_atomic(history_file, history_list)
     print(f"Archived IPO history count: {len(history_list)}. Saved to {history_file}")